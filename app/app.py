@@ -1,29 +1,106 @@
+import argparse
 import os
 import sys
-import pandas as pd
+import threading
+import time
+
+# 시작 시간 측정 기준 (모듈 로드부터 첫 화면까지)
+_start_time = time.perf_counter()
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
 
 # 절대 경로로 import
+# matplotlib, seaborn, sklearn, plotly, scipy를 쓰는 기능 모듈은 가져오는 데 수 초가 걸리므로
+# 메뉴에서 해당 기능을 처음 선택할 때 import함 (시작 시에는 pandas 수준의 비용만 듦)
+from src.correlation_binary import mapped_correlation_matrix_path
 from src.data_loader import DataLoader
-from src.user_analysis import UserAnalysis
-from src.group_analysis import recommend_menus
-from src.visualizations import visualize_group_recommendations, visualize_user_preferences
-from src.menu_interactive_map import generate_menu_map
-from src.add_user import add_new_user
+from src.data_store import get_data_store
+from src.meal_history import MealHistory
+from src.menu_neighbors import get_neighbor_index
+from src.menu_schema import get_menu_schema
 from src.user_details import UserDetails
+from src.user_matrix import get_user_matrix
+from src.user_store import UserStore
 
 # 파일 경로 설정
 menu_file_path = "data/processed_menu_details.csv"
 user_file_path = "data/processed_user_data.csv"
 raw_menu_data = "data/menu_details.csv"
 correlation_matrix_path = "data/menu_correlation_matrix.csv"
+meal_history_path = "data/meal_history.jsonl"
+
+# 바이너리 상관관계 행렬이 있으면 메모리 매핑해서 사용 (python -m src.menu_correlation 실행 시 생성)
+correlation_matrix_path = mapped_correlation_matrix_path(correlation_matrix_path)
 
-# 데이터 로드
+# 데이터 로더 (공유 데이터 저장소를 사용하므로 호출할 때마다 최신 데이터를 반환)
 loader = DataLoader(menu_file_path, user_file_path)
-menu_data, user_data = loader.load_data()
+
+# 모듈 로드가 끝난 시점
+_import_seconds = time.perf_counter() - _start_time
+
+# 시작 시간 보고에 표시할 무거운 라이브러리
+HEAVY_MODULES = ["matplotlib", "seaborn", "sklearn", "plotly", "scipy"]
+
+def warm_up():
+    """
+    데이터와 파생 데이터(사용자 행렬, 메뉴 스키마, 이웃 인덱스)를 미리 로드합니다.
+    무거운 라이브러리가 필요한 파생 데이터(지도 배치 등)는 포함하지 않습니다.
+    """
+    get_data_store().get_menu_data(menu_file_path)
+    get_data_store().get_correlation_matrix(correlation_matrix_path)
+    get_user_matrix(user_file_path)
+    get_menu_schema(menu_file_path)
+    get_neighbor_index(correlation_matrix_path)
+
+def start_background_warm_up():
+    """
+    메뉴 화면을 보여주는 동안 백그라운드 스레드에서 warm_up을 실행합니다.
+    먼저 기능을 선택해도 공유 데이터 저장소가 같은 데이터를 한 번만 로드하므로 결과는 같습니다.
+
+    Returns:
+        dict: 완료되면 "seconds"(소요 시간) 또는 "error"(오류 메시지)가 기록되는 상태.
+    """
+    status = {}
+
+    def run():
+        start = time.perf_counter()
+        try:
+            warm_up()
+        except Exception as e:  # 미리 로드하지 못해도 기능을 선택할 때 다시 로드하므로 기록만 함
+            status["error"] = str(e)
+        status["seconds"] = time.perf_counter() - start
+
+    threading.Thread(target=run, name="menumate-warm-up", daemon=True).start()
+    return status
+
+def startup_report(first_prompt_seconds, warm_up_status=None):
+    """
+    시작 시간 보고 문자열을 만듭니다.
+
+    Args:
+        first_prompt_seconds (float): 모듈 로드부터 첫 화면까지 걸린 시간(초).
+        warm_up_status (dict): start_background_warm_up이 반환한 상태.
+
+    Returns:
+        str: 시작 시간 보고.
+    """
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    lines = [
+        "[⏱️ 시작 시간 보고]",
+        f"  - 모듈 로드: {_import_seconds:.3f}초",
+        f"  - 첫 화면까지: {first_prompt_seconds:.3f}초",
+        f"  - 로드된 무거운 라이브러리: {', '.join(loaded) if loaded else '없음'}",
+    ]
+    if warm_up_status is not None:
+        if "seconds" not in warm_up_status:
+            lines.append("  - 데이터 미리 로드: 진행 중")
+        elif "error" in warm_up_status:
+            lines.append(f"  - 데이터 미리 로드: 실패 ({warm_up_status['error']})")
+        else:
+            lines.append(f"  - 데이터 미리 로드: {warm_up_status['seconds']:.3f}초 (백그라운드)")
+    return "\n".join(lines)
 
 def load_user_preferences(user_name, user_data_path):
     """
@@ -36,18 +113,33 @@ def load_user_preferences(user_name, user_data_path):
     Returns:
         dict: {메뉴: 선호도 점수} 형식의 사용자 선호도.
     """
-    user_data = pd.read_csv(user_data_path)
-
-    # 사용자 데이터에서 해당 사용자의 행 필터링
-    user_preferences = user_data[user_data["이름"] == user_name]
-    if user_preferences.empty:
+    user_matrix = get_user_matrix(user_data_path)
+    if user_name not in user_matrix:
         raise ValueError(f"'{user_name}' 사용자의 데이터가 없습니다.")
 
-    # '이름' 열 제외하고, 음식과 점수 매핑
-    return user_preferences.drop(columns=["이름"]).iloc[0].dropna().to_dict()
+    # 응답한 메뉴와 점수 매핑
+    return user_matrix.preferences(user_name)
 
 # 메인 함수
-def main():
+def main(show_startup_report=False):
+    """
+    MenuMate 대화형 메뉴를 실행합니다.
+
+    Args:
+        show_startup_report (bool): True이면 첫 화면 전과 종료할 때 시작 시간 보고를 출력합니다.
+    """
+    # 추가 로그에 쌓인 새 사용자를 주기적으로 사용자 데이터 CSV에 합침
+    UserStore(user_file_path).start_background_compaction()
+
+    # 식사 기록은 한 번만 만들어 두고, 그룹 추천마다 로그에 새로 추가된 부분만 읽음
+    meal_history = MealHistory(meal_history_path)
+
+    # 메뉴를 보여주는 동안 데이터를 미리 로드
+    warm_up_status = start_background_warm_up()
+    first_prompt_seconds = time.perf_counter() - _start_time
+    if show_startup_report:
+        print(startup_report(first_prompt_seconds, warm_up_status))
+
     while True:
         print("\n=== MenuMate에 오신 것을 환영합니다! ===")
         print("\n어떤 작업을 진행하시겠습니까?")
@@ -55,6 +147,7 @@ def main():
         print("2. 그룹 메뉴 추천 🍽️")
         print("3. 사용자 선호도 기반 메뉴 지도 생성 🗺️")
         print("4. 사용자 존재 및 설문 데이터 확인 📋")
+        print("7. 입맛이 비슷한 점심 친구 찾기 🤝")
         print("\n0. 프로그램 종료 ❌")
         print("\n=== MenuMate가 처음이신가요? ===")
         print("\n5. 새로운 사용자 데이터 추가 ➕")
@@ -64,7 +157,12 @@ def main():
         if choice == "1":
             # 개인 레포트 분석
             user_name = input("\n분석할 사용자의 이름을 입력해주세요: ")
-            user_analysis = UserAnalysis(menu_data, user_data)
+            from src.user_analysis import UserAnalysis
+            # 사용자 행렬로 분석하므로 사용자 데이터 DataFrame은 로드하지 않음
+            user_analysis = UserAnalysis(
+                get_data_store().get_menu_data(menu_file_path), None, get_user_matrix(user_file_path),
+                get_menu_schema(menu_file_path),
+            )
             try:
                 # 사용자 분석 결과
                 analysis_results = user_analysis.analyze_user(user_name, top_n=5)
@@ -118,9 +216,11 @@ def main():
         elif choice == "2":
             # 그룹 메뉴 추천
             group_names = input("\n추천할 그룹의 사용자 이름을 ','로 구분하여 입력해주세요: ").split(",")
+            from src.group_analysis import recommend_menus
             try:
                 recommended_menus, random_recommendations = recommend_menus(
-                    group_names, user_file_path, correlation_matrix_path, top_n=3, top_reasons=10
+                    group_names, user_file_path, correlation_matrix_path, top_n=3, top_reasons=10,
+                    meal_history=meal_history,
                 )
 
                 # 추가 설명
@@ -146,6 +246,13 @@ def main():
                     print(f"  ⭐ {idx}. {menu}")
 
                 print("\n👉 다음 식사에서 새로운 메뉴를 시도해 보세요! MenuMate가 함께합니다. 😊")
+
+                # 먹기로 한 메뉴를 기록하면 다음 추천에서 며칠 동안 감점됨
+                choice_number = input("\n오늘 먹을 추천 메뉴 번호를 입력하면 기록해둘게요 (건너뛰려면 Enter): ").strip()
+                if choice_number.isdigit() and 1 <= int(choice_number) <= len(recommended_menus):
+                    menu = recommended_menus[int(choice_number) - 1]["menu"]
+                    meal_history.record([name.strip() for name in group_names if name.strip()], menu)
+                    print(f"📝 '{menu}'를 식사 기록에 추가했습니다. 며칠 동안은 다른 메뉴를 먼저 추천할게요!")
             except ValueError as e:
                 print(f"⚠️ 오류 발생: {e}")
 
@@ -153,6 +260,7 @@ def main():
         elif choice == "3":
             # 사용자 선호도 기반 메뉴 지도 생성
             user_name = input("\n메뉴 지도를 생성할 사용자의 이름을 입력해주세요: ")
+            from src.menu_interactive_map import generate_menu_map
             try:
                 # 사용자 선호도 로드
                 user_preferences = load_user_preferences(user_name, user_file_path)
@@ -194,9 +302,25 @@ def main():
             except ValueError as e:
                 print(f"⚠️ 오류 발생: {e}")
 
+        elif choice == "7":
+            # 입맛이 비슷한 동료 찾기
+            user_name = input("\n점심 친구를 찾을 사용자의 이름을 입력해주세요: ")
+            from src.user_neighbors import find_lunch_buddies
+            try:
+                buddies = find_lunch_buddies(user_name, user_file_path, top_k=5)
+                print(f"\n[🤝 '{user_name}'님과 입맛이 비슷한 동료]")
+                for rank, buddy in enumerate(buddies, start=1):
+                    print(f"{rank}. {buddy['name']} (유사도: {buddy['similarity']:.2f})")
+                    if buddy["common_favorites"]:
+                        print(f"   함께 좋아하는 메뉴: {', '.join(buddy['common_favorites'][:5])}")
+                print("\n👉 함께 좋아하는 메뉴로 점심 약속을 잡아보세요! 😊")
+            except ValueError as e:
+                print(f"⚠️ 오류 발생: {e}")
+
         elif choice == "5":
             # 새로운 사용자 추가
             user_name = input("\n새로운 사용자의 이름을 입력해주세요: ")
+            from src.add_user import add_new_user
             try:
                 add_new_user(user_name, user_file_path)
             except Exception as e:
@@ -241,6 +365,8 @@ def main():
         elif choice == "0":
             # 프로그램 종료
             print("\nMenuMate를 이용해주셔서 감사합니다! 다음에 또 만나요. 😊")
+            if show_startup_report:
+                print(startup_report(first_prompt_seconds, warm_up_status))
             break
                 
         else:
@@ -248,4 +374,6 @@ def main():
 
 # 프로그램 실행
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="MenuMate")
+    parser.add_argument("--startup-report", action="store_true", help="시작 시간 보고를 출력합니다.")
+    main(show_startup_report=parser.parse_args().startup_report)
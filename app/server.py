@@ -0,0 +1,497 @@
+"""
+MenuMate HTTP 서버 모드입니다. 표준 라이브러리(asyncio)만 사용합니다.
+
+실행 방법:
+    python -m app.server --host 127.0.0.1 --port 8000
+
+데이터는 공유 데이터 저장소(DataStore)에 올려 둔 채로 요청마다 재사용하고,
+추천/분석/지도 생성처럼 CPU를 쓰는 작업은 실행기(스레드 풀)에서 처리해 이벤트 루프가 멈추지 않게 합니다.
+JSON 직렬화도 실행기에서 함께 처리합니다.
+
+엔드포인트 (모든 응답은 JSON):
+    GET  /health                                  서버 상태
+    GET  /recommend?users=연누,야옹&top_n=3         그룹 메뉴 추천
+    POST /recommend  {"users": [...], "top_n": 3, "top_reasons": 10}
+         seed=<정수> 또는 date=<YYYY-MM-DD>를 주면 같은 요청에 같은 결과를 반환하고 결과를 캐시합니다.
+         최근 식사 기록의 메뉴는 감점됩니다 (history_weight=0이면 끔).
+    GET  /meals?users=연누,야옹                      그룹의 최근 식사 기록
+    POST /meals  {"users": [...], "menu": "고등어조림", "date": "2024-05-01"}   식사 기록 추가
+    POST /partition  {"users": [...], "min_size": 4, "max_size": 8, "time_budget": 5}   식사 그룹 나누기와 그룹별 추천
+    GET  /users/<이름>                             사용자 설문 데이터
+    GET  /users/<이름>/analysis?top_n=5            개인 취향 분석
+    GET  /users/<이름>/buddies?top_k=5&approximate=1   입맛이 비슷한 동료 (metric=centered|cosine)
+    GET  /map?user=<이름>&render_mode=webgl         메뉴 지도 (Plotly figure JSON)
+
+여러 작업 프로세스로 실행할 때는 게시 프로세스(python -m src.shared_data)를 먼저 띄우고
+--shared-data로 연결하면 상관관계 행렬과 사용자 행렬을 공유 메모리에서 복사 없이 사용합니다.
+    python -m app.server --shared-data menumate --reuse-port
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+
+from app.app import correlation_matrix_path, load_user_preferences, menu_file_path, user_file_path
+from app.app import warm_up as warm_up_data
+from src.data_store import get_data_store
+from src.group_analysis import group_seed, recommend_menus
+from src.group_partition import partition_users
+from src.meal_history import MealHistory
+from src.menu_interactive_map import generate_menu_map
+from src.menu_schema import get_menu_schema
+from src.menu_layout import get_menu_layout
+from src.menu_neighbors import get_neighbor_index
+from src.shared_data import use_shared_data
+from src.user_analysis import UserAnalysis
+from src.user_details import UserDetails
+from src.user_matrix import get_user_matrix
+from src.user_neighbors import find_lunch_buddies
+
+STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+# 요청 본문 최대 크기 (바이트)
+MAX_BODY_SIZE = 1 << 20
+# 요청 헤더 최대 개수 (헤더를 끝없이 보내 메모리를 쓰지 못하도록 제한)
+MAX_HEADERS = 100
+
+# 그룹과 사용자별 최근 식사 기록 (추천에서 같은 메뉴가 며칠 연속 나오지 않도록 감점)
+meal_history = MealHistory()
+
+
+class HttpError(Exception):
+    """
+    HTTP 오류 응답으로 바로 변환되는 예외입니다.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _to_json_value(value):
+    # numpy 값과 NaN/무한대를 JSON으로 표현할 수 있는 값으로 변환
+    # (np.float64는 float의 하위 클래스라 json.dumps의 default가 호출되지 않으므로 dumps에서 미리 변환)
+    if isinstance(value, dict):
+        return {key: _to_json_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_to_json_value(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _series_to_dict(series):
+    return {key: _to_json_value(value) for key, value in series.dropna().items()}
+
+
+def dumps(data):
+    """
+    응답 데이터를 UTF-8 JSON 바이트로 변환합니다.
+    """
+    return json.dumps(_to_json_value(data), ensure_ascii=False, allow_nan=False).encode("utf-8")
+
+
+def _int_param(params, name, default):
+    value = params.get(name, default)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HttpError(400, f"'{name}'은(는) 정수여야 합니다.")
+
+
+def _float_param(params, name, default):
+    value = params.get(name, default)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise HttpError(400, f"'{name}'은(는) 숫자여야 합니다.")
+
+
+def _users_param(params, purpose):
+    users = params.get("users", [])
+    if isinstance(users, str):
+        users = users.split(",")
+    users = [name.strip() for name in users if name.strip()]
+    if not users:
+        raise HttpError(400, f"{purpose} 사용자 이름(users)을 입력해주세요.")
+    return users
+
+
+def _date_param(params):
+    if "date" not in params:
+        return None
+    try:
+        return datetime.date.fromisoformat(str(params["date"]))
+    except ValueError:
+        raise HttpError(400, "'date'는 YYYY-MM-DD 형식이어야 합니다.")
+
+
+def recommend(params):
+    """
+    그룹 메뉴 추천 결과를 반환합니다.
+
+    Args:
+        params (dict): users (리스트 또는 ','로 구분된 문자열), top_n, top_reasons,
+            seed (정수) 또는 date (YYYY-MM-DD, 그룹과 날짜로 시드를 만들고 식사 기록의 기준 날짜로 사용),
+            collaborative_weight (협업 유사도 반영 비율, 0~1), history_weight (최근 식사 감점 가중치, 기본값 1).
+
+    Returns:
+        dict: 추천 메뉴와 랜덤 추천 메뉴.
+    """
+    users = _users_param(params, "추천할")
+    date = _date_param(params)
+
+    seed = None
+    if "seed" in params:
+        seed = _int_param(params, "seed", None)
+    elif date is not None:
+        seed = group_seed(users, date)
+
+    recommended_menus, random_recommendations = recommend_menus(
+        users,
+        user_file_path,
+        correlation_matrix_path,
+        top_n=_int_param(params, "top_n", 3),
+        top_reasons=_int_param(params, "top_reasons", 10),
+        seed=seed,
+        collaborative_weight=_float_param(params, "collaborative_weight", 0.0),
+        meal_history=meal_history,
+        history_weight=_float_param(params, "history_weight", 1.0),
+        date=date,
+    )
+    return {"recommendations": recommended_menus, "random_recommendations": list(random_recommendations)}
+
+
+def meals(method, params):
+    """
+    그룹의 식사를 기록(POST)하거나 최근 식사 기록(GET)을 반환합니다.
+
+    Args:
+        method (str): HTTP 메서드.
+        params (dict): users, menu (POST), date (POST, 기본값 오늘).
+
+    Returns:
+        dict: 그룹의 최근 식사 기록.
+    """
+    users = _users_param(params, "식사 기록의")
+    if method == "POST":
+        menu = params.get("menu")
+        if menu not in get_data_store().get_correlation_matrix(correlation_matrix_path).index:
+            raise HttpError(400, f"알 수 없는 메뉴입니다: {menu}")
+        meal_history.record(users, menu, _date_param(params))
+    return {
+        "users": users,
+        "meals": [{"date": date.isoformat(), "menu": menu} for date, menu in meal_history.recent(users)],
+    }
+
+
+def partition(params):
+    """
+    사용자들을 입맛이 맞는 식사 그룹으로 나누고 그룹별 추천 메뉴를 반환합니다.
+    요청 처리 스레드 안에서 실행하므로 작업 프로세스를 만들지 않습니다.
+
+    Args:
+        params (dict): users, min_size, max_size, n_groups, time_budget (초, 최대 30), seed.
+
+    Returns:
+        dict: partition_users 결과.
+    """
+    n_groups = params.get("n_groups")
+    seed = params.get("seed")
+    return partition_users(
+        _users_param(params, "나눌"),
+        user_file_path,
+        correlation_matrix_path,
+        min_size=_int_param(params, "min_size", 4),
+        max_size=_int_param(params, "max_size", 8),
+        n_groups=_int_param(params, "n_groups", None) if n_groups is not None else None,
+        time_budget=min(_float_param(params, "time_budget", 5.0), 30.0),
+        seed=_int_param(params, "seed", None) if seed is not None else None,
+    )
+
+
+def user_details(user_name):
+    """
+    사용자 설문 데이터를 반환합니다.
+    """
+    return UserDetails(user_file_path).get_user_details(user_name)
+
+
+def user_analysis(user_name, params):
+    """
+    개인 취향 분석 결과를 반환합니다. 속성 요약은 값이 있는 속성만 포함합니다.
+    """
+    # 사용자 행렬로 분석하므로 사용자 데이터 DataFrame은 로드하지 않음
+    user_analysis = UserAnalysis(
+        get_data_store().get_menu_data(menu_file_path), None, get_user_matrix(user_file_path),
+        get_menu_schema(menu_file_path),
+    )
+    results = user_analysis.analyze_user(user_name, top_n=_int_param(params, "top_n", 5))
+    category_shares = results["favorite_menu_details"]["분류"].value_counts(normalize=True)
+    return {
+        "user_name": user_name,
+        "favorite_menus": results["favorite_menus"],
+        "disliked_menus": results["disliked_menus"],
+        "favorite_attributes": _series_to_dict(results["favorite_attributes"]),
+        "disliked_attributes": _series_to_dict(results["disliked_attributes"]),
+        "favorite_categories": _series_to_dict(category_shares),
+    }
+
+
+def lunch_buddies(user_name, params):
+    """
+    입맛이 비슷한 동료와 함께 좋아하는 메뉴를 반환합니다.
+    """
+    approximate = str(params.get("approximate", "0")).lower() in ("1", "true", "yes")
+    top_k = _int_param(params, "top_k", 5)
+    if top_k < 1:
+        raise HttpError(400, "'top_k'는 1 이상이어야 합니다.")
+    return {
+        "user_name": user_name,
+        "buddies": find_lunch_buddies(
+            user_name,
+            user_file_path,
+            top_k=top_k,
+            metric=params.get("metric", "centered"),
+            approximate=approximate,
+        ),
+    }
+
+
+def menu_map(params):
+    """
+    메뉴 지도를 Plotly figure JSON 문자열로 반환합니다.
+    """
+    user_name = params.get("user")
+    user_preferences = load_user_preferences(user_name, user_file_path) if user_name else None
+    max_edges_per_node = params.get("max_edges_per_node")
+    fig = generate_menu_map(
+        correlation_matrix_path,
+        user_preferences,
+        render_mode=params.get("render_mode", "webgl"),
+        max_edges_per_node=_int_param(params, "max_edges_per_node", None) if max_edges_per_node else None,
+    )
+    return fig.to_json()
+
+
+def route(method, path, params):
+    """
+    요청 경로에 맞는 처리 함수를 찾아 실행하고 응답 본문을 반환합니다. 실행기 안에서 호출됩니다.
+
+    Args:
+        method (str): HTTP 메서드.
+        path (str): 요청 경로.
+        params (dict): 쿼리 문자열과 JSON 본문을 합친 파라미터.
+
+    Returns:
+        bytes: JSON 응답 본문.
+    """
+    parts = [unquote(part) for part in path.strip("/").split("/") if part]
+
+    if parts == ["health"]:
+        return dumps({"status": "ok"})
+    if parts == ["recommend"]:
+        if method not in ("GET", "POST"):
+            raise HttpError(405, "GET 또는 POST만 지원합니다.")
+        return dumps(recommend(params))
+    if parts == ["meals"]:
+        if method not in ("GET", "POST"):
+            raise HttpError(405, "GET 또는 POST만 지원합니다.")
+        return dumps(meals(method, params))
+    if parts == ["partition"]:
+        if method not in ("GET", "POST"):
+            raise HttpError(405, "GET 또는 POST만 지원합니다.")
+        return dumps(partition(params))
+    if method != "GET":
+        raise HttpError(405, "GET만 지원합니다.")
+    if len(parts) == 2 and parts[0] == "users":
+        return dumps(user_details(parts[1]))
+    if len(parts) == 3 and parts[0] == "users" and parts[2] == "analysis":
+        return dumps(user_analysis(parts[1], params))
+    if len(parts) == 3 and parts[0] == "users" and parts[2] == "buddies":
+        return dumps(lunch_buddies(parts[1], params))
+    if parts == ["map"]:
+        return menu_map(params).encode("utf-8")
+    raise HttpError(404, f"경로를 찾을 수 없습니다: {path}")
+
+
+def warm_up(shared=False):
+    """
+    데이터와 파생 데이터(사용자 행렬, 이웃 인덱스, 지도 배치)를 미리 로드합니다.
+
+    Args:
+        shared (bool): True이면 공유 메모리에 게시된 데이터에서 만드는 파생 데이터만 미리 준비합니다 (CSV를 읽지 않음).
+    """
+    if shared:
+        get_user_matrix(user_file_path)
+        get_neighbor_index(correlation_matrix_path)
+    else:
+        warm_up_data()
+    get_menu_layout(correlation_matrix_path)
+
+
+class MenuMateServer:
+    """
+    asyncio 기반 HTTP/1.1 서버입니다. keep-alive 연결을 지원합니다.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8000, max_workers=8, shared_data=None, reuse_port=False):
+        """
+        Args:
+            host (str): 바인딩할 주소.
+            port (int): 포트 번호. 0이면 빈 포트를 사용합니다.
+            max_workers (int): 요청을 처리할 실행기 스레드 수.
+            shared_data (str): 공유 데이터 제어 블록 이름. 지정하면 게시 프로세스가 올린 배열을 사용합니다.
+            reuse_port (bool): True이면 여러 작업 프로세스가 같은 포트로 연결을 나누어 받습니다 (SO_REUSEPORT).
+        """
+        self.host = host
+        self.port = port
+        self.shared_data = shared_data
+        self.reuse_port = reuse_port
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="menumate")
+        self.server = None
+
+    async def start(self):
+        """
+        데이터를 미리 로드하고 연결을 받기 시작합니다.
+        """
+        loop = asyncio.get_running_loop()
+        if self.shared_data:
+            use_shared_data(self.shared_data, user_file_path, correlation_matrix_path)
+        await loop.run_in_executor(self.executor, warm_up, bool(self.shared_data))
+        self.server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, reuse_port=self.reuse_port or None
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """
+        서버를 닫고 실행기를 정리합니다.
+        """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.executor.shutdown(wait=False)
+
+    async def _read_request(self, reader):
+        # 요청 줄, 헤더, 본문을 읽음. 연결이 닫혔으면 None 반환
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        try:
+            method, target, _ = request_line.decode("latin-1").split()
+        except ValueError:
+            raise HttpError(400, "잘못된 요청 줄입니다.")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise HttpError(431, "요청 헤더가 너무 많습니다.")
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", 0) or 0)
+        if length > MAX_BODY_SIZE:
+            raise HttpError(413, "요청 본문이 너무 큽니다.")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    def _parse_params(self, target, body):
+        url = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if body:
+            try:
+                payload = json.loads(body.decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                raise HttpError(400, "요청 본문은 JSON이어야 합니다.")
+            if not isinstance(payload, dict):
+                raise HttpError(400, "요청 본문은 JSON 객체여야 합니다.")
+            params.update(payload)
+        return url.path, params
+
+    async def _handle_connection(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, target, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    path, params = self._parse_params(target, body)
+                    response = await loop.run_in_executor(self.executor, route, method, path, params)
+                    status = 200
+                except HttpError as e:
+                    status, response = e.status, dumps({"error": e.message})
+                except ValueError as e:
+                    status, response = 400, dumps({"error": str(e)})
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:
+                    status, response = 500, dumps({"error": f"서버 오류가 발생했습니다: {e}"})
+
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                        "Content-Type: application/json; charset=utf-8\r\n"
+                        f"Content-Length: {len(response)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                        "\r\n"
+                    ).encode("latin-1")
+                    + response
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host="127.0.0.1", port=8000, max_workers=8, shared_data=None, reuse_port=False):
+    """
+    서버를 시작하고 종료될 때까지 요청을 처리합니다.
+    """
+    server = MenuMateServer(host, port, max_workers, shared_data, reuse_port)
+    await server.start()
+    print(f"MenuMate 서버가 http://{server.host}:{server.port} 에서 실행 중입니다. (종료: Ctrl+C)")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MenuMate HTTP 서버")
+    parser.add_argument("--host", default="127.0.0.1", help="바인딩할 주소")
+    parser.add_argument("--port", type=int, default=8000, help="포트 번호")
+    parser.add_argument("--workers", type=int, default=8, help="요청을 처리할 실행기 스레드 수")
+    parser.add_argument("--shared-data", default=None, help="공유 데이터 제어 블록 이름 (python -m src.shared_data로 게시)")
+    parser.add_argument("--reuse-port", action="store_true", help="여러 서버 프로세스가 같은 포트를 함께 사용합니다.")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.shared_data, args.reuse_port))
+    except KeyboardInterrupt:
+        print("\nMenuMate 서버를 종료합니다.")
@@ -0,0 +1,292 @@
+"""
+MenuMate 주요 경로의 실행 시간을 측정하고 결과를 JSON으로 저장합니다.
+
+프로젝트 루트에서 다음과 같이 실행합니다. --scale은 "사용자수x메뉴수x속성열수" 형식이며 여러 번 줄 수 있습니다.
+    python -m benchmarks.run_benchmarks --scale 1000x100x181 --scale 10000x500x181 --repeat 5
+
+결과는 기본적으로 benchmarks/results/<시각>.json에 저장되며, 규모별 결과를 비교해
+성능 저하나 규모에 따른 증가 추세를 확인할 수 있습니다.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic_data import generate_user_data, write_dataset
+from src.add_user import add_new_user
+from src.bulk_import import import_responses
+from src.data_store import get_data_store
+from src.group_analysis import recommend_menus
+from src.group_partition import partition_users
+from src.menu_correlation import build_correlation_matrix
+from src.menu_interactive_map import generate_menu_map
+from src.menu_layout import layout_path_for
+from src.menu_schema import get_menu_schema
+from src.population_stats import compute_population_stats
+from src.shared_data import SharedDataPublisher, SharedDataReader
+from src.user_analysis import UserAnalysis
+from src.user_matrix import get_user_matrix
+from src.user_neighbors import get_user_neighbor_index
+from src.user_store import UserStore
+
+# classic 모드 지도는 연결선마다 trace를 만들므로 메뉴가 이보다 많으면 측정하지 않음
+MAX_CLASSIC_MAP_MENUS = 300
+
+
+def parse_scale(text):
+    """
+    "사용자수x메뉴수x속성열수" 문자열을 (사용자 수, 메뉴 수, 속성 열 수)로 변환합니다.
+    """
+    try:
+        n_users, n_menus, n_features = (int(value) for value in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"규모는 '사용자수x메뉴수x속성열수' 형식이어야 합니다: {text}")
+    return n_users, n_menus, n_features
+
+
+def measure(func, repeat):
+    """
+    함수를 repeat번 실행해 실행 시간 통계를 반환합니다.
+
+    Returns:
+        dict: 반복 횟수와 최소/중앙값/평균/최대 실행 시간(초).
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        "repeat": repeat,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "max": max(timings),
+    }
+
+
+def _add_user_inputs(n_menus, seed):
+    # add_new_user의 input() 응답 (메뉴 수만큼의 점수)
+    rng = np.random.default_rng(seed)
+    return [str(score) for score in rng.integers(1, 5, size=n_menus)]
+
+
+def run_scale(n_users, n_menus, n_features, repeat, seed=0, group_size=4):
+    """
+    한 규모의 합성 데이터로 모든 벤치마크를 실행합니다.
+
+    Returns:
+        dict: {벤치마크 이름: 실행 시간 통계}
+    """
+    store = get_data_store()
+    rng = np.random.default_rng(seed)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        paths = write_dataset(directory, n_users, n_menus, n_features, seed)
+        print(f"  합성 데이터 생성: {time.perf_counter() - start:.2f}초")
+
+        # 상관관계 행렬 전체 계산 (CSV + 바이너리 저장 포함)
+        results["correlation_build"] = measure(
+            lambda: build_correlation_matrix(paths["menu"], paths["correlation"], paths["correlation_binary"]),
+            repeat,
+        )
+
+        # 데이터 로드 (파일 읽기와 사용자 행렬 생성)
+        def load_data():
+            store.invalidate()
+            store.get_menu_data(paths["menu"])
+            get_user_matrix(paths["user"])
+            store.get_correlation_matrix(paths["correlation"])
+        results["data_load"] = measure(load_data, repeat)
+
+        # 작업 프로세스의 공유 메모리 연결 (CSV를 읽지 않고 게시된 배열을 매핑)
+        with SharedDataPublisher(f"menumate_bench_{os.getpid()}", paths["user"], paths["correlation"]) as publisher:
+            publisher.publish()
+            results["shared_data_attach"] = measure(lambda: SharedDataReader(publisher.name).snapshot(), repeat)
+
+        user_names = list(get_user_matrix(paths["user"]).name_to_row)
+        groups = [rng.choice(user_names, size=min(group_size, len(user_names)), replace=False).tolist() for _ in range(repeat)]
+        group_iter = iter(groups * 2)
+
+        # 그룹 추천 (첫 호출은 파생 데이터 생성 포함)
+        def recommend_cold():
+            store.invalidate()
+            recommend_menus(next(group_iter), paths["user"], paths["correlation"])
+        results["recommend_menus_cold"] = measure(recommend_cold, repeat)
+        results["recommend_menus"] = measure(
+            lambda: recommend_menus(next(group_iter), paths["user"], paths["correlation"]), repeat
+        )
+
+        # 식사 그룹 나누기 (최대 300명, 재시작 1회)
+        partition_names = user_names[:300]
+        results["partition_users"] = measure(
+            lambda: partition_users(partition_names, paths["user"], paths["correlation"], time_budget=30, n_restarts=1, seed=seed),
+            repeat,
+        )
+
+        # 개인 분석
+        user_analysis = UserAnalysis(
+            store.get_menu_data(paths["menu"]),
+            None,
+            get_user_matrix(paths["user"]),
+            get_menu_schema(paths["menu"]),
+        )
+        analysis_users = iter(rng.choice(user_names, size=repeat).tolist())
+        results["analyze_user"] = measure(lambda: user_analysis.analyze_user(next(analysis_users)), repeat)
+
+        # 입맛이 비슷한 동료 검색 (정확 검색, 해시 색인 근사 검색)
+        neighbor_index = get_user_neighbor_index(paths["user"])
+        buddy_users = iter(rng.choice(user_names, size=repeat * 2).tolist())
+        results["user_neighbors_exact"] = measure(lambda: neighbor_index.nearest(next(buddy_users), 10), repeat)
+        neighbor_index.nearest(user_names[0], 10, approximate=True)  # 해시 색인 생성
+        results["user_neighbors_approximate"] = measure(
+            lambda: neighbor_index.nearest(next(buddy_users), 10, approximate=True), repeat
+        )
+
+        # 메뉴 지도 (첫 호출은 PCA/KMeans 배치 계산 포함)
+        preferences = get_user_matrix(paths["user"]).preferences(user_names[0])
+        def map_cold():
+            store.invalidate()
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(layout_path_for(paths["correlation"]))
+            generate_menu_map(paths["correlation"], preferences, render_mode="webgl")
+        results["generate_menu_map_cold"] = measure(map_cold, repeat)
+        results["generate_menu_map_webgl"] = measure(
+            lambda: generate_menu_map(paths["correlation"], preferences, render_mode="webgl"), repeat
+        )
+        if n_menus <= MAX_CLASSIC_MAP_MENUS:
+            results["generate_menu_map_classic"] = measure(
+                lambda: generate_menu_map(paths["correlation"], preferences, render_mode="classic"), repeat
+            )
+
+        # 새 사용자 추가 (설문 입력은 미리 준비한 응답으로 대체하고 출력은 버림)
+        counter = iter(range(repeat))
+        def add_user():
+            idx = next(counter)
+            with mock.patch("builtins.input", side_effect=_add_user_inputs(n_menus, seed + idx)), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                add_new_user(f"벤치마크{idx}", paths["user"])
+        results["add_new_user"] = measure(add_user, repeat)
+
+        # 추가 로그 정리 (CSV 전체를 다시 쓰는 비용)
+        user_store = UserStore(paths["user"])
+        new_user = {"이름": "정리", **{menu: 3 for menu in user_store.snapshot().columns[1:]}}
+        def compact():
+            user_store.append([new_user])
+            user_store.compact()
+        results["user_store_compact"] = measure(compact, repeat)
+
+        # 설문 응답 일괄 가져오기 (사용자 수만큼의 응답, 반복마다 다른 이름)
+        menus = user_store.snapshot().columns[1:].tolist()
+        source_paths = []
+        for idx in range(repeat):
+            responses = generate_user_data(menus, n_users, missing_rate=0, seed=seed + idx)
+            responses["이름"] = f"가져오기{idx}_" + responses["이름"]
+            source_paths.append(os.path.join(directory, f"responses{idx}.csv"))
+            responses.to_csv(source_paths[-1], index=False)
+        source_iter = iter(source_paths)
+        results["bulk_import"] = measure(lambda: import_responses(next(source_iter), paths["user"]), repeat)
+
+        # 전체 사용자 점수 통계 (범위 단위 스트리밍 집계)
+        results["population_stats"] = measure(lambda: compute_population_stats(paths["user"]), repeat)
+
+        store.invalidate()
+    return results
+
+
+def measure_startup(repeat):
+    """
+    새 프로세스에서 대화형 앱 모듈을 가져오는 데 걸리는 시간(첫 화면까지의 비용)을 측정합니다.
+    비교를 위해 pandas만 가져오는 시간도 함께 측정합니다.
+
+    Returns:
+        dict: {벤치마크 이름: 실행 시간 통계}
+    """
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+    def run(code):
+        subprocess.run([sys.executable, "-c", code], cwd=project_root, check=True)
+
+    return {
+        "startup_app_import": measure(lambda: run("import app.app"), repeat),
+        "startup_pandas_import": measure(lambda: run("import pandas"), repeat),
+    }
+
+
+def environment():
+    """
+    결과를 비교할 때 필요한 실행 환경 정보를 반환합니다.
+    """
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def run_benchmarks(scales, repeat=5, seed=0):
+    """
+    여러 규모의 벤치마크를 실행합니다.
+
+    Args:
+        scales (list): (사용자 수, 메뉴 수, 속성 열 수) 튜플 리스트.
+        repeat (int): 벤치마크별 반복 횟수.
+        seed (int): 합성 데이터 난수 시드.
+
+    Returns:
+        dict: 실행 환경과 규모별 결과.
+    """
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "repeat": repeat,
+        "seed": seed,
+        "startup": measure_startup(repeat),
+        "runs": [],
+    }
+    for name, stats in report["startup"].items():
+        print(f"{name}: 중앙값 {stats['median'] * 1000:.2f}ms")
+    for n_users, n_menus, n_features in scales:
+        print(f"규모 측정 중: 사용자 {n_users}명 × 메뉴 {n_menus}개 × 속성 {n_features}개")
+        results = run_scale(n_users, n_menus, n_features, repeat, seed)
+        for name, stats in results.items():
+            print(f"  {name}: 중앙값 {stats['median'] * 1000:.2f}ms")
+        report["runs"].append({"users": n_users, "menus": n_menus, "features": n_features, "results": results})
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MenuMate 벤치마크")
+    parser.add_argument(
+        "--scale", type=parse_scale, action="append",
+        help="'사용자수x메뉴수x속성열수' 형식의 규모 (여러 번 지정 가능, 기본값: 1000x100x181)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="벤치마크별 반복 횟수")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 난수 시드")
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 경로 (기본값: benchmarks/results/<시각>.json)")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.scale or [(1000, 100, 181)], repeat=args.repeat, seed=args.seed)
+    output_path = args.output or os.path.join(
+        "benchmarks", "results", f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과를 {output_path}에 저장했습니다.")
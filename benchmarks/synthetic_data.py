@@ -0,0 +1,123 @@
+"""
+벤치마크용 합성 데이터 생성기입니다.
+
+processed_menu_details.csv, processed_user_data.csv, menu_correlation_matrix.csv와 같은 형식의 데이터를
+원하는 크기(사용자 수 × 메뉴 수 × 속성 열 수)로 만듭니다. 같은 seed에서는 항상 같은 데이터를 만듭니다.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.menu_correlation import build_correlation_matrix
+
+# 실제 데이터의 속성 계열별 열 수 (전체 181개)
+ATTRIBUTE_FAMILIES = {
+    "주재료": 90,
+    "맛 프로파일": 18,
+    "식사 타입/상황": 17,
+    "조리 방식": 47,
+    "계절/날씨": 9,
+}
+CATEGORIES = ["한식", "일식", "중식", "양식", "기타"]
+CATEGORY_WEIGHTS = [0.65, 0.17, 0.09, 0.07, 0.02]
+CONVENIENCE = ["보통", "간편", "복잡"]
+CONVENIENCE_WEIGHTS = [0.7, 0.16, 0.14]
+
+
+def family_sizes(n_features):
+    """
+    전체 속성 열 수를 실제 데이터의 계열별 비율대로 나눕니다. 계열마다 최소 1개 열을 가집니다.
+
+    Args:
+        n_features (int): 전체 속성 열 수 (계열 수 이상).
+
+    Returns:
+        dict: {계열 이름: 열 수}
+    """
+    if n_features < len(ATTRIBUTE_FAMILIES):
+        raise ValueError(f"속성 열 수는 {len(ATTRIBUTE_FAMILIES)} 이상이어야 합니다.")
+    total = sum(ATTRIBUTE_FAMILIES.values())
+    sizes = {family: max(1, count * n_features // total) for family, count in ATTRIBUTE_FAMILIES.items()}
+    # 반올림 오차는 가장 큰 계열(주재료)에서 조정
+    sizes["주재료"] += n_features - sum(sizes.values())
+    return sizes
+
+
+def generate_menu_data(n_menus, n_features=181, seed=0):
+    """
+    전처리된 메뉴 데이터와 같은 형식의 합성 데이터를 만듭니다.
+    메뉴마다 계열별로 1~3개의 속성을 가집니다 (실제 데이터는 메뉴당 약 10개).
+
+    Args:
+        n_menus (int): 메뉴 수.
+        n_features (int): 속성(원-핫) 열 수.
+        seed (int): 난수 시드.
+
+    Returns:
+        pd.DataFrame: 메뉴, 간편성, 분류, 속성 열을 가지는 메뉴 데이터.
+    """
+    rng = np.random.default_rng(seed)
+    columns, blocks = [], []
+    for family, size in family_sizes(n_features).items():
+        columns += [f"{family}_{idx}" for idx in range(size)]
+        block = np.zeros((n_menus, size), dtype=np.int64)
+        for menu_idx in range(n_menus):
+            chosen = rng.choice(size, size=min(size, rng.integers(1, 4)), replace=False)
+            block[menu_idx, chosen] = 1
+        blocks.append(block)
+
+    menu_data = pd.DataFrame(np.hstack(blocks), columns=columns)
+    menu_data.insert(0, "분류", rng.choice(CATEGORIES, size=n_menus, p=CATEGORY_WEIGHTS))
+    menu_data.insert(0, "간편성", rng.choice(CONVENIENCE, size=n_menus, p=CONVENIENCE_WEIGHTS))
+    menu_data.insert(0, "메뉴", [f"메뉴{idx:05d}" for idx in range(n_menus)])
+    return menu_data
+
+
+def generate_user_data(menus, n_users, missing_rate=0.003, seed=0):
+    """
+    사용자 선호도 데이터와 같은 형식의 합성 데이터를 만듭니다. 점수는 1~4이고 일부는 결측입니다.
+
+    Args:
+        menus (list): 메뉴 이름 리스트.
+        n_users (int): 사용자 수.
+        missing_rate (float): 결측 점수 비율.
+        seed (int): 난수 시드.
+
+    Returns:
+        pd.DataFrame: 이름과 메뉴별 점수 열을 가지는 사용자 데이터.
+    """
+    rng = np.random.default_rng(seed + 1)
+    scores = rng.integers(1, 5, size=(n_users, len(menus))).astype(float)
+    scores[rng.random(scores.shape) < missing_rate] = np.nan
+    user_data = pd.DataFrame(scores, columns=menus)
+    user_data.insert(0, "이름", [f"사용자{idx:07d}" for idx in range(n_users)])
+    return user_data
+
+
+def write_dataset(directory, n_users, n_menus, n_features=181, seed=0):
+    """
+    합성 메뉴 데이터, 사용자 데이터, 상관관계 행렬을 폴더에 저장합니다.
+
+    Args:
+        directory (str): 저장할 폴더. 없으면 만듭니다.
+        n_users (int): 사용자 수.
+        n_menus (int): 메뉴 수.
+        n_features (int): 속성 열 수.
+        seed (int): 난수 시드.
+
+    Returns:
+        dict: menu, user, correlation, correlation_binary 파일 경로.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = {
+        "menu": os.path.join(directory, "processed_menu_details.csv"),
+        "user": os.path.join(directory, "processed_user_data.csv"),
+        "correlation": os.path.join(directory, "menu_correlation_matrix.csv"),
+        "correlation_binary": os.path.join(directory, "menu_correlation_matrix.npy"),
+    }
+    menu_data = generate_menu_data(n_menus, n_features, seed)
+    menu_data.to_csv(paths["menu"], index=False)
+    generate_user_data(menu_data["메뉴"].tolist(), n_users, seed=seed).to_csv(paths["user"], index=False)
+    build_correlation_matrix(paths["menu"], paths["correlation"], paths["correlation_binary"])
+    return paths
@@ -1,4 +1,7 @@
-import pandas as pd
+from src.co_preference import get_co_preference
+from src.user_matrix import get_user_matrix
+from src.user_neighbors import get_user_neighbor_index
+from src.user_store import UserStore
 
 def add_new_user(user_name, user_file_path):
     """
@@ -11,11 +14,8 @@ def add_new_user(user_name, user_file_path):
     Returns:
         None: 사용자 데이터 파일에 새로운 행이 추가됩니다.
     """
-    # 사용자 데이터 파일 로드
-    user_data = pd.read_csv(user_file_path)
-
-    # 메뉴 추출 (1행 2열부터 끝까지 열 이름)
-    menu_names = user_data.columns[1:].tolist()
+    # 메뉴 추출 (사용자 행렬의 열 순서 = 사용자 데이터의 메뉴 열 순서)
+    menu_names = list(get_user_matrix(user_file_path).menus)
 
     # 새 유저의 선호도 입력받기
     print(f"'{user_name}'님의 선호도를 입력해주세요.")
@@ -51,14 +51,12 @@ def add_new_user(user_name, user_file_path):
         remaining = total_menus - completed
         print(f"✅ 진행 상황: {completed}/{total_menus} 완료, {remaining}개 남음")
 
-    # 새로운 유저 데이터 생성
-    new_user_row = pd.DataFrame([{**{"이름": user_name}, **user_preferences}])
-
-    # 기존 데이터와 병합
-    user_data = pd.concat([user_data, new_user_row], ignore_index=True)
+    # 새로운 유저 데이터를 추가 로그에 기록 (전체 CSV를 다시 쓰지 않음)
+    UserStore(user_file_path).append([{**{"이름": user_name}, **user_preferences}])
 
-    # CSV 저장
-    user_data.to_csv(user_file_path, index=False)
+    # 공유 데이터 저장소는 추가 로그가 바뀐 것을 감지해 다음 요청에서 추가된 행만 읽어 사용자 행렬에 붙임
+    # (무효화하지 않아야 사용자별 파생 데이터를 바뀐 행만 다시 계산할 수 있음)
+    # 협업 유사도 통계량과 유사 사용자 색인에는 새 사용자 행만 더함 (전체 사용자를 다시 계산하지 않음)
+    get_co_preference(user_file_path)
+    get_user_neighbor_index(user_file_path)
     print(f"\n✅ 새로운 사용자 '{user_name}'님의 데이터가 저장되었습니다!")
-    print("\n⚠️ 주의 : 새로운 사용자 추가 후에는 프로그램을 재시작 해야합니다!")
-    print("0번을 눌러 프로그램을 종료 후 재시작 해주세요 😊")
@@ -0,0 +1,238 @@
+"""
+설문 응답 일괄 가져오기입니다.
+
+설문 폼에서 내보낸 CSV 또는 JSONL(한 줄에 하나의 응답) 파일을 chunk_size개씩 읽어 검증하고,
+통과한 응답은 임시 파일에 모았다가 사용자 데이터 CSV 끝에 한 번에 붙입니다.
+메모리는 응답 수와 무관하게 한 번에 읽는 묶음 크기(와 이름 집합)만큼만 사용합니다.
+
+    python -m src.bulk_import responses.csv --user-file data/processed_user_data.csv
+
+검증 항목 (묶음 단위 벡터 연산):
+    - 이름이 비어 있지 않을 것
+    - 기존 사용자 또는 앞서 가져온 응답과 이름이 겹치지 않을 것
+    - 알 수 없는 메뉴 이름의 응답이 없을 것
+    - 점수가 1~4의 정수일 것 (allow_missing=False이면 모든 메뉴에 응답했을 것)
+
+통과하지 못한 응답은 응답 순번(1부터), 이름, 사유와 함께 거절 보고서(CSV)에 기록됩니다.
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from src.user_matrix import get_user_matrix
+from src.user_store import UserStore
+
+NAME_COLUMN = "이름"
+VALID_SCORES = (1, 2, 3, 4)
+REPORT_COLUMNS = ["행", "이름", "사유"]
+
+
+def report_path_for(source_path):
+    """
+    가져올 파일에 대응하는 거절 보고서 경로를 반환합니다.
+    """
+    return os.path.splitext(source_path)[0] + ".rejected.csv"
+
+
+def _read_jsonl_chunks(source_path, chunk_size):
+    # 읽을 수 없는 줄은 이름이 없는 응답으로 만들고 사유를 따로 넘김
+    records, errors = [], {}
+    with open(source_path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("객체가 아닙니다")
+            except ValueError as e:
+                errors[len(records)] = f"JSON 형식 오류 ({e})"
+                record = {}
+            records.append(record)
+            if len(records) == chunk_size:
+                yield pd.DataFrame.from_records(records), errors
+                records, errors = [], {}
+    if records:
+        yield pd.DataFrame.from_records(records), errors
+
+
+def read_response_chunks(source_path, chunk_size=10000):
+    """
+    응답 파일을 묶음 단위로 읽습니다. 확장자가 .jsonl 또는 .json이면 JSONL, 그 밖에는 CSV로 읽습니다.
+
+    Args:
+        source_path (str): 응답 파일 경로.
+        chunk_size (int): 한 번에 읽을 응답 수.
+
+    Yields:
+        tuple: (응답 DataFrame, {묶음 안 위치: 읽기 오류 사유})
+    """
+    if os.path.splitext(source_path)[1].lower() in (".jsonl", ".json"):
+        yield from _read_jsonl_chunks(source_path, chunk_size)
+        return
+    for chunk in pd.read_csv(source_path, chunksize=chunk_size, dtype={NAME_COLUMN: str}):
+        yield chunk, {}
+
+
+def validate_chunk(chunk, menus, taken_names, allow_missing=False, parse_errors=None):
+    """
+    응답 묶음을 검증합니다.
+
+    Args:
+        chunk (pd.DataFrame): 응답 묶음 ("이름"과 메뉴별 점수 열).
+        menus (list): 사용자 데이터의 메뉴 이름 리스트 (열 순서).
+        taken_names (set): 이미 사용 중인 이름 (기존 사용자와 앞서 통과한 응답).
+        allow_missing (bool): True이면 응답하지 않은 메뉴를 결측으로 허용합니다.
+        parse_errors (dict): {묶음 안 위치: 읽기 오류 사유}.
+
+    Returns:
+        tuple: (통과 여부 bool 배열, 이름 배열, 메뉴 순서의 int8 점수 배열 (결측은 0), {묶음 안 위치: 거절 사유 리스트})
+    """
+    n_rows = len(chunk)
+    reasons = {}
+
+    def reject(mask, reason):
+        for position in np.flatnonzero(mask):
+            reasons.setdefault(position, []).append(reason)
+
+    for position, reason in (parse_errors or {}).items():
+        reasons.setdefault(position, []).append(reason)
+
+    # 이름 (앞뒤 공백 제거)
+    if NAME_COLUMN in chunk.columns:
+        names = chunk[NAME_COLUMN].astype("string").str.strip().fillna("").to_numpy(dtype=object)
+    else:
+        names = np.full(n_rows, "", dtype=object)
+    reject(names == "", "이름 없음")
+    # 줄바꿈이 있는 이름은 한 행에 한 사용자라고 가정하는 추가 로그와 CSV 행 처리를 깨뜨리므로 거절
+    reject(np.array([("\n" in name) or ("\r" in name) for name in names], dtype=bool), "이름에 줄바꿈")
+
+    # 알 수 없는 메뉴에 응답한 경우
+    known = set(menus)
+    for column in chunk.columns:
+        if column != NAME_COLUMN and column not in known:
+            reject(chunk[column].notna().to_numpy(), f"알 수 없는 메뉴: {column}")
+
+    # 점수 (숫자로 바꿀 수 없거나 1~4의 정수가 아니면 거절)
+    raw = chunk.reindex(columns=menus)
+    answered = raw.notna().to_numpy()
+    values = raw.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    invalid = answered & ~np.isin(values, VALID_SCORES)
+    invalid_rows = invalid.any(axis=1)
+    for position in np.flatnonzero(invalid_rows):
+        bad_menus = [menus[idx] for idx in np.flatnonzero(invalid[position])]
+        reasons.setdefault(position, []).append(
+            "잘못된 점수 (1~4의 정수가 아님): " + ", ".join(bad_menus[:5]) + (" 외" if len(bad_menus) > 5 else "")
+        )
+    if not allow_missing:
+        missing_counts = (~answered).sum(axis=1)
+        for position in np.flatnonzero(missing_counts > 0):
+            reasons.setdefault(position, []).append(f"응답하지 않은 메뉴 {missing_counts[position]}개")
+
+    # 중복 이름 (다른 검사를 통과한 응답 중에서 기존 이름이거나 앞에 같은 이름이 있으면 거절)
+    valid = np.ones(n_rows, dtype=bool)
+    valid[list(reasons)] = False
+    valid_positions = np.flatnonzero(valid)
+    valid_names = pd.Series(names[valid_positions])
+    duplicated = (valid_names.isin(taken_names) | valid_names.duplicated()).to_numpy()
+    for position in valid_positions[duplicated]:
+        reasons[position] = ["중복된 이름"]
+    valid[valid_positions[duplicated]] = False
+
+    scores = np.where(answered & ~invalid, np.nan_to_num(values), 0).astype(np.int8)
+    return valid, names, scores, reasons
+
+
+def _csv_field(value):
+    # 쉼표, 따옴표가 있는 이름만 따옴표로 감쌈 (줄바꿈이 있는 이름은 validate_chunk에서 거절됨)
+    if any(char in value for char in ',"'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _format_rows(names, scores):
+    """
+    이름과 int8 점수 배열을 헤더 없는 CSV 행 문자열로 만듭니다. 결측(0)은 빈 칸입니다.
+    """
+    if len(names) == 0:
+        return ""
+    # 점수는 한 자리 숫자이므로 ",점수" 문자열을 바이트 배열로 한 번에 만듦
+    digits = np.full((len(scores), scores.shape[1] * 2), ord(","), dtype=np.uint8)
+    digits[:, 1::2] = scores.astype(np.uint8) + ord("0")
+    complete = (scores > 0).all(axis=1)
+    lines = []
+    for row, name in enumerate(names):
+        if complete[row]:
+            lines.append(_csv_field(name) + digits[row].tobytes().decode("ascii"))
+        else:
+            lines.append(_csv_field(name) + "".join("," + (str(score) if score else "") for score in scores[row]))
+    return "\n".join(lines) + "\n"
+
+
+def import_responses(source_path, user_file_path, chunk_size=10000, allow_missing=False, report_path=None):
+    """
+    설문 응답 파일을 검증해 사용자 데이터에 한 번에 추가하고, 거절된 응답은 보고서에 기록합니다.
+    검증한 뒤 추가하기 전에 다른 곳에서 같은 이름이 먼저 추가되었다면 아무것도 추가하지 않고 ValueError를 발생시킵니다.
+
+    Args:
+        source_path (str): 응답 파일 경로 (CSV 또는 JSONL).
+        user_file_path (str): 사용자 데이터 파일 경로.
+        chunk_size (int): 한 번에 읽고 검증할 응답 수.
+        allow_missing (bool): True이면 응답하지 않은 메뉴를 결측으로 허용합니다.
+        report_path (str): 거절 보고서 경로. 기본값은 <응답 파일 이름>.rejected.csv.
+
+    Returns:
+        dict: {"accepted": 추가된 응답 수, "rejected": 거절된 응답 수, "report_path": 거절 보고서 경로}
+    """
+    report_path = report_path or report_path_for(source_path)
+    user_matrix = get_user_matrix(user_file_path)
+    menus = user_matrix.menus
+    taken_names = set(user_matrix.name_to_row)
+    accepted_names = []
+
+    accepted_count, rejected_count, offset = 0, 0, 0
+    directory = os.path.dirname(os.path.abspath(user_file_path))
+    fd, spool_path = tempfile.mkstemp(dir=directory, prefix=".import_", suffix=".csv")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as spool, \
+                open(report_path, "w", encoding="utf-8", newline="") as report_file:
+            report = csv.writer(report_file)
+            report.writerow(REPORT_COLUMNS)
+            for chunk, parse_errors in read_response_chunks(source_path, chunk_size):
+                valid, names, scores, reasons = validate_chunk(chunk, menus, taken_names, allow_missing, parse_errors)
+                spool.write(_format_rows(names[valid], scores[valid]))
+                taken_names.update(names[valid])
+                accepted_names.extend(names[valid].tolist())
+                for position in sorted(reasons):
+                    report.writerow([offset + position + 1, names[position], "; ".join(reasons[position])])
+                accepted_count += int(valid.sum())
+                rejected_count += len(reasons)
+                offset += len(chunk)
+
+        # 통과한 응답을 한 번의 쓰기로 추가
+        if accepted_count > 0:
+            UserStore(user_file_path).append_csv_rows(spool_path, names=accepted_names)
+    finally:
+        os.remove(spool_path)
+
+    return {"accepted": accepted_count, "rejected": rejected_count, "report_path": report_path}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="설문 응답 파일(CSV/JSONL)을 사용자 데이터에 일괄 추가합니다.")
+    parser.add_argument("source", help="응답 파일 경로 (.csv 또는 .jsonl)")
+    parser.add_argument("--user-file", default="data/processed_user_data.csv", help="사용자 데이터 파일 경로")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="한 번에 읽을 응답 수")
+    parser.add_argument("--allow-missing", action="store_true", help="응답하지 않은 메뉴를 결측으로 허용합니다.")
+    parser.add_argument("--report", default=None, help="거절 보고서 경로 (기본값: <응답 파일 이름>.rejected.csv)")
+    args = parser.parse_args()
+
+    summary = import_responses(args.source, args.user_file, args.chunk_size, args.allow_missing, args.report)
+    print(f"추가 {summary['accepted']}명, 거절 {summary['rejected']}명")
+    if summary["rejected"]:
+        print(f"거절 사유는 {summary['report_path']}에서 확인할 수 있습니다.")
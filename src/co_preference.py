@@ -0,0 +1,236 @@
+"""
+사용자 점수로 계산하는 메뉴 간 협업(co-preference) 유사도입니다.
+
+두 메뉴를 모두 평가한 사용자들의 점수로 피어슨 상관계수를 구합니다. 상관계수에 필요한 충분 통계량
+(메뉴 쌍별 응답자 수, 점수 합, 제곱합, 곱의 합)만 누적해 두므로, 사용자가 추가되면
+전체 사용자를 다시 읽지 않고 새 사용자 한 명당 O(메뉴 수²)로 갱신합니다. 앞부분 사용자가 그대로인지는
+사용자 행렬의 블록 연쇄 지문(UserMatrix.fingerprint)으로 확인하므로, 기존 사용자 행을 다시 해시하지 않습니다.
+통계량은 사용자 데이터 옆의 .copref.npz 파일에 저장되어 프로세스 사이에서도 재사용됩니다.
+"""
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from src.data_store import get_data_store
+from src.file_utils import atomic_write
+from src.user_matrix import get_user_matrix
+
+# 상관계수를 계산하려면 두 메뉴를 모두 평가한 사용자가 이 수 이상이어야 함
+MIN_CO_RATERS = 3
+
+
+def stats_path_for(user_file_path):
+    """
+    사용자 데이터 파일에 대응하는 협업 유사도 통계량 파일 경로를 반환합니다.
+    """
+    return os.path.splitext(user_file_path)[0] + ".copref.npz"
+
+
+class CoPreferenceStats:
+    """
+    메뉴 쌍별 충분 통계량입니다. 모든 배열은 (메뉴 수 × 메뉴 수) 크기이며,
+    [i, j] 값은 메뉴 i와 j를 모두 평가한 사용자들에 대해 계산됩니다.
+    """
+
+    def __init__(self, menus, counts, sums, square_sums, cross_products, n_rows=0, fingerprint=None):
+        """
+        Args:
+            menus (list): 메뉴 이름 리스트 (사용자 데이터의 열 순서).
+            counts (np.ndarray): [i, j] = 두 메뉴를 모두 평가한 사용자 수.
+            sums (np.ndarray): [i, j] = 그 사용자들의 메뉴 i 점수 합.
+            square_sums (np.ndarray): [i, j] = 그 사용자들의 메뉴 i 점수 제곱합.
+            cross_products (np.ndarray): [i, j] = 그 사용자들의 메뉴 i 점수 × 메뉴 j 점수 합.
+            n_rows (int): 누적한 사용자 행 수 (사용자 데이터의 앞 n_rows개 행).
+            fingerprint (str): 누적한 사용자 점수의 지문 (UserMatrix.fingerprint).
+                모르면 None (다음 build에서 전체를 다시 누적).
+        """
+        self.menus = list(menus)
+        self.counts = counts
+        self.sums = sums
+        self.square_sums = square_sums
+        self.cross_products = cross_products
+        self.n_rows = n_rows
+        self.fingerprint = fingerprint
+        self._similarity = None
+
+    @classmethod
+    def empty(cls, menus):
+        """
+        사용자가 없는 상태의 통계량을 만듭니다.
+        """
+        shape = (len(menus), len(menus))
+        return cls(menus, *(np.zeros(shape) for _ in range(4)))
+
+    def add_scores(self, scores):
+        """
+        사용자 점수 행을 통계량에 더합니다. 사용자 한 명당 O(메뉴 수²)입니다.
+
+        Args:
+            scores (np.ndarray): 사용자 × 메뉴 int8 점수 배열 (결측은 0). self.menus 순서여야 합니다.
+        """
+        values = np.asarray(scores, dtype=float)
+        rated = (values > 0).astype(float)
+        self.counts += rated.T @ rated
+        self.sums += values.T @ rated
+        self.square_sums += np.square(values).T @ rated
+        self.cross_products += values.T @ values
+        self.n_rows += len(values)
+        self.fingerprint = None
+        self._similarity = None
+
+    def similarity(self):
+        """
+        메뉴 간 피어슨 상관계수 행렬을 반환합니다. 함께 평가한 사용자가 MIN_CO_RATERS명 미만이거나
+        점수가 모두 같아 분산이 0인 쌍은 0, 대각선은 1입니다.
+
+        Returns:
+            np.ndarray: (메뉴 수 × 메뉴 수) 유사도 배열.
+        """
+        if self._similarity is None:
+            n = self.counts
+            covariance = n * self.cross_products - self.sums * self.sums.T
+            variance = n * self.square_sums - np.square(self.sums)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                similarity = covariance / np.sqrt(variance * variance.T)
+            similarity[~np.isfinite(similarity) | (n < MIN_CO_RATERS)] = 0.0
+            np.fill_diagonal(similarity, 1.0)
+            self._similarity = np.clip(similarity, -1.0, 1.0)
+        return self._similarity
+
+    def to_frame(self):
+        """
+        유사도 행렬을 메뉴 이름을 인덱스와 열로 가지는 DataFrame으로 반환합니다.
+        """
+        return pd.DataFrame(self.similarity(), index=self.menus, columns=self.menus)
+
+    @classmethod
+    def build(cls, user_matrix, previous=None):
+        """
+        사용자 행렬로 통계량을 만듭니다. previous가 같은 메뉴에 대해 사용자 데이터의 앞부분 행을
+        누적한 결과이면 (사용자가 추가되기만 한 경우) 새 행만 더합니다.
+
+        Args:
+            user_matrix (UserMatrix): 사용자 행렬.
+            previous (CoPreferenceStats): 이전 통계량.
+
+        Returns:
+            CoPreferenceStats: 통계량.
+        """
+        scores = user_matrix.scores
+        if (
+            previous is not None
+            and previous.menus == user_matrix.menus
+            and previous.n_rows <= len(scores)
+            and previous.fingerprint is not None
+            and previous.fingerprint == user_matrix.fingerprint(previous.n_rows)
+        ):
+            if previous.n_rows == len(scores):
+                return previous
+            stats = cls(
+                previous.menus, previous.counts.copy(), previous.sums.copy(), previous.square_sums.copy(),
+                previous.cross_products.copy(), previous.n_rows,
+            )
+            stats.add_scores(scores[previous.n_rows:])
+        else:
+            stats = cls.empty(user_matrix.menus)
+            stats.add_scores(scores)
+        stats.fingerprint = user_matrix.fingerprint()
+        return stats
+
+    def save(self, stats_path):
+        """
+        통계량을 파일로 원자적으로 저장합니다.
+        """
+        with atomic_write(stats_path, mode="wb") as f:
+            np.savez(
+                f,
+                menus=np.array(self.menus, dtype=str),
+                counts=self.counts,
+                sums=self.sums,
+                square_sums=self.square_sums,
+                cross_products=self.cross_products,
+                n_rows=self.n_rows,
+                fingerprint=self.fingerprint or "",
+            )
+
+    @classmethod
+    def load(cls, stats_path):
+        """
+        저장된 통계량을 불러옵니다. 파일이 없거나 읽을 수 없으면 None을 반환합니다.
+        """
+        try:
+            with np.load(stats_path) as saved:
+                return cls(
+                    saved["menus"].tolist(), saved["counts"], saved["sums"], saved["square_sums"],
+                    saved["cross_products"], int(saved["n_rows"]), str(saved["fingerprint"]) or None,
+                )
+        except (FileNotFoundError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+
+
+
+def _load_or_build_stats(user_file_path, user_matrix, previous):
+    """
+    이전 통계량(메모리에 없으면 저장된 파일)에서 새 사용자 행만 더하고, 바뀌었으면 파일에 저장합니다.
+    """
+    stats_path = stats_path_for(user_file_path)
+    if previous is None:
+        previous = CoPreferenceStats.load(stats_path)
+    stats = CoPreferenceStats.build(user_matrix, previous)
+    if stats is not previous:
+        try:
+            stats.save(stats_path)
+        except OSError as e:
+            print(f"협업 유사도 통계량을 저장하지 못했습니다: {e}")
+    return stats
+
+
+def get_co_preference(user_file_path):
+    """
+    사용자 데이터 버전에 맞는 협업 유사도 통계량을 가져옵니다.
+    사용자가 추가되기만 했다면 새 사용자 행만 더하고, 그 밖에 점수가 바뀐 경우에는 다시 누적합니다.
+
+    Args:
+        user_file_path (str): 사용자 데이터 파일 경로.
+
+    Returns:
+        CoPreferenceStats: 협업 유사도 통계량.
+    """
+    store = get_data_store()
+    user_matrix = get_user_matrix(user_file_path)
+    previous = store.previous_derived("co_preference", (user_file_path,))
+    return store.get_derived(
+        "co_preference",
+        (user_file_path,),
+        lambda: _load_or_build_stats(user_file_path, user_matrix, previous),
+    )
+
+
+def get_aligned_co_preference(user_file_path, correlation_matrix_path):
+    """
+    협업 유사도 행렬을 메뉴 상관관계 행렬과 같은 메뉴 순서로 맞춰 반환합니다.
+    사용자 데이터에 없는 메뉴의 유사도는 0입니다 (자기 자신은 1).
+
+    Args:
+        user_file_path (str): 사용자 데이터 파일 경로.
+        correlation_matrix_path (str): 메뉴 상관관계 행렬 파일 경로.
+
+    Returns:
+        np.ndarray: 상관관계 행렬 메뉴 순서의 (메뉴 수 × 메뉴 수) 협업 유사도 배열.
+    """
+    store = get_data_store()
+    stats = get_co_preference(user_file_path)
+    correlation_matrix = store.get_correlation_matrix(correlation_matrix_path)
+
+    def build():
+        menus = correlation_matrix.index
+        positions = pd.Index(stats.menus).get_indexer(menus)
+        found = positions >= 0
+        aligned = np.zeros((len(menus), len(menus)))
+        aligned[np.ix_(found, found)] = stats.similarity()[np.ix_(positions[found], positions[found])]
+        np.fill_diagonal(aligned, 1.0)
+        return aligned
+
+    return store.get_derived("co_preference_aligned", (user_file_path, correlation_matrix_path), build)
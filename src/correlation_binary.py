@@ -0,0 +1,208 @@
+"""
+메뉴 상관관계 행렬의 바이너리(메모리 매핑) 저장 형식입니다.
+
+행렬은 float32 .npy 파일로, 메뉴 이름은 같은 이름의 .labels.json 파일로 저장됩니다.
+메뉴 이름 파일에는 함께 저장한 .npy 파일의 식별 정보가 들어 있어, 저장 도중에 읽어 두 파일이 어긋나면 다시 읽습니다.
+상삼각(upper) 형식은 대각선을 포함한 위쪽 절반만 행 순서대로 이어 붙여 저장하므로 용량이 약 절반입니다.
+상삼각 형식은 row()/rows()로 행 단위로만 읽을 수 있으며, 공유 데이터 저장소는 전체(full) 형식만 불러옵니다.
+"""
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.file_utils import atomic_write
+
+# 메뉴 이름 파일과 .npy 파일이 어긋났을 때 (저장 중) 다시 읽는 횟수와 간격(초)
+LOAD_RETRIES = 20
+LOAD_RETRY_SECONDS = 0.05
+
+
+def labels_path_for(binary_path):
+    """
+    바이너리 행렬 파일에 대응하는 메뉴 이름 파일 경로를 반환합니다.
+    """
+    return os.path.splitext(binary_path)[0] + ".labels.json"
+
+
+def save_correlation_binary(correlation_matrix_df, binary_path, upper_triangular=False):
+    """
+    상관관계 행렬을 float32 바이너리 파일과 메뉴 이름 파일로 원자적으로 저장합니다.
+
+    Args:
+        correlation_matrix_df (pd.DataFrame): 상관관계 행렬.
+        binary_path (str): 저장할 .npy 파일 경로.
+        upper_triangular (bool): True이면 상삼각 부분만 저장합니다.
+    """
+    values = correlation_matrix_df.to_numpy(dtype=np.float32)
+    if upper_triangular:
+        values = values[np.triu_indices(len(values))]
+
+    # 두 파일을 한 번에 교체할 수 없으므로 .npy 파일을 먼저 교체하고, 메뉴 이름 파일에 그 파일의 식별 정보를 기록
+    # (로더는 식별 정보가 맞을 때까지 다시 읽음)
+    with atomic_write(binary_path, mode="wb") as f:
+        np.save(f, values)
+    with atomic_write(labels_path_for(binary_path)) as f:
+        json.dump(
+            {
+                "menus": correlation_matrix_df.index.tolist(),
+                "layout": "upper" if upper_triangular else "full",
+                "binary_id": _file_id(binary_path),
+            },
+            f,
+            ensure_ascii=False,
+        )
+
+
+def _file_id(path):
+    # 원자적으로 교체될 때마다 바뀌는 파일 식별 정보
+    stat = os.stat(path)
+    return [stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+
+def is_upper_triangular(binary_path):
+    """
+    저장된 바이너리 행렬이 상삼각 형식인지 반환합니다. 메뉴 이름 파일이 없으면 False입니다.
+    """
+    try:
+        with open(labels_path_for(binary_path), encoding="utf-8") as f:
+            return json.load(f)["layout"] == "upper"
+    except FileNotFoundError:
+        return False
+
+
+def mapped_correlation_matrix_path(correlation_matrix_path):
+    """
+    CSV 상관관계 행렬 옆에 메모리 매핑할 수 있는 전체 형식 바이너리 파일(.npy)이 있으면 그 경로를,
+    없거나 상삼각 형식이면 CSV 경로를 그대로 반환합니다.
+
+    Args:
+        correlation_matrix_path (str): CSV 상관관계 행렬 파일 경로.
+
+    Returns:
+        str: 공유 데이터 저장소에서 불러올 상관관계 행렬 파일 경로.
+    """
+    binary_path = os.path.splitext(correlation_matrix_path)[0] + ".npy"
+    if os.path.exists(binary_path) and not is_upper_triangular(binary_path):
+        return binary_path
+    return correlation_matrix_path
+
+
+class CorrelationBinary:
+    """
+    메모리 매핑된 상관관계 행렬입니다. 파일을 여는 비용은 행렬 크기와 무관하며,
+    실제로 읽는 행만 디스크에서 메모리로 올라옵니다.
+    """
+
+    def __init__(self, binary_path):
+        """
+        메뉴 이름 파일에 기록된 .npy 파일과 연 .npy 파일이 다르면 (저장 중) 잠시 뒤 다시 읽습니다.
+
+        Args:
+            binary_path (str): .npy 파일 경로.
+        """
+        for attempt in range(LOAD_RETRIES):
+            with open(labels_path_for(binary_path), encoding="utf-8") as f:
+                labels = json.load(f)
+            values = np.load(binary_path, mmap_mode="r")
+            # 메뉴 이름 파일보다 나중에 연 .npy 파일이 기록된 파일과 같으면 같은 저장에서 나온 쌍
+            # (식별 정보가 없는 이전 형식의 파일은 확인하지 않음)
+            if labels.get("binary_id") in (None, _file_id(binary_path)):
+                break
+            time.sleep(LOAD_RETRY_SECONDS)
+        else:
+            raise ValueError(f"'{binary_path}'가 메뉴 이름 파일과 맞지 않습니다. 행렬을 다시 저장하세요.")
+        self.menus = labels["menus"]
+        self.upper_triangular = labels["layout"] == "upper"
+        self.positions = {menu: idx for idx, menu in enumerate(self.menus)}
+        self.values = values
+
+        n = len(self.menus)
+        expected_size = n * (n + 1) // 2 if self.upper_triangular else n * n
+        if self.values.size != expected_size:
+            raise ValueError(f"'{binary_path}'의 크기가 메뉴 수({n})와 맞지 않습니다.")
+
+    def _row_offset(self, row):
+        # 상삼각 형식에서 row행의 대각 원소가 저장된 위치
+        n = len(self.menus)
+        return row * n - row * (row - 1) // 2
+
+    def row(self, menu):
+        """
+        특정 메뉴의 유사도 행을 반환합니다.
+
+        Args:
+            menu (str | int): 메뉴 이름 또는 위치.
+
+        Returns:
+            np.ndarray: 길이가 메뉴 수인 float32 배열.
+        """
+        row = self.positions[menu] if isinstance(menu, str) else int(menu)
+        if not self.upper_triangular:
+            return self.values[row]
+
+        # 대각선 오른쪽은 연속으로 저장되어 있고, 왼쪽은 앞 행들의 row열에서 가져옴
+        n = len(self.menus)
+        result = np.empty(n, dtype=np.float32)
+        start = self._row_offset(row)
+        result[row:] = self.values[start:start + n - row]
+        previous_rows = np.arange(row)
+        result[:row] = self.values[self._row_offset(previous_rows) + row - previous_rows]
+        return result
+
+    def rows(self, menus):
+        """
+        여러 메뉴의 유사도 행을 반환합니다.
+
+        Args:
+            menus (list): 메뉴 이름 또는 위치 리스트.
+
+        Returns:
+            np.ndarray: (len(menus), 메뉴 수) 크기의 float32 배열.
+        """
+        if not self.upper_triangular:
+            positions = [self.positions[menu] if isinstance(menu, str) else int(menu) for menu in menus]
+            return self.values[positions]
+        return np.array([self.row(menu) for menu in menus], dtype=np.float32).reshape(len(menus), len(self.menus))
+
+    def to_frame(self):
+        """
+        DataFrame으로 반환합니다. 전체(full) 형식은 복사 없이 메모리 매핑된 배열을 그대로 감싸고,
+        상삼각 형식은 전체 행렬을 메모리에 복원합니다.
+
+        Returns:
+            pd.DataFrame: 메뉴 이름을 인덱스와 열로 가지는 상관관계 행렬.
+        """
+        index = pd.Index(self.menus, name="메뉴")
+        if self.upper_triangular:
+            n = len(self.menus)
+            values = np.zeros((n, n), dtype=np.float32)
+            values[np.triu_indices(n)] = self.values
+            values = values + np.triu(values, 1).T
+        else:
+            values = self.values
+        return pd.DataFrame(values, index=index, columns=index, copy=False)
+
+
+def load_correlation_matrix(correlation_matrix_path):
+    """
+    파일 확장자에 따라 CSV 또는 바이너리(.npy) 상관관계 행렬을 DataFrame으로 불러옵니다.
+    상삼각 형식 바이너리 파일은 전체 행렬을 메모리에 복원해야 하므로 불러오지 않고 ValueError를 발생시킵니다.
+
+    Args:
+        correlation_matrix_path (str): 상관관계 행렬 파일 경로.
+
+    Returns:
+        pd.DataFrame: 메뉴 이름을 인덱스와 열로 가지는 상관관계 행렬.
+    """
+    if correlation_matrix_path.endswith(".npy"):
+        binary = CorrelationBinary(correlation_matrix_path)
+        if binary.upper_triangular:
+            raise ValueError(
+                f"'{correlation_matrix_path}'는 상삼각 형식이라 메모리 매핑된 행렬로 불러올 수 없습니다. "
+                "전체 형식으로 다시 저장하거나 CorrelationBinary.row()로 행 단위로 읽으세요."
+            )
+        return binary.to_frame()
+    return pd.read_csv(correlation_matrix_path, index_col=0)
@@ -1,4 +1,4 @@
-import pandas as pd
+from src.data_store import get_data_store
 
 class DataLoader:
     def __init__(self, menu_file_path, user_file_path):
@@ -8,11 +8,12 @@ class DataLoader:
     def load_data(self):
         """
         메뉴 데이터와 사용자 데이터를 로드하는 함수
+        공유 데이터 저장소를 통해 읽으므로 파일이 바뀐 경우에만 다시 로드합니다.
         """
         try:
-            # CSV 파일 읽기
-            menu_data = pd.read_csv(self.menu_file_path)
-            user_data = pd.read_csv(self.user_file_path)
+            store = get_data_store()
+            menu_data = store.get_menu_data(self.menu_file_path)
+            user_data = store.get_user_data(self.user_file_path)
             return menu_data, user_data
         except FileNotFoundError as e:
             # 파일을 찾을 수 없는 경우 에러 메시지 출력
@@ -0,0 +1,333 @@
+import hashlib
+import os
+import threading
+
+import pandas as pd
+
+from src.correlation_binary import load_correlation_matrix
+from src.profiling import stage
+from src.user_store import UserStore, log_path_for
+
+
+def _stat_signature(file_path):
+    # 없는 파일은 None으로 표시 (추가 로그처럼 아직 만들어지지 않았을 수 있는 파일용)
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _file_checksum(file_path, chunk_size=1 << 20):
+    """
+    파일 내용의 MD5 체크섬을 계산합니다.
+
+    Args:
+        file_path (str): 체크섬을 계산할 파일 경로.
+        chunk_size (int): 한 번에 읽을 바이트 수.
+
+    Returns:
+        str: 16진수 체크섬 문자열.
+    """
+    digest = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DataStore:
+    """
+    메뉴 데이터, 사용자 데이터, 메뉴 상관관계 행렬을 프로세스 전체에서 공유하는 메모리 저장소입니다.
+
+    파일은 처음 요청될 때 한 번만 로드되며, 이후에는 파일의 수정 시각(mtime)과 크기를 확인해
+    바뀐 경우에만 체크섬을 계산합니다. 체크섬까지 바뀐 파일만 다시 읽어들입니다.
+    반환되는 DataFrame은 여러 호출자가 공유하므로 수정하지 말고 필요하면 복사해서 사용해야 합니다.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._derived = {}
+        self._shared = {}
+        self._lock = threading.RLock()
+
+    def _get(self, file_path, kind, reader, use_checksum=True, companion_paths=(), updater=None):
+        """
+        캐시된 데이터를 반환하거나, 파일이 바뀌었으면 다시 로드합니다.
+
+        Args:
+            file_path (str): 데이터 파일 경로.
+            kind (str): 같은 파일을 다른 방식으로 읽는 경우를 구분하기 위한 이름.
+            reader (callable): 파일 경로를 받아 데이터를 반환하는 함수.
+            use_checksum (bool): False이면 내용 체크섬 대신 (mtime, 크기)를 버전으로 사용합니다.
+                메모리 매핑하는 큰 바이너리 파일을 통째로 읽지 않기 위해 사용합니다.
+            companion_paths (tuple): 함께 읽히는 보조 파일 경로들 (예: 사용자 추가 로그).
+                보조 파일이 바뀌어도 다시 로드합니다.
+            updater (callable): (이전 데이터, 파일 경로)를 받아 바뀐 부분만 반영한 데이터를 반환하는 함수.
+                파일이 바뀌었을 때 체크섬 계산과 reader보다 먼저 호출하며, None을 반환하면 원래대로 다시 확인합니다.
+
+        Returns:
+            object: 로드된 데이터.
+        """
+        key = (os.path.abspath(file_path), kind)
+        source = self._shared.get(key)
+        if source is not None:
+            return self._get_shared(key, source)
+        stat = os.stat(file_path)  # 파일이 없으면 FileNotFoundError 발생
+        signature = ((stat.st_mtime_ns, stat.st_size),) + tuple(_stat_signature(path) for path in companion_paths)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["signature"] == signature:
+                return entry["data"]
+
+            # 바뀐 부분만 반영할 수 있으면 (예: 추가 로그에 사용자가 더해지기만 한 경우) 파일 전체를 읽지 않음
+            if entry is not None and updater is not None:
+                with stage(f"data_store.update.{kind}"):
+                    data = updater(entry["data"], file_path)
+                if data is entry["data"]:
+                    entry["signature"] = signature
+                    return data
+                if data is not None:
+                    checksum = hashlib.md5(f"{entry['checksum']}+{signature}".encode("utf-8")).hexdigest()
+                    return self._put(key, signature, checksum, data)
+
+            # mtime이나 크기가 바뀐 경우에만 체크섬 비교
+            if use_checksum:
+                with stage("data_store.checksum"):
+                    checksum = "-".join(
+                        [_file_checksum(file_path)]
+                        + [_file_checksum(path) if os.path.exists(path) else "" for path in companion_paths]
+                    )
+            else:
+                checksum = "-".join(str(value) for value in signature[0])
+            if entry is not None and entry["checksum"] == checksum:
+                entry["signature"] = signature
+                return entry["data"]
+
+            with stage(f"data_store.load.{kind}"):
+                data = reader(file_path)
+            return self._put(key, signature, checksum, data)
+
+    def _put(self, key, signature, checksum, data):
+        # 새로 읽은 데이터를 저장 (잠금을 잡은 상태에서 호출)
+        self._entries[key] = {
+            "signature": signature,
+            "checksum": checksum,
+            "data": data,
+        }
+        # 같은 파일을 다른 방식으로 읽은 이전 버전은 버림 (메모리를 돌려주고 version()이 최신 버전을 반환하도록)
+        for other in [
+            other for other, entry in self._entries.items()
+            if other[0] == key[0] and other not in self._shared and entry["checksum"] != checksum
+        ]:
+            del self._entries[other]
+        return data
+
+    def _get_shared(self, key, source):
+        # 공유 메모리 데이터는 게시한 프로세스가 계산한 버전(체크섬)을 그대로 버전으로 사용
+        version, data = source()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["checksum"] != version or entry["data"] is not data:
+                self._entries[key] = {"signature": None, "checksum": version, "data": data}
+            return data
+
+    def attach_shared(self, file_path, kind, source):
+        """
+        파일을 읽는 대신 다른 프로세스가 공유 메모리에 게시한 데이터를 사용하도록 등록합니다.
+        등록한 뒤에는 해당 파일을 다시 읽지 않고 요청마다 source로 최신 데이터를 가져옵니다.
+
+        Args:
+            file_path (str): 데이터 파일 경로.
+            kind (str): 데이터 종류 ("correlation", "user_matrix").
+            source (callable): 인자 없이 호출되어 (버전, 데이터)를 반환하는 함수.
+                버전이 바뀌면 이 파일에 의존하는 파생 데이터를 다시 만듭니다.
+        """
+        with self._lock:
+            self._shared[(os.path.abspath(file_path), kind)] = source
+
+    def detach_shared(self):
+        """
+        공유 메모리 데이터 등록을 모두 해제합니다. 이후에는 다시 파일에서 읽습니다.
+        """
+        with self._lock:
+            for key in self._shared:
+                self._entries.pop(key, None)
+            self._shared.clear()
+
+    def get_shared(self, file_path, kind):
+        """
+        공유 메모리에 게시된 데이터를 반환합니다. 등록되지 않았으면 None을 반환합니다.
+
+        Args:
+            file_path (str): 데이터 파일 경로.
+            kind (str): 데이터 종류.
+
+        Returns:
+            object | None: 공유 메모리 데이터.
+        """
+        key = (os.path.abspath(file_path), kind)
+        source = self._shared.get(key)
+        return self._get_shared(key, source) if source is not None else None
+
+    def get_menu_data(self, menu_file_path):
+        """
+        전처리된 메뉴 데이터를 반환합니다.
+
+        Args:
+            menu_file_path (str): 메뉴 데이터 파일 경로.
+
+        Returns:
+            pd.DataFrame: 메뉴 데이터.
+        """
+        return self._get(menu_file_path, "menu", pd.read_csv)
+
+    def get_user_data(self, user_file_path):
+        """
+        사용자 선호도 데이터를 반환합니다. 아직 CSV에 합쳐지지 않은 추가 로그의 사용자도 포함됩니다.
+
+        Args:
+            user_file_path (str): 사용자 데이터 파일 경로.
+
+        Returns:
+            pd.DataFrame: 사용자 데이터.
+        """
+        return self.get_user_file(user_file_path, "user", lambda path: UserStore(path).snapshot())
+
+    def get_user_file(self, user_file_path, kind, reader, updater=None):
+        """
+        사용자 데이터 파일을 reader로 읽은 결과를 캐시합니다. 추가 로그가 바뀌어도 다시 읽습니다.
+        사용자 행렬처럼 DataFrame을 거치지 않고 파일에서 바로 만드는 데이터에 사용합니다.
+
+        Args:
+            user_file_path (str): 사용자 데이터 파일 경로.
+            kind (str): 데이터 종류 (예: "user_matrix").
+            reader (callable): 파일 경로를 받아 데이터를 반환하는 함수.
+            updater (callable): (이전 데이터, 파일 경로)를 받아 추가 로그에 더해진 행만 반영한 데이터를 반환하는 함수.
+                이어 읽을 수 없으면 None을 반환해야 하며, 그러면 체크섬을 확인하고 reader로 다시 읽습니다.
+
+        Returns:
+            object: 읽은 데이터.
+        """
+        return self._get(
+            user_file_path, kind, reader, companion_paths=(log_path_for(user_file_path),), updater=updater
+        )
+
+    def get_correlation_matrix(self, correlation_matrix_path):
+        """
+        메뉴 상관관계 행렬을 반환합니다. 경로가 .npy이면 바이너리 파일을 메모리 매핑해서 엽니다.
+
+        Args:
+            correlation_matrix_path (str): 메뉴 상관관계 행렬 파일 경로 (.csv 또는 .npy).
+
+        Returns:
+            pd.DataFrame: 메뉴 이름을 인덱스와 열로 가지는 상관관계 행렬.
+        """
+        return self._get(
+            correlation_matrix_path,
+            "correlation",
+            load_correlation_matrix,
+            use_checksum=not correlation_matrix_path.endswith(".npy"),
+        )
+
+    def get_derived(self, name, file_paths, builder):
+        """
+        원본 파일에서 만들어진 파생 데이터(배열, 인덱스 등)를 캐시합니다.
+        원본 파일 중 하나라도 버전이 바뀌면 builder를 다시 호출합니다.
+        호출 전에 원본 파일을 이 저장소로 먼저 로드해야 최신 버전이 반영됩니다.
+
+        Args:
+            name (str): 파생 데이터 이름.
+            file_paths (tuple): 파생 데이터가 의존하는 원본 파일 경로들.
+            builder (callable): 인자 없이 호출되어 파생 데이터를 만드는 함수.
+
+        Returns:
+            object: 파생 데이터.
+        """
+        key = (name, tuple(os.path.abspath(path) for path in file_paths))
+        versions = tuple(self.version(path) for path in file_paths)
+
+        with self._lock:
+            entry = self._derived.get(key)
+            if entry is not None and entry["versions"] == versions:
+                return entry["data"]
+
+            with stage(f"data_store.derive.{name}"):
+                data = builder()
+            self._derived[key] = {"versions": versions, "data": data}
+            return data
+
+    def previous_derived(self, name, file_paths):
+        """
+        원본 파일 버전과 관계없이 마지막으로 만든 파생 데이터를 반환합니다. 없으면 None을 반환합니다.
+        builder에서 이전 결과를 재사용해 바뀐 부분만 다시 계산할 때 사용합니다.
+
+        Args:
+            name (str): 파생 데이터 이름.
+            file_paths (tuple): 파생 데이터가 의존하는 원본 파일 경로들.
+
+        Returns:
+            object | None: 마지막 파생 데이터.
+        """
+        key = (name, tuple(os.path.abspath(path) for path in file_paths))
+        with self._lock:
+            entry = self._derived.get(key)
+            return entry["data"] if entry is not None else None
+
+    def version(self, file_path):
+        """
+        현재 로드된 파일 내용의 버전(체크섬)을 반환합니다. 로드된 적이 없으면 None을 반환합니다.
+
+        Args:
+            file_path (str): 데이터 파일 경로.
+
+        Returns:
+            str | None: 파일 체크섬.
+        """
+        path = os.path.abspath(file_path)
+        with self._lock:
+            # 공유 메모리 데이터가 등록되어 있으면 그 버전을 우선 사용
+            versions = [
+                (key not in self._shared, entry["checksum"]) for key, entry in self._entries.items() if key[0] == path
+            ]
+        if not versions:
+            return None
+        return sorted(versions, key=lambda version: version[0])[0][1]
+
+    def invalidate(self, file_path=None):
+        """
+        캐시를 비웁니다. 다음 요청 시 파일을 다시 확인합니다.
+
+        Args:
+            file_path (str): 비울 파일 경로. None이면 전체 캐시를 비웁니다.
+        """
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                self._derived.clear()
+                return
+            path = os.path.abspath(file_path)
+            for key in [key for key in self._entries if key[0] == path]:
+                del self._entries[key]
+            for key in [key for key in self._derived if path in key[1]]:
+                del self._derived[key]
+
+
+_data_store = None
+_data_store_lock = threading.Lock()
+
+
+def get_data_store():
+    """
+    프로세스 전체에서 공유하는 DataStore 인스턴스를 반환합니다.
+
+    Returns:
+        DataStore: 공유 데이터 저장소.
+    """
+    global _data_store
+    if _data_store is None:
+        with _data_store_lock:
+            if _data_store is None:
+                _data_store = DataStore()
+    return _data_store
@@ -0,0 +1,68 @@
+import contextlib
+import os
+import tempfile
+import time
+
+
+@contextlib.contextmanager
+def atomic_write(file_path, mode="w", encoding="utf-8"):
+    """
+    파일을 원자적으로 저장합니다. 같은 폴더의 임시 파일에 먼저 쓴 뒤 os.replace로 교체하므로,
+    저장 중 오류가 나거나 다른 프로세스가 동시에 읽더라도 반쯤 쓰인 파일이 보이지 않습니다.
+
+    Args:
+        file_path (str): 저장할 파일 경로.
+        mode (str): 파일 열기 모드 ("w" 또는 "wb").
+        encoding (str): 텍스트 모드일 때 사용할 인코딩.
+
+    Yields:
+        file: 임시 파일 객체.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=os.path.basename(file_path))
+    try:
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else encoding, newline=None if "b" in mode else "") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temp_path)
+        raise
+
+
+@contextlib.contextmanager
+def file_lock(lock_path, poll_interval=0.05):
+    """
+    잠금 파일을 이용해 여러 프로세스(와 스레드) 사이에서 배타적 잠금을 잡습니다.
+    POSIX에서는 fcntl.flock, Windows에서는 msvcrt.locking을 사용합니다.
+
+    Args:
+        lock_path (str): 잠금 파일 경로. 없으면 새로 만듭니다.
+        poll_interval (float): Windows에서 잠금을 다시 시도하기 전 대기 시간(초).
+    """
+    with open(lock_path, "a+b") as lock_file:
+        if os.name == "nt":
+            import msvcrt
+
+            while True:
+                try:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(poll_interval)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
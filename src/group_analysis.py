@@ -1,7 +1,308 @@
+import copy
+import datetime
+import hashlib
+import threading
+from collections import OrderedDict
+
 import numpy as np
-import pandas as pd
+from scipy import sparse
+
+from src.co_preference import get_aligned_co_preference
+from src.data_store import get_data_store
+from src.menu_neighbors import get_neighbor_index
+from src.profiling import stage
+from src.user_matrix import get_user_matrix
+
+
+def _build_group_inputs(user_matrix, correlation_matrix):
+    """
+    그룹 추천 계산에 필요한 배열을 만듭니다.
+
+    Args:
+        user_matrix (UserMatrix): 사용자 행렬.
+        correlation_matrix (pd.DataFrame): 메뉴 상관관계 행렬.
+
+    Returns:
+        dict: 메뉴 이름, 사용자×메뉴 점수 배열, 선호(4점) 여부 배열, 이름→행 번호 사전,
+              상관관계 배열, 메뉴 이름 정렬 순서, 메뉴 이름→위치 사전.
+    """
+    menus = correlation_matrix.index.to_numpy(dtype=object)
+
+    # 사용자 점수를 상관관계 행렬의 메뉴 순서에 맞춤 (int8, 결측은 0)
+    scores = user_matrix.scores_for_menus(correlation_matrix.index)
+
+    return {
+        "menus": menus,
+        "scores": scores,
+        "preferred": sparse.csr_matrix(scores >= 4, dtype=float),
+        "name_to_row": user_matrix.name_to_row,
+        # 상관관계 행렬은 대칭이므로 선호 메뉴의 열 대신 행을 읽음 (메모리 매핑된 경우 복사하지 않음)
+        "correlation": correlation_matrix.to_numpy(),
+        "label_order": np.argsort(menus),
+        "menu_positions": {menu: idx for idx, menu in enumerate(menus)},
+    }
+
+
+def _load_group_inputs(user_data_path, correlation_matrix_path):
+    """
+    공유 데이터 저장소에서 그룹 추천 계산용 배열을 가져옵니다. 원본 파일이 바뀐 경우에만 다시 만듭니다.
+    """
+    store = get_data_store()
+    user_matrix = get_user_matrix(user_data_path)
+    correlation_matrix = store.get_correlation_matrix(correlation_matrix_path)
+    return store.get_derived(
+        "group_inputs",
+        (user_data_path, correlation_matrix_path),
+        lambda: _build_group_inputs(user_matrix, correlation_matrix),
+    )
+
+
+def _score_groups(inputs, groups, weight, diversity_penalty, collaborative=None, collaborative_weight=0.0):
+    """
+    여러 그룹의 메뉴 점수를 한 번의 행렬 연산으로 계산합니다.
+
+    Args:
+        inputs (dict): _build_group_inputs 결과.
+        groups (list): 사용자 이름 리스트의 리스트.
+        weight (float): 사용자 선호 메뉴에 부여할 가중치.
+        diversity_penalty (float): 상관관계의 집중도를 완화하는 계수.
+        collaborative (np.ndarray): 상관관계 행렬 메뉴 순서에 맞춘 협업 유사도 배열.
+        collaborative_weight (float): 상관관계 대신 협업 유사도를 반영할 비율 (0~1).
+
+    Returns:
+        tuple: (그룹×메뉴 결합 점수 배열, 그룹×메뉴 선호 메뉴 여부 배열)
+    """
+    name_to_row = inputs["name_to_row"]
+    n_users = inputs["scores"].shape[0]
+
+    with stage("recommend.aggregate"):
+        # 그룹×사용자 소속 행렬 (같은 이름이 여러 번 들어오면 그만큼 더해짐)
+        group_rows, user_rows = [], []
+        for group_idx, user_names in enumerate(groups):
+            for user_name in user_names:
+                if user_name not in name_to_row:
+                    print(f"사용자 '{user_name}' 데이터가 없습니다. 무시합니다.")
+                    continue
+                group_rows.append(group_idx)
+                user_rows.append(name_to_row[user_name])
+        membership = sparse.csr_matrix(
+            (np.ones(len(user_rows)), (group_rows, user_rows)), shape=(len(groups), n_users)
+        )
 
-def recommend_menus(user_names, user_data_path, correlation_matrix_path, top_n=3, top_reasons=10, weight=2.0, diversity_penalty=0.8):
+        # 사용자 점수 합계와 그룹별 선호 메뉴(한 명이라도 4점)
+        total_scores = np.asarray(membership @ inputs["scores"])
+        preferred = (membership @ inputs["preferred"]).toarray() > 0
+        preferred_counts = preferred.sum(axis=1, keepdims=True)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        with stage("recommend.correlation_weighting"):
+            # 어느 그룹에서든 선호 메뉴인 행만 읽음
+            active_menus = np.flatnonzero(preferred.any(axis=0))
+            active_rows = np.asarray(inputs["correlation"][active_menus], dtype=float)
+            if collaborative is not None:
+                # 읽은 행만 협업 유사도와 섞음
+                active_rows = (1 - collaborative_weight) * active_rows + collaborative_weight * collaborative[active_menus]
+            preferred_matrix = sparse.csr_matrix(preferred[:, active_menus], dtype=float)
+
+            # 1. 상관관계 기반 점수 계산 (선호 메뉴 열의 평균과 표준편차)
+            correlation_sum = np.asarray(preferred_matrix @ active_rows)
+            correlation_square_sum = np.asarray(preferred_matrix @ np.square(active_rows))
+            normalized_scores = weight * correlation_sum / preferred_counts  # 평균화
+
+        with stage("recommend.diversity_penalty"):
+            variance = (
+                weight ** 2 * correlation_square_sum - preferred_counts * normalized_scores ** 2
+            ) / (preferred_counts - 1)
+            weighted_std = np.sqrt(np.clip(variance, 0.0, None))
+            penalized_scores = normalized_scores / (1 + diversity_penalty * weighted_std)  # 다양성 보정
+
+        # 2. 사용자 점수 기반 점수 계산
+        group_sizes = np.array([len(user_names) for user_names in groups], dtype=float)[:, None]
+        user_preference_scores = total_scores / group_sizes  # 사용자별 평균 점수
+
+    # 3. 상관관계 점수와 사용자 점수를 3:7으로 결합
+    combined_scores = 0.3 * penalized_scores + 0.7 * user_preference_scores
+    return combined_scores, preferred
+
+
+def _finalize_recommendation(inputs, neighbor_index, combined_scores, preferred, top_n, top_reasons, rng=np.random):
+    """
+    한 그룹의 결합 점수에 랜덤성을 더해 추천 메뉴, 추천 이유, 랜덤 추천 메뉴를 만듭니다.
+
+    Args:
+        inputs (dict): _build_group_inputs 결과.
+        neighbor_index (MenuNeighborIndex): 추천 이유 생성에 사용할 메뉴 이웃 인덱스.
+        combined_scores (np.ndarray): 메뉴별 결합 점수.
+        preferred (np.ndarray): 메뉴별 선호 메뉴 여부.
+        top_n (int): 추천할 메뉴의 개수.
+        top_reasons (int): 각 메뉴 추천 이유로 보여줄 상위 유사도 메뉴의 개수.
+        rng (np.random.RandomState): 랜덤 요소에 사용할 난수 생성기. 기본값은 전역 np.random.
+
+    Returns:
+        tuple: (추천 메뉴 리스트, 랜덤 추천 메뉴 리스트)
+    """
+    menus = inputs["menus"]
+    similarities = neighbor_index.similarities
+
+    with stage("recommend.sorting"):
+        # 4. 랜덤성 추가
+        random_scores = rng.rand(len(combined_scores)) * 0.1  # 랜덤 요소 추가
+        final_scores = combined_scores + random_scores
+        order = np.argsort(-final_scores, kind="stable")  # 내림차순, NaN은 마지막
+
+        # 상위 N개의 메뉴 추천 (선호 메뉴 제외)
+        recommended = order[~preferred[order]][:top_n]
+
+    with stage("recommend.random_picks"):
+        # 랜덤 추천 메뉴 (중복되지 않도록 선호 메뉴와 추천 메뉴 제외, 메뉴 이름순 후보에서 선택)
+        excluded = preferred.copy()
+        excluded[recommended] = True
+        label_order = inputs["label_order"]
+        remaining_menus = menus[label_order[~excluded[label_order]]]
+        random_recommendations = rng.choice(
+            remaining_menus, size=min(top_n, len(remaining_menus)), replace=False
+        )
+
+    with stage("recommend.reasons"):
+        # 상세 이유 포함 (이웃 인덱스에서 선호 메뉴만 앞에서부터 골라냄)
+        detailed_recommendations = []
+        for menu_idx in recommended:
+            reason_positions = neighbor_index.top_matches(menu_idx, preferred, top_reasons)
+            detailed_recommendations.append({
+                "menu": menus[menu_idx],
+                "score": final_scores[menu_idx],
+                "reason": ", ".join(
+                    f"{menus[position]} (유사도: {similarities[menu_idx, position]:.2f})"
+                    for position in reason_positions
+                )
+            })
+
+    return detailed_recommendations, list(random_recommendations)
+
+
+def _recommend_groups(groups, user_data_path, correlation_matrix_path, top_n, top_reasons, weight, diversity_penalty, seeds=None, collaborative_weight=0.0, meal_history=None, history_weight=1.0, date=None):
+    """
+    그룹별 추천 결과 리스트를 반환합니다. 선호 메뉴가 없는 그룹은 None입니다.
+    seeds가 주어지면 그룹마다 해당 시드의 난수 생성기를 사용하고, 없으면 전역 np.random을 사용합니다.
+    meal_history가 주어지면 최근에 먹은 메뉴의 점수를 history_weight × 감점만큼 낮춥니다.
+    """
+    with stage("recommend.load"):
+        inputs = _load_group_inputs(user_data_path, correlation_matrix_path)
+        neighbor_index = get_neighbor_index(correlation_matrix_path)
+        collaborative = None
+        if collaborative_weight:
+            if not 0 <= collaborative_weight <= 1:
+                raise ValueError("collaborative_weight는 0에서 1 사이여야 합니다.")
+            collaborative = get_aligned_co_preference(user_data_path, correlation_matrix_path)
+    combined_scores, preferred = _score_groups(
+        inputs, groups, weight, diversity_penalty, collaborative, collaborative_weight
+    )
+    if meal_history is not None and history_weight:
+        with stage("recommend.meal_history"):
+            # 최근 식사 감점을 모든 그룹의 점수 배열에 한 번에 반영
+            combined_scores = combined_scores - history_weight * meal_history.penalties(
+                groups, inputs["menu_positions"], date
+            )
+
+    # 랜덤 요소는 그룹 순서대로 뽑아 recommend_menus를 차례로 호출한 것과 같은 결과를 보장
+    results = []
+    for group_idx in range(len(groups)):
+        if not preferred[group_idx].any():
+            results.append(None)
+            continue
+        rng = np.random.RandomState(seeds[group_idx]) if seeds is not None else np.random
+        results.append(
+            _finalize_recommendation(
+                inputs, neighbor_index, combined_scores[group_idx], preferred[group_idx], top_n, top_reasons, rng
+            )
+        )
+    return results
+
+
+def group_seed(user_names, date=None):
+    """
+    그룹 구성원과 날짜로 추천용 시드를 만듭니다. 같은 그룹은 같은 날 항상 같은 추천을 받습니다.
+    구성원 순서는 결과에 영향을 주지 않습니다.
+
+    Args:
+        user_names (list): 사용자 이름 리스트.
+        date (datetime.date): 기준 날짜. 기본값은 오늘.
+
+    Returns:
+        int: 0 이상 2**32 미만의 시드.
+    """
+    date = date or datetime.date.today()
+    key = f"{date.isoformat()}|" + "|".join(sorted(user_names))
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:4], "little")
+
+
+class RecommendationCache:
+    """
+    추천 결과를 최근 사용 순서로 보관하는 크기 제한 LRU 캐시입니다.
+    시드를 지정한 추천만 결과가 정해져 있으므로 캐시합니다.
+    """
+
+    def __init__(self, maxsize=256):
+        """
+        Args:
+            maxsize (int): 보관할 최대 결과 수. 0이면 캐시하지 않습니다.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        캐시된 결과의 복사본을 반환합니다. 없으면 None을 반환합니다.
+        """
+        with self._lock:
+            if key not in self._results:
+                self.misses += 1
+                return None
+            self._results.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(self._results[key])
+
+    def put(self, key, result):
+        """
+        결과를 저장하고, 크기를 넘으면 가장 오래 사용하지 않은 결과를 버립니다.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._results[key] = copy.deepcopy(result)
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def clear(self):
+        """
+        캐시를 비웁니다.
+        """
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._results)
+
+
+# 프로세스 전체에서 공유하는 추천 결과 캐시
+recommendation_cache = RecommendationCache()
+
+
+def _data_versions(user_data_path, correlation_matrix_path):
+    # 사용자 데이터나 상관관계 행렬이 바뀌면 달라지는 버전 (파일이 바뀌었으면 여기서 다시 로드됨)
+    store = get_data_store()
+    get_user_matrix(user_data_path)
+    store.get_correlation_matrix(correlation_matrix_path)
+    return store.version(user_data_path), store.version(correlation_matrix_path)
+
+
+def recommend_menus(user_names, user_data_path, correlation_matrix_path, top_n=3, top_reasons=10, weight=2.0, diversity_penalty=0.8, seed=None, collaborative_weight=0.0, meal_history=None, history_weight=1.0, date=None):
     """
     여러 사용자에 대해 최적 메뉴를 추천합니다. 특정 메뉴의 독점 문제를 완화합니다.
 
@@ -13,73 +314,82 @@ def recommend_menus(user_names, user_data_path, correlation_matrix_path, top_n=3
         top_reasons (int): 각 메뉴 추천 이유로 보여줄 상위 유사도 메뉴의 개수.
         weight (float): 사용자 선호 메뉴에 부여할 가중치. 기본값은 2.0.
         diversity_penalty (float): 상관관계의 집중도를 완화하는 계수. 기본값은 0.8.
+        seed (int): 랜덤 요소에 사용할 시드 (예: group_seed 결과). 지정하면 같은 입력에 항상 같은 결과를 반환하고,
+            결과를 recommendation_cache에 보관해 같은 요청은 다시 계산하지 않습니다.
+            None이면 전역 np.random을 사용하며 캐시하지 않습니다.
+        collaborative_weight (float): 메뉴 속성 기반 상관관계 대신 사용자 점수 기반 협업 유사도를 반영할 비율 (0~1).
+            기본값 0은 상관관계만 사용합니다. 추천 이유는 항상 메뉴 속성 기반 상관관계로 보여줍니다.
+        meal_history (MealHistory): 식사 기록. 지정하면 그룹과 구성원이 최근에 먹은 메뉴를 감점해
+            같은 메뉴가 며칠 연속으로 추천되지 않게 합니다.
+        history_weight (float): 최근 식사 감점에 곱할 가중치. 기본값은 1.0.
+        date (datetime.date): 식사 기록의 경과 일수를 계산할 기준 날짜. 기본값은 오늘.
 
     Returns:
         tuple: (추천 메뉴 리스트, 랜덤 추천 메뉴 리스트)
     """
-    # 데이터 로드
-    user_data = pd.read_csv(user_data_path)
-    correlation_matrix = pd.read_csv(correlation_matrix_path, index_col=0)
-
-    # 사용자 선호 메뉴 추출
-    preferred_menus = set()
-    total_scores = pd.Series(0.0, index=correlation_matrix.index)  # 초기화된 점수 시리즈, 명시적으로 float 타입 지정
-
-    for user_name in user_names:
-        if user_name not in user_data["이름"].values:
-            print(f"사용자 '{user_name}' 데이터가 없습니다. 무시합니다.")
-            continue
-        user_row = user_data[user_data["이름"] == user_name]
-        user_preferences = user_row.iloc[0, 1:]  # 메뉴별 점수
-        preferred_menus.update(user_preferences[user_preferences >= 4].index)
-
-        # 결측값 처리 및 타입 변환 방식 수정
-        user_preferences_filled = (
-            user_preferences
-            .astype(float)  # 먼저 float 타입으로 변환
-            .fillna(0.0)    # 명시적으로 float 타입의 0 사용
+    cache_key = None
+    if seed is not None:
+        # 구성원 순서와 무관하도록 정렬 (같은 이름이 여러 번 있으면 점수에 반영되므로 중복은 유지)
+        cache_key = (
+            tuple(sorted(user_names)),
+            top_n,
+            top_reasons,
+            weight,
+            diversity_penalty,
+            collaborative_weight,
+            seed,
+            _data_versions(user_data_path, correlation_matrix_path),
+            # 식사 기록이 추가되거나 날짜가 바뀌면 감점이 달라짐
+            None if meal_history is None else (
+                history_weight, date or datetime.date.today(), meal_history.revision(user_names)
+            ),
         )
-        total_scores += user_preferences_filled
+        cached = recommendation_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-    if not preferred_menus:
+    with stage("recommend_menus"):
+        result = _recommend_groups(
+            [user_names], user_data_path, correlation_matrix_path, top_n, top_reasons, weight, diversity_penalty,
+            seeds=None if seed is None else [seed], collaborative_weight=collaborative_weight,
+            meal_history=meal_history, history_weight=history_weight, date=date,
+        )[0]
+    if result is None:
         raise ValueError("입력한 사용자들에 대해 선호 메뉴가 없습니다.")
+    if cache_key is not None:
+        recommendation_cache.put(cache_key, result)
+    return result
 
-    # 1. 상관관계 기반 점수 계산
-    weighted_scores = correlation_matrix[list(preferred_menus)] * weight
-    normalized_scores = weighted_scores.mean(axis=1)  # 평균화
-    penalized_scores = normalized_scores / (1 + diversity_penalty * weighted_scores.std(axis=1))  # 다양성 보정
-
-    # 2. 사용자 점수 기반 점수 계산
-    user_preference_scores = total_scores / len(user_names)  # 사용자별 평균 점수
 
-    # 3. 상관관계 점수와 사용자 점수를 3:7으로 결합
-    combined_scores = 0.3 * penalized_scores + 0.7 * user_preference_scores
+def recommend_menus_batch(groups, user_data_path, correlation_matrix_path, top_n=3, top_reasons=10, weight=2.0, diversity_penalty=0.8, seeds=None, collaborative_weight=0.0, meal_history=None, history_weight=1.0, date=None):
+    """
+    여러 그룹의 메뉴 추천을 한 번에 계산합니다.
+    점수는 사용자×메뉴 배열과 메뉴×메뉴 상관관계 배열의 행렬 연산으로 모든 그룹에 대해 동시에 계산하며,
+    각 그룹의 결과는 같은 순서로 recommend_menus를 호출한 결과와 동일합니다.
 
-    # 4. 랜덤성 추가
-    random_scores = np.random.rand(len(combined_scores)) * 0.1  # 랜덤 요소 추가
-    final_scores = combined_scores + random_scores
-    final_scores = final_scores.sort_values(ascending=False)
-
-    # 상위 N개의 메뉴 추천 (선호 메뉴 제외)
-    recommended_menus = final_scores.index[~final_scores.index.isin(preferred_menus)].tolist()
-    recommended_menus = recommended_menus[:top_n]
-
-    # 랜덤 추천 메뉴 (중복되지 않도록 선호 메뉴와 추천 메뉴 제외)
-    remaining_menus = final_scores.index.difference(preferred_menus.union(recommended_menus))
-    random_recommendations = np.random.choice(remaining_menus, size=top_n, replace=False)
-
-    # 상세 이유 포함
-    detailed_recommendations = [
-        {
-            "menu": menu,
-            "score": final_scores[menu],
-            "reason": ", ".join(
-                f"{preferred_menu} (유사도: {correlation_matrix.loc[menu, preferred_menu]:.2f})"
-                for preferred_menu in sorted(preferred_menus, key=lambda x: correlation_matrix.loc[menu, x], reverse=True)[:top_reasons]
-                if preferred_menu in correlation_matrix.columns
-            )
-        }
-        for menu in recommended_menus
-    ]
+    Args:
+        groups (list): 그룹별 사용자 이름 리스트의 리스트.
+        user_data_path (str): 사용자 데이터 파일 경로.
+        correlation_matrix_path (str): 메뉴 상관관계 행렬 파일 경로.
+        top_n (int): 추천할 메뉴의 개수.
+        top_reasons (int): 각 메뉴 추천 이유로 보여줄 상위 유사도 메뉴의 개수.
+        weight (float): 사용자 선호 메뉴에 부여할 가중치. 기본값은 2.0.
+        diversity_penalty (float): 상관관계의 집중도를 완화하는 계수. 기본값은 0.8.
+        seeds (list): 그룹별 시드. 지정하면 각 그룹의 결과는 같은 시드로 recommend_menus를 호출한 결과와 같습니다.
+        collaborative_weight (float): 협업 유사도를 반영할 비율 (recommend_menus 참고).
+        meal_history (MealHistory): 식사 기록 (recommend_menus 참고).
+        history_weight (float): 최근 식사 감점에 곱할 가중치.
+        date (datetime.date): 식사 기록의 경과 일수를 계산할 기준 날짜. 기본값은 오늘.
 
-    return detailed_recommendations, list(random_recommendations)
+    Returns:
+        list: 그룹별 (추천 메뉴 리스트, 랜덤 추천 메뉴 리스트). 선호 메뉴가 없는 그룹은 None.
+    """
+    with stage("recommend_menus_batch"):
+        results = _recommend_groups(
+            groups, user_data_path, correlation_matrix_path, top_n, top_reasons, weight, diversity_penalty, seeds,
+            collaborative_weight, meal_history, history_weight, date,
+        )
+    for group_idx, result in enumerate(results):
+        if result is None:
+            print(f"{group_idx + 1}번째 그룹은 선호 메뉴가 없어 추천을 건너뜁니다.")
+    return results
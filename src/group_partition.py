@@ -0,0 +1,266 @@
+"""
+많은 인원을 입맛이 맞는 식사 그룹(테이블)으로 나누는 최적화입니다.
+
+그룹의 만족도는 recommend_menus와 같은 점수(_score_groups의 결합 점수)로 계산한
+그룹 1순위 추천 메뉴(구성원의 선호 메뉴 제외)의 점수 × 그룹 인원이며, 모든 그룹의 만족도 합이 커지도록 나눕니다.
+
+    python -m src.group_partition --min-size 4 --max-size 8 --time-budget 10 --jobs 4
+
+탐색은 무작위 분할에서 시작하는 지역 탐색입니다. 한 라운드마다 두 사람 맞바꾸기와 한 사람 옮기기 후보를
+batch_size개 뽑아, 후보가 바꾸는 그룹들을 _score_groups 한 번으로 함께 계산하고,
+만족도가 오르는 후보를 겹치지 않는 그룹끼리 한꺼번에 적용합니다.
+서로 다른 시드의 재시작은 작업 프로세스에 나누어 실행하고, 시간 예산이 지나면 각자 지금까지의 결과를 반환합니다.
+"""
+import argparse
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.co_preference import get_aligned_co_preference
+from src.group_analysis import _load_group_inputs, _score_groups, recommend_menus_batch
+from src.user_matrix import get_user_matrix
+
+
+def _load_scoring(user_data_path, correlation_matrix_path, collaborative_weight):
+    # recommend_menus와 같은 점수 계산 입력 (협업 유사도는 비율이 있을 때만)
+    inputs = _load_group_inputs(user_data_path, correlation_matrix_path)
+    collaborative = None
+    if collaborative_weight:
+        if not 0 <= collaborative_weight <= 1:
+            raise ValueError("collaborative_weight는 0에서 1 사이여야 합니다.")
+        collaborative = get_aligned_co_preference(user_data_path, correlation_matrix_path)
+    return inputs, collaborative
+
+
+def group_satisfaction(inputs, groups, weight=2.0, diversity_penalty=0.8, collaborative=None, collaborative_weight=0.0):
+    """
+    그룹별 만족도(1순위 메뉴 점수 × 인원)를 계산합니다.
+    recommend_menus처럼 구성원이 4점을 준 선호 메뉴는 추천 후보에서 빼고 나머지 메뉴의 최고 점수를 사용하며,
+    점수를 계산할 수 없는 메뉴(NaN)는 후보에서 제외합니다. 후보가 없으면 0점입니다.
+
+    Args:
+        inputs (dict): _build_group_inputs 결과.
+        groups (list): 사용자 이름 리스트의 리스트.
+        weight (float): 사용자 선호 메뉴에 부여할 가중치.
+        diversity_penalty (float): 상관관계의 집중도를 완화하는 계수.
+        collaborative (np.ndarray): 협업 유사도 배열.
+        collaborative_weight (float): 협업 유사도를 반영할 비율 (0~1).
+
+    Returns:
+        np.ndarray: 그룹별 만족도.
+    """
+    combined_scores, preferred = _score_groups(
+        inputs, groups, weight, diversity_penalty, collaborative, collaborative_weight
+    )
+    candidates = np.where(preferred | ~np.isfinite(combined_scores), -np.inf, combined_scores)
+    best = candidates.max(axis=1, initial=-np.inf)
+    best[~np.isfinite(best)] = 0.0
+    return best * np.array([len(user_names) for user_names in groups], dtype=float)
+
+
+def feasible_group_counts(n_users, min_size, max_size):
+    """
+    n_users명을 min_size~max_size명 그룹으로 나눌 수 있는 그룹 수의 범위를 반환합니다.
+    """
+    if min_size < 1 or min_size > max_size:
+        raise ValueError("그룹 인원 범위가 올바르지 않습니다.")
+    counts = range(math.ceil(n_users / max_size), n_users // min_size + 1)
+    if not counts:
+        raise ValueError(f"{n_users}명은 {min_size}~{max_size}명 그룹으로 나눌 수 없습니다.")
+    return counts
+
+
+def _local_search(user_data_path, correlation_matrix_path, user_names, min_size, max_size, n_groups, seed, deadline,
+                  batch_size, patience, weight, diversity_penalty, collaborative_weight):
+    """
+    한 번의 재시작입니다. 작업 프로세스에서 실행되므로 모듈 최상위 함수로 둡니다.
+
+    Returns:
+        tuple: (만족도 합, 그룹별 사용자 번호 리스트의 리스트, 라운드 수)
+    """
+    inputs, collaborative = _load_scoring(user_data_path, correlation_matrix_path, collaborative_weight)
+    rng = np.random.default_rng(seed)
+    n_users = len(user_names)
+
+    def score(groups):
+        return group_satisfaction(
+            inputs, [[user_names[idx] for idx in members] for members in groups],
+            weight, diversity_penalty, collaborative, collaborative_weight,
+        )
+
+    # 그룹 수를 정하고 (지정하지 않으면 가능한 범위에서 무작위) 최대한 고른 크기로 무작위 배치
+    if n_groups is None:
+        counts = feasible_group_counts(n_users, min_size, max_size)
+        n_groups = int(rng.integers(counts.start, counts.stop))
+    order = rng.permutation(n_users)
+    groups = [order[idx::n_groups].tolist() for idx in range(n_groups)]
+    labels = np.empty(n_users, dtype=np.intp)
+    for group_idx, members in enumerate(groups):
+        labels[members] = group_idx
+    satisfaction = score(groups)
+
+    rounds = stale = 0
+    while stale < patience and time.time() < deadline:
+        rounds += 1
+        sizes = np.array([len(members) for members in groups])
+        first = rng.integers(n_users, size=batch_size)
+        second = rng.integers(n_users, size=batch_size)
+        source, target = labels[first], labels[second]
+        # 절반은 맞바꾸기, 나머지는 first를 second의 그룹으로 옮기기 (인원 범위를 지키는 경우만)
+        relocate = np.arange(batch_size) % 2 == 1
+        allowed = (source != target) & (~relocate | ((sizes[source] > min_size) & (sizes[target] < max_size)))
+        first, second, source, target, relocate = (
+            first[allowed], second[allowed], source[allowed], target[allowed], relocate[allowed]
+        )
+        if not len(first):
+            stale += 1
+            continue
+
+        candidates = []
+        for user, other, from_group, to_group, move in zip(first, second, source, target, relocate):
+            from_members = [member for member in groups[from_group] if member != user]
+            to_members = groups[to_group] + [user]
+            if not move:
+                from_members.append(other)
+                to_members.remove(other)
+            candidates += [from_members, to_members]
+        candidate_satisfaction = score(candidates).reshape(-1, 2)
+        gains = candidate_satisfaction.sum(axis=1) - satisfaction[source] - satisfaction[target]
+
+        # 만족도가 오르는 후보를 큰 순서대로, 이번 라운드에 바뀌지 않은 그룹끼리만 적용
+        touched = set()
+        for idx in np.argsort(-gains, kind="stable"):
+            if gains[idx] <= 1e-9:
+                break
+            from_group, to_group = int(source[idx]), int(target[idx])
+            if from_group in touched or to_group in touched:
+                continue
+            touched.update((from_group, to_group))
+            groups[from_group], groups[to_group] = candidates[2 * idx], candidates[2 * idx + 1]
+            satisfaction[[from_group, to_group]] = candidate_satisfaction[idx]
+            labels[groups[from_group]] = from_group
+            labels[groups[to_group]] = to_group
+        stale = 0 if touched else stale + 1
+    return float(satisfaction.sum()), groups, rounds
+
+
+def partition_users(user_names, user_data_path, correlation_matrix_path, min_size=4, max_size=8, n_groups=None,
+                    time_budget=10.0, n_restarts=None, n_jobs=1, seed=None, batch_size=128, patience=20,
+                    top_n=3, top_reasons=10, weight=2.0, diversity_penalty=0.8, collaborative_weight=0.0):
+    """
+    사용자들을 min_size~max_size명 그룹으로 나누어 그룹 만족도 합이 가장 큰 분할과 그룹별 추천 메뉴를 반환합니다.
+
+    Args:
+        user_names (list): 나눌 사용자 이름 리스트. None이면 모든 사용자.
+        user_data_path (str): 사용자 데이터 파일 경로.
+        correlation_matrix_path (str): 메뉴 상관관계 행렬 파일 경로.
+        min_size (int): 그룹 최소 인원.
+        max_size (int): 그룹 최대 인원.
+        n_groups (int): 그룹 수. None이면 재시작마다 가능한 범위에서 무작위로 정합니다.
+        time_budget (float): 탐색 시간 예산(초). 지나면 재시작마다 지금까지의 분할을 반환합니다.
+        n_restarts (int): 재시작 수. 기본값은 max(n_jobs, 4).
+        n_jobs (int): 작업 프로세스 수. 1이면 현재 프로세스에서 차례로 실행합니다.
+        seed (int): 난수 시드. 같은 시드와 충분한 시간 예산이면 같은 결과를 반환합니다.
+        batch_size (int): 라운드마다 한 번에 평가할 후보 이동 수.
+        patience (int): 이 라운드 수만큼 연속으로 개선이 없으면 재시작을 끝냅니다.
+        top_n, top_reasons, weight, diversity_penalty, collaborative_weight: recommend_menus 참고.
+
+    Returns:
+        dict: {"total_satisfaction": 만족도 합, "restarts": 재시작 수,
+               "groups": [{"users": [...], "satisfaction": 만족도, "recommendations": [...],
+                           "random_recommendations": [...]}, ...]} (만족도 내림차순)
+    """
+    user_matrix = get_user_matrix(user_data_path)
+    if user_names is None:
+        user_names = list(user_matrix.name_to_row)
+    user_names = [name.strip() for name in user_names if name.strip()]
+    if not user_names:
+        raise ValueError("그룹으로 나눌 사용자 이름을 입력해주세요.")
+    unknown = [name for name in user_names if name not in user_matrix]
+    if unknown:
+        raise ValueError(f"사용자 데이터가 없습니다: {', '.join(unknown)}")
+    if len(set(user_names)) != len(user_names):
+        raise ValueError("같은 사용자가 여러 번 입력되었습니다.")
+    if n_groups is not None:
+        if n_groups not in feasible_group_counts(len(user_names), min_size, max_size):
+            raise ValueError(f"{len(user_names)}명은 {min_size}~{max_size}명씩 {n_groups}개 그룹으로 나눌 수 없습니다.")
+    else:
+        feasible_group_counts(len(user_names), min_size, max_size)
+
+    # 작업 프로세스가 복사해 쓰도록(fork) 점수 계산 입력을 미리 준비
+    _load_scoring(user_data_path, correlation_matrix_path, collaborative_weight)
+    n_restarts = n_restarts or max(n_jobs, 4)
+    seeds = np.random.SeedSequence(seed).generate_state(n_restarts).tolist()
+    deadline = time.time() + time_budget
+    arguments = [
+        (user_data_path, correlation_matrix_path, user_names, min_size, max_size, n_groups, restart_seed, deadline,
+         batch_size, patience, weight, diversity_penalty, collaborative_weight)
+        for restart_seed in seeds
+    ]
+    if n_jobs == 1 or n_restarts == 1:
+        results = [_local_search(*args) for args in arguments]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, n_restarts)) as executor:
+            results = list(executor.map(_local_search, *zip(*arguments)))
+
+    # 재시작 순서가 앞선 결과를 우선해 같은 시드에서 항상 같은 분할을 고름
+    total, groups, _ = max(results, key=lambda result: result[0])
+    groups = [[user_names[idx] for idx in sorted(members)] for members in groups]
+    inputs, collaborative = _load_scoring(user_data_path, correlation_matrix_path, collaborative_weight)
+    satisfaction = group_satisfaction(inputs, groups, weight, diversity_penalty, collaborative, collaborative_weight)
+    order = np.argsort(-satisfaction, kind="stable")
+    groups = [groups[idx] for idx in order]
+
+    recommendations = recommend_menus_batch(
+        groups, user_data_path, correlation_matrix_path, top_n, top_reasons, weight, diversity_penalty,
+        seeds=None if seed is None else [seed + idx for idx in range(len(groups))],
+        collaborative_weight=collaborative_weight,
+    )
+    return {
+        "total_satisfaction": total,
+        "restarts": n_restarts,
+        "groups": [
+            {
+                "users": members,
+                "satisfaction": float(satisfaction[idx]),
+                "recommendations": result[0] if result else [],
+                "random_recommendations": list(result[1]) if result else [],
+            }
+            for members, idx, result in zip(groups, order, recommendations)
+        ],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="많은 인원을 입맛이 맞는 식사 그룹으로 나눕니다.")
+    parser.add_argument("--users", default=None, help="나눌 사용자 이름 (','로 구분, 기본값: 모든 사용자)")
+    parser.add_argument("--users-file", default="data/processed_user_data.csv", help="사용자 데이터 파일 경로")
+    parser.add_argument("--correlation", default="data/menu_correlation_matrix.csv", help="메뉴 상관관계 행렬 파일 경로")
+    parser.add_argument("--min-size", type=int, default=4, help="그룹 최소 인원")
+    parser.add_argument("--max-size", type=int, default=8, help="그룹 최대 인원")
+    parser.add_argument("--groups", type=int, default=None, help="그룹 수 (기본값: 자동)")
+    parser.add_argument("--time-budget", type=float, default=10.0, help="탐색 시간 예산(초)")
+    parser.add_argument("--restarts", type=int, default=None, help="재시작 수")
+    parser.add_argument("--jobs", type=int, default=1, help="작업 프로세스 수")
+    parser.add_argument("--seed", type=int, default=None, help="난수 시드")
+    args = parser.parse_args()
+
+    result = partition_users(
+        args.users.split(",") if args.users else None,
+        args.users_file,
+        args.correlation,
+        min_size=args.min_size,
+        max_size=args.max_size,
+        n_groups=args.groups,
+        time_budget=args.time_budget,
+        n_restarts=args.restarts,
+        n_jobs=args.jobs,
+        seed=args.seed,
+    )
+    print(f"총 만족도: {result['total_satisfaction']:.2f} ({len(result['groups'])}개 그룹, 재시작 {result['restarts']}회)")
+    for idx, group in enumerate(result["groups"], start=1):
+        menus = ", ".join(recommendation["menu"] for recommendation in group["recommendations"])
+        print(f"\n{idx}. {', '.join(group['users'])} (만족도: {group['satisfaction']:.2f})")
+        print(f"   추천 메뉴: {menus or '없음'}")
@@ -0,0 +1,244 @@
+"""
+그룹과 사용자별 식사 기록입니다. 최근에 먹은 메뉴를 그룹 추천에서 감점하는 데 사용합니다.
+
+기록은 추가 전용 로그(data/meal_history.jsonl)에 한 줄씩 쌓이고, 메모리에는 그룹(구성원 이름 정렬)과
+사용자마다 최근 capacity개의 기록만 담는 링 버퍼(deque)를 이름으로 찾는 색인으로 유지합니다.
+따라서 한 그룹의 기록 조회와 감점 계산은 전체 기록 수와 무관하게 그룹 크기 × capacity에 비례합니다.
+다른 프로세스가 추가한 기록은 조회할 때 로그에서 새로 늘어난 부분만 읽어 반영합니다.
+링 버퍼에서 밀려난 기록이 로그의 절반을 넘으면 기록할 때 로그를 정리(compact)하므로 로그 크기는 유지하는 기록 수에 비례합니다.
+
+    python -m src.meal_history 연누,야옹 고등어조림             # 오늘 먹은 메뉴 기록
+    python -m src.meal_history 연누,야옹 김치찌개 --date 2024-05-01
+
+감점은 메뉴를 먹은 뒤 지난 일수에 따라 반감기(half_life_days)마다 절반으로 줄어듭니다.
+"""
+import argparse
+import datetime
+import json
+import math
+import os
+import threading
+from collections import deque
+
+import numpy as np
+
+from src.file_utils import atomic_write, file_lock
+from src.user_store import _repair_tail
+
+# 파일 경로 정의
+meal_history_path = "data/meal_history.jsonl"
+
+
+def group_key(user_names):
+    """
+    그룹 구성원 이름으로 그룹 기록의 키를 만듭니다. 구성원 순서와 무관합니다.
+    """
+    return "|".join(sorted(set(user_names)))
+
+
+class MealHistory:
+    """
+    그룹과 사용자별 최근 식사 기록입니다.
+    """
+
+    def __init__(self, log_path=meal_history_path, capacity=30, half_life_days=3.0, member_weight=0.5, max_age_days=28, compact_min_lines=1000):
+        """
+        Args:
+            log_path (str): 식사 기록 로그 파일 경로.
+            capacity (int): 그룹 또는 사용자마다 메모리에 유지할 최근 기록 수.
+            half_life_days (float): 감점이 절반으로 줄어드는 일수.
+            member_weight (float): 구성원 개인 기록의 감점 비율 (그룹 기록은 1).
+                다른 그룹에서 같은 메뉴를 먹은 구성원이 있어도 감점됩니다.
+            max_age_days (int): 이 일수보다 오래된 기록은 감점하지 않습니다.
+            compact_min_lines (int): 링 버퍼에서 밀려난 기록이 이 수보다 많고 남은 기록보다도 많으면
+                기록할 때 로그를 정리합니다.
+        """
+        self.log_path = log_path
+        self.lock_path = os.path.splitext(log_path)[0] + ".lock"
+        self.capacity = capacity
+        self.half_life_days = half_life_days
+        self.member_weight = member_weight
+        self.max_age_days = max_age_days
+        self.compact_min_lines = compact_min_lines
+        self._lock = threading.Lock()
+        # {그룹 키: deque[(기록 순번, 날짜 서수, 메뉴)]}, {사용자 이름: deque[...]}
+        self._groups = {}
+        self._users = {}
+        self._members = {}  # {그룹 키: 구성원 이름 리스트}
+        self._count = 0
+        self._evicted = 0  # 그룹 링 버퍼에서 밀려난 (정리하면 로그에서 지워질) 기록 수
+        self._file_id = None
+        self._offset = 0
+
+    def _add(self, record):
+        entry = (self._count, datetime.date.fromisoformat(record["date"]).toordinal(), record["menu"])
+        self._count += 1
+        self._members.setdefault(group_key(record["users"]), sorted(set(record["users"])))
+        for index, key in [(self._groups, group_key(record["users"]))] + [
+            (self._users, user_name) for user_name in sorted(set(record["users"]))
+        ]:
+            entries = index.get(key)
+            if entries is None:
+                entries = index[key] = deque(maxlen=self.capacity)
+            if index is self._groups and len(entries) == self.capacity:
+                self._evicted += 1
+            entries.append(entry)
+
+    def _revision_of(self, entries):
+        # 링 버퍼의 마지막 기록 순번 (기록이 추가되면 바뀜)
+        return entries[-1][0] if entries else -1
+
+    def _refresh(self):
+        """
+        로그에서 마지막으로 읽은 위치 이후에 추가된 줄만 읽어 반영합니다 (self._lock을 잡은 상태에서 호출).
+        로그가 정리(compact)되어 교체되었으면 처음부터 다시 읽습니다.
+        """
+        try:
+            stat = os.stat(self.log_path)
+        except FileNotFoundError:
+            return
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self._file_id or stat.st_size < self._offset:
+            self._groups, self._users, self._members, self._count, self._evicted = {}, {}, {}, 0, 0
+            self._file_id, self._offset = file_id, 0
+        if stat.st_size == self._offset:
+            return
+        with open(self.log_path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read(stat.st_size - self._offset)
+        # 줄바꿈으로 끝난(완전히 기록된) 줄만 반영
+        complete = data[:data.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            if not line.strip():
+                continue
+            try:
+                self._add(json.loads(line))
+            except (ValueError, KeyError, TypeError) as e:
+                # 손상된 줄 하나 때문에 모든 추천이 실패하지 않도록 건너뜀
+                print(f"식사 기록의 손상된 줄을 건너뜁니다: {e}")
+        self._offset += len(complete)
+
+    def record(self, user_names, menu, date=None):
+        """
+        그룹이 먹은 메뉴를 기록합니다. 밀려난 기록이 많이 쌓였으면 로그를 정리합니다.
+
+        Args:
+            user_names (list): 함께 먹은 사용자 이름 리스트.
+            menu (str): 메뉴 이름.
+            date (datetime.date): 먹은 날짜. 기본값은 오늘.
+        """
+        user_names = list(user_names)
+        if not user_names:
+            raise ValueError("식사를 기록할 사용자 이름을 입력해주세요.")
+        date = date or datetime.date.today()
+        line = json.dumps({"date": date.isoformat(), "users": user_names, "menu": menu}, ensure_ascii=False) + "\n"
+        with file_lock(self.lock_path):
+            # 이전 쓰기가 중간에 끊겨 남은 줄 조각 뒤에 이어 쓰지 않도록 먼저 잘라냄
+            _repair_tail(self.log_path)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+        # 정리 비용(남은 기록 수)이 그동안 쌓인 밀려난 기록 수보다 작을 때만 정리하므로 기록 한 번의 평균 비용은 상수
+        with self._lock:
+            self._refresh()
+            should_compact = self._evicted > max(self.compact_min_lines, self._count - self._evicted)
+        if should_compact:
+            self.compact()
+
+    def recent(self, user_names):
+        """
+        그룹의 최근 식사 기록을 오래된 순서로 반환합니다.
+
+        Args:
+            user_names (list): 그룹 구성원 이름 리스트.
+
+        Returns:
+            list: (datetime.date, 메뉴) 튜플 리스트.
+        """
+        with self._lock:
+            self._refresh()
+            entries = list(self._groups.get(group_key(user_names), ()))
+        return [(datetime.date.fromordinal(day), menu) for _, day, menu in entries]
+
+    def revision(self, user_names):
+        """
+        그룹과 구성원의 마지막 기록 순번을 반환합니다. 새 기록이 추가되면 값이 바뀌므로 추천 결과 캐시 키에 사용합니다.
+        """
+        with self._lock:
+            self._refresh()
+            return (self._file_id, self._revision_of(self._groups.get(group_key(user_names)))) + tuple(
+                self._revision_of(self._users.get(user_name)) for user_name in sorted(set(user_names))
+            )
+
+    def penalties(self, groups, menu_positions, date=None):
+        """
+        그룹별 메뉴 감점 배열을 만듭니다. 메뉴를 먹은 지 d일이 지났으면 그룹 기록은 0.5 ** (d / 반감기),
+        구성원 기록은 그 값에 member_weight를 곱하고 구성원 수로 나눈 만큼 더합니다.
+
+        Args:
+            groups (list): 그룹별 사용자 이름 리스트의 리스트.
+            menu_positions (dict): {메뉴 이름: 점수 배열의 열 위치}. 없는 메뉴의 기록은 무시합니다.
+            date (datetime.date): 기준 날짜. 기본값은 오늘.
+
+        Returns:
+            np.ndarray: (그룹 수 × 메뉴 수) 감점 배열.
+        """
+        today = (date or datetime.date.today()).toordinal()
+        result = np.zeros((len(groups), len(menu_positions)))
+        group_rows, menu_columns, weights = [], [], []
+        with self._lock:
+            self._refresh()
+            # 그룹마다 (구성원 수 + 1) × capacity개 이하의 기록만 보므로 전체 기록 수와 무관
+            for group_idx, user_names in enumerate(groups):
+                members = sorted(set(user_names))
+                sources = [(self._groups.get(group_key(user_names), ()), 1.0)]
+                sources += [(self._users.get(member, ()), self.member_weight / len(members)) for member in members]
+                for entries, scale in sources:
+                    for _, day, menu in entries:
+                        age = today - day
+                        position = menu_positions.get(menu)
+                        if position is None or age < 0 or age > self.max_age_days:
+                            continue
+                        group_rows.append(group_idx)
+                        menu_columns.append(position)
+                        weights.append(scale * math.pow(0.5, age / self.half_life_days))
+        np.add.at(result, (group_rows, menu_columns), weights)
+        return result
+
+    def compact(self):
+        """
+        메모리에 유지하는 최근 기록만 남기도록 로그를 원자적으로 다시 씁니다.
+        다른 프로세스는 로그가 교체된 것을 감지해 처음부터 다시 읽습니다.
+        """
+        with file_lock(self.lock_path), self._lock:
+            self._refresh()
+            # 그룹 기록에 모든 식사가 들어 있으므로 그룹 기록만 원래 순서대로 다시 씀
+            # (그룹 링 버퍼에서 밀려난 기록은 구성원 링 버퍼에서도 이미 밀려나 있음)
+            records = sorted(
+                (entry, key) for key, entries in self._groups.items() for entry in entries
+            )
+            with atomic_write(self.log_path) as f:
+                for (_, day, menu), key in records:
+                    f.write(json.dumps(
+                        {"date": datetime.date.fromordinal(day).isoformat(), "users": self._members[key], "menu": menu},
+                        ensure_ascii=False,
+                    ) + "\n")
+            self._file_id = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="그룹이 먹은 메뉴를 식사 기록에 추가합니다.")
+    parser.add_argument("users", help="함께 먹은 사용자 이름 (','로 구분)")
+    parser.add_argument("menu", help="먹은 메뉴 이름")
+    parser.add_argument("--date", default=None, help="먹은 날짜 (YYYY-MM-DD, 기본값: 오늘)")
+    parser.add_argument("--history-file", default=meal_history_path, help="식사 기록 파일 경로")
+    args = parser.parse_args()
+
+    history = MealHistory(args.history_file)
+    user_names = [name.strip() for name in args.users.split(",") if name.strip()]
+    history.record(user_names, args.menu, datetime.date.fromisoformat(args.date) if args.date else None)
+    print(f"'{', '.join(user_names)}' 그룹의 식사 '{args.menu}'를 기록했습니다.")
+    for date, menu in history.recent(user_names)[-5:]:
+        print(f"  {date.isoformat()} {menu}")
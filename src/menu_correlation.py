@@ -1,27 +1,390 @@
+"""
+메뉴 간 코사인 유사도(상관관계) 행렬을 만들고 관리합니다.
+
+전체 행렬을 다시 계산하려면 프로젝트 루트에서 다음과 같이 실행합니다.
+    python -m src.menu_correlation
+
+메뉴가 아주 많아 전체 행렬을 메모리에 올릴 수 없다면 메뉴별 상위 k개 유사 메뉴만 남기는
+희소 그래프를 블록 단위로 만들 수 있습니다.
+    python -m src.menu_correlation --topk 20 --block-size 2048 --jobs 4
+
+--raw를 주면 전처리된 메뉴 데이터 대신 원본 메뉴 정보(menu_details.csv)를 menu_features 단계로 변환한
+희소 속성 행렬로 계산합니다. 유사도는 항상 희소 행렬로 계산하므로 비용은 0이 아닌 속성 값의 수에 비례합니다.
+"""
+import argparse
+import os
+
+import numpy as np
 import pandas as pd
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy import sparse
+
+from src.correlation_binary import is_upper_triangular, save_correlation_binary
+from src.file_utils import atomic_write
+from src.menu_features import build_menu_features, features_file_path, raw_file_path
+from src.similarity_graph import SimilarityGraph, normalize_rows
 
 # 파일 경로 정의
 input_file_path = "data/processed_menu_details.csv"  # 입력 파일 경로
 output_file_path = "data/menu_correlation_matrix.csv"  # 출력 파일 경로
+binary_file_path = "data/menu_correlation_matrix.npy"  # 메모리 매핑용 바이너리 출력 파일 경로
+graph_file_path = "data/menu_similarity_graph.npz"  # 상위 k개 유사 메뉴 그래프 출력 파일 경로
+
+
+def select_numeric_features(processed_menu_details):
+    """
+    메뉴 데이터에서 유사도 계산에 사용할 수치형 속성만 선택합니다.
+
+    Args:
+        processed_menu_details (pd.DataFrame): 전처리된 메뉴 데이터.
+
+    Returns:
+        pd.DataFrame: 수치형 속성 데이터.
+    """
+    return processed_menu_details.select_dtypes(include=[int, float])
+
+
+def sparse_cosine_similarity(features):
+    """
+    희소 속성 행렬의 모든 행 쌍 코사인 유사도를 계산합니다. 크기가 0인 행의 유사도는 0입니다.
+    비용은 전체 열 수가 아니라 0이 아닌 값의 수(와 공통 속성을 가진 메뉴 쌍의 수)에 비례합니다.
+
+    Args:
+        features (sparse.spmatrix): (메뉴 수 × 속성 수) 희소 행렬.
+
+    Returns:
+        sparse.csr_matrix: (메뉴 수 × 메뉴 수) 희소 유사도 행렬 (공통 속성이 없는 쌍은 저장하지 않음).
+    """
+    unit_features = normalize_rows(features, dtype=np.float64)
+    return (unit_features @ unit_features.T).tocsr()
+
+
+def compute_correlation_matrix(processed_menu_details):
+    """
+    모든 메뉴 쌍의 코사인 유사도를 계산합니다.
+
+    Args:
+        processed_menu_details (pd.DataFrame): 전처리된 메뉴 데이터.
+
+    Returns:
+        pd.DataFrame: 메뉴 이름을 인덱스와 열로 가지는 상관관계 행렬.
+    """
+    # 수치형 데이터만 선택해 희소 행렬로 변환 (원-핫 속성은 대부분 0)
+    numeric_features = sparse.csr_matrix(select_numeric_features(processed_menu_details).to_numpy(dtype=float))
+
+    # 코사인 유사도 계산 후 DataFrame으로 변환
+    return pd.DataFrame(
+        sparse_cosine_similarity(numeric_features).toarray(),
+        index=processed_menu_details['메뉴'],
+        columns=processed_menu_details['메뉴']
+    )
+
+
+def compute_feature_correlation_matrix(menu_features):
+    """
+    menu_features 단계의 희소 속성 행렬로 모든 메뉴 쌍의 코사인 유사도를 계산합니다.
+
+    Args:
+        menu_features (MenuFeatures): 희소 속성 행렬.
+
+    Returns:
+        pd.DataFrame: 메뉴 이름을 인덱스와 열로 가지는 상관관계 행렬.
+    """
+    index = pd.Index(menu_features.menus, name="메뉴")
+    return pd.DataFrame(sparse_cosine_similarity(menu_features.matrix).toarray(), index=index, columns=index)
+
+
+def save_correlation_matrix(correlation_matrix_df, correlation_matrix_path):
+    """
+    상관관계 행렬을 CSV 파일로 원자적으로 저장합니다.
+
+    Args:
+        correlation_matrix_df (pd.DataFrame): 상관관계 행렬.
+        correlation_matrix_path (str): 저장할 파일 경로.
+    """
+    with atomic_write(correlation_matrix_path) as f:
+        correlation_matrix_df.to_csv(f, index=True)
+
+
+def build_correlation_matrix(menu_file_path=input_file_path, correlation_matrix_path=output_file_path, binary_path=binary_file_path, upper_triangular=False):
+    """
+    메뉴 데이터 파일로부터 전체 상관관계 행렬을 계산해 저장합니다.
+    CSV와 함께 메모리 매핑용 float32 바이너리 파일도 저장합니다.
+
+    Args:
+        menu_file_path (str): 전처리된 메뉴 데이터 파일 경로.
+        correlation_matrix_path (str): 상관관계 행렬을 저장할 CSV 파일 경로.
+        binary_path (str): 바이너리 행렬을 저장할 .npy 파일 경로. None이면 저장하지 않습니다.
+        upper_triangular (bool): True이면 바이너리 파일에 상삼각 부분만 저장합니다.
+            상삼각 파일은 행 단위로만 읽을 수 있으므로 앱은 이 파일 대신 CSV를 사용합니다.
+
+    Returns:
+        pd.DataFrame: 계산된 상관관계 행렬.
+    """
+    processed_menu_details = pd.read_csv(menu_file_path)
+    correlation_matrix_df = compute_correlation_matrix(processed_menu_details)
+    _save_outputs(correlation_matrix_df, correlation_matrix_path, binary_path, upper_triangular)
+    return correlation_matrix_df
+
+
+def build_correlation_matrix_from_raw(raw_path=raw_file_path, correlation_matrix_path=output_file_path, binary_path=binary_file_path, features_path=features_file_path):
+    """
+    원본 메뉴 정보 파일을 희소 속성 행렬로 변환(바뀐 메뉴만 다시 계산)한 뒤 상관관계 행렬을 계산해 저장합니다.
+
+    Args:
+        raw_path (str): 원본 메뉴 정보 파일 경로.
+        correlation_matrix_path (str): 상관관계 행렬을 저장할 CSV 파일 경로.
+        binary_path (str): 바이너리 행렬을 저장할 .npy 파일 경로. None이면 저장하지 않습니다.
+        features_path (str): 희소 속성 행렬 캐시 파일 경로.
+
+    Returns:
+        pd.DataFrame: 계산된 상관관계 행렬.
+    """
+    correlation_matrix_df = compute_feature_correlation_matrix(build_menu_features(raw_path, features_path))
+    _save_outputs(correlation_matrix_df, correlation_matrix_path, binary_path)
+    return correlation_matrix_df
+
+
+def _save_outputs(correlation_matrix_df, correlation_matrix_path, binary_path, upper_triangular=False):
+    save_correlation_matrix(correlation_matrix_df, correlation_matrix_path)
+    if binary_path is not None:
+        save_correlation_binary(correlation_matrix_df, binary_path, upper_triangular=upper_triangular)
+
+
+def build_similarity_graph(menu_file_path=input_file_path, graph_path=graph_file_path, k=20, block_size=1024, n_jobs=1):
+    """
+    전체 상관관계 행렬 대신 메뉴별 상위 k개 유사 메뉴만 남긴 희소 그래프를 만들어 저장합니다.
+
+    Args:
+        menu_file_path (str): 전처리된 메뉴 데이터 파일 경로.
+        graph_path (str): 그래프를 저장할 .npz 파일 경로.
+        k (int): 메뉴마다 남길 이웃 수.
+        block_size (int): 한 번에 계산할 메뉴 수. 최대 메모리 사용량을 결정합니다.
+        n_jobs (int): 작업 프로세스 수.
+
+    Returns:
+        SimilarityGraph: 생성된 그래프.
+    """
+    processed_menu_details = pd.read_csv(menu_file_path)
+    numeric_features = sparse.csr_matrix(select_numeric_features(processed_menu_details).to_numpy(dtype=np.float32))
+    graph = SimilarityGraph.build(
+        processed_menu_details["메뉴"].tolist(), numeric_features, k=k, block_size=block_size, n_jobs=n_jobs
+    )
+    graph.save(graph_path)
+    return graph
+
+
+class IncrementalCorrelationMatrix:
+    """
+    메뉴가 추가, 수정, 삭제될 때 전체 행렬을 다시 계산하지 않고
+    해당 메뉴의 행과 열만 갱신하는 상관관계 행렬입니다.
+
+    각 메뉴 속성 벡터의 크기(norm)와 정규화된 벡터를 캐시해 두므로,
+    메뉴 하나를 갱신하는 비용은 O(메뉴 수 × 속성 수)입니다.
+
+    행렬과 캐시는 여유 용량을 둔 버퍼의 칸(slot)에 저장합니다. 메뉴를 추가하면 빈 칸을 쓰고,
+    삭제하면 칸을 비워 두기만 하므로 메뉴 하나를 추가하거나 삭제할 때 메뉴 수 × 메뉴 수 행렬을 복사하지 않습니다.
+    빈 칸이 없을 때만 사용 중인 칸을 모으며 용량을 늘립니다.
+    """
+
+    def __init__(self, processed_menu_details, correlation_matrix_df=None):
+        """
+        Args:
+            processed_menu_details (pd.DataFrame): 전처리된 메뉴 데이터.
+            correlation_matrix_df (pd.DataFrame): 기존 상관관계 행렬. 메뉴 목록이 맞지 않거나 None이면 새로 계산합니다.
+        """
+        self.menu_details = processed_menu_details.reset_index(drop=True).copy()
+        self.feature_columns = select_numeric_features(self.menu_details).columns.tolist()
+        self.menus = self.menu_details["메뉴"].tolist()
+
+        features = self.menu_details[self.feature_columns].to_numpy(dtype=float)
+        norms = np.linalg.norm(features, axis=1)
+        unit_features = self._normalize(features, norms)
+
+        if correlation_matrix_df is not None and correlation_matrix_df.index.tolist() == self.menus:
+            matrix = correlation_matrix_df.to_numpy(dtype=float)
+        else:
+            matrix = unit_features @ unit_features.T
+
+        # 메뉴 순서대로 사용 중인 버퍼 칸 번호와, 지금까지 사용한 칸 수
+        n_menus = len(self.menus)
+        self._slots = np.arange(n_menus)
+        self._n_used = n_menus
+        self._allocate(self._capacity_for(n_menus), norms, unit_features, matrix)
+
+    @staticmethod
+    def _capacity_for(n_menus):
+        # 메뉴 수의 1/4(최소 16칸)만큼 여유를 둠
+        return n_menus + max(n_menus // 4, 16)
+
+    def _allocate(self, capacity, norms, unit_features, matrix):
+        # 주어진 값들을 새 버퍼의 앞쪽 칸에 채움
+        n_menus = len(norms)
+        self._norms = np.zeros(capacity)
+        self._norms[:n_menus] = norms
+        self._unit_features = np.zeros((capacity, len(self.feature_columns)))
+        self._unit_features[:n_menus] = unit_features
+        self._matrix = np.zeros((capacity, capacity))
+        self._matrix[:n_menus, :n_menus] = matrix
+
+    def _new_slot(self):
+        # 빈 칸이 없으면 사용 중인 칸만 앞으로 모은 새 버퍼를 만듦 (다시 여유를 두므로 복사는 가끔만 일어남)
+        if self._n_used == len(self._norms):
+            n_menus = len(self._slots)
+            self._allocate(self._capacity_for(n_menus), self.norms, self.unit_features, self.matrix)
+            self._slots = np.arange(n_menus)
+            self._n_used = n_menus
+        self._n_used += 1
+        return self._n_used - 1
+
+    def _contiguous(self):
+        return len(self._slots) == self._n_used
+
+    @property
+    def norms(self):
+        """메뉴 순서의 속성 벡터 크기 배열입니다."""
+        return self._norms[:self._n_used] if self._contiguous() else self._norms[self._slots]
+
+    @property
+    def unit_features(self):
+        """메뉴 순서의 정규화된 속성 벡터 배열입니다."""
+        return self._unit_features[:self._n_used] if self._contiguous() else self._unit_features[self._slots]
+
+    @property
+    def matrix(self):
+        """
+        메뉴 순서의 상관관계 행렬입니다. 삭제된 메뉴가 없으면 버퍼의 뷰이고, 있으면 사용 중인 칸만 모은 복사본입니다.
+        """
+        if self._contiguous():
+            return self._matrix[:self._n_used, :self._n_used]
+        return self._matrix[np.ix_(self._slots, self._slots)]
+
+    @classmethod
+    def load(cls, menu_file_path=input_file_path, correlation_matrix_path=output_file_path):
+        """
+        메뉴 데이터 파일과 기존 상관관계 행렬 파일을 불러옵니다.
+
+        Args:
+            menu_file_path (str): 전처리된 메뉴 데이터 파일 경로.
+            correlation_matrix_path (str): 상관관계 행렬 파일 경로.
+
+        Returns:
+            IncrementalCorrelationMatrix: 불러온 행렬.
+        """
+        processed_menu_details = pd.read_csv(menu_file_path)
+        try:
+            correlation_matrix_df = pd.read_csv(correlation_matrix_path, index_col=0)
+        except FileNotFoundError:
+            correlation_matrix_df = None
+        return cls(processed_menu_details, correlation_matrix_df)
+
+    @staticmethod
+    def _normalize(features, norms):
+        # 크기가 0인 벡터는 그대로 0으로 두어 cosine_similarity와 같은 결과(유사도 0)를 냄
+        safe_norms = np.where(norms == 0, 1.0, norms)
+        return features / safe_norms[:, None]
+
+    def upsert_menu(self, menu, attributes):
+        """
+        메뉴를 추가하거나 속성을 수정하고, 해당 메뉴의 행과 열만 다시 계산합니다.
+
+        Args:
+            menu (str): 메뉴 이름.
+            attributes (dict): 바꿀 속성 값 (예: {"맛 프로파일_짭짤": 1, "분류": "한식"}).
+                새 메뉴에서 지정하지 않은 수치형 속성은 0으로 채워집니다.
+        """
+        unknown_columns = set(attributes) - set(self.menu_details.columns)
+        if unknown_columns:
+            raise ValueError(f"알 수 없는 속성입니다: {', '.join(sorted(unknown_columns))}")
+
+        if menu in self.menus:
+            menu_idx = self.menus.index(menu)
+            for column, value in attributes.items():
+                self.menu_details.loc[menu_idx, column] = value
+        else:
+            new_row = {column: 0 for column in self.feature_columns}
+            new_row.update(attributes)
+            new_row["메뉴"] = menu
+            self.menu_details = pd.concat([self.menu_details, pd.DataFrame([new_row])], ignore_index=True)
+            self.menus.append(menu)
+            menu_idx = len(self.menus) - 1
+
+            # 버퍼의 빈 칸을 새 메뉴에 배정
+            slot = self._new_slot()
+            self._slots = np.append(self._slots, slot)
+
+        # 해당 메뉴의 norm과 정규화 벡터만 갱신
+        slot = self._slots[menu_idx]
+        vector = self.menu_details.loc[menu_idx, self.feature_columns].to_numpy(dtype=float)
+        self._norms[slot] = np.linalg.norm(vector)
+        self._unit_features[slot] = self._normalize(vector[None, :], self._norms[slot:slot + 1])[0]
+
+        # 해당 메뉴의 행과 열만 다시 계산 (사용 중인 칸만)
+        similarities = self._unit_features[self._slots] @ self._unit_features[slot]
+        self._matrix[slot, self._slots] = similarities
+        self._matrix[self._slots, slot] = similarities
+
+    def remove_menu(self, menu):
+        """
+        메뉴를 삭제합니다. 해당 메뉴의 버퍼 칸은 비워 두기만 하고 행렬을 복사하지 않습니다.
+
+        Args:
+            menu (str): 삭제할 메뉴 이름.
+        """
+        if menu not in self.menus:
+            raise ValueError(f"메뉴 '{menu}'를 찾을 수 없습니다.")
+        menu_idx = self.menus.index(menu)
+
+        self.menu_details = self.menu_details.drop(index=menu_idx).reset_index(drop=True)
+        del self.menus[menu_idx]
+        self._slots = np.delete(self._slots, menu_idx)
+
+    def to_frame(self):
+        """
+        현재 상관관계 행렬을 DataFrame으로 반환합니다.
 
-# 파일 로드
-processed_menu_details = pd.read_csv(input_file_path)
+        Returns:
+            pd.DataFrame: 메뉴 이름을 인덱스와 열로 가지는 상관관계 행렬.
+        """
+        index = pd.Index(self.menus, name="메뉴")
+        return pd.DataFrame(self.matrix, index=index, columns=index)
 
-# 수치형 데이터만 선택
-numeric_features = processed_menu_details.select_dtypes(include=[int, float])
+    def save(self, correlation_matrix_path=output_file_path, menu_file_path=None, binary_path=None):
+        """
+        상관관계 행렬(필요하면 메뉴 데이터와 바이너리 행렬도)을 원자적으로 저장합니다.
 
-# 코사인 유사도 계산
-correlation_matrix = cosine_similarity(numeric_features)
+        Args:
+            correlation_matrix_path (str): 상관관계 행렬을 저장할 파일 경로.
+            menu_file_path (str): 메뉴 데이터를 저장할 파일 경로. None이면 저장하지 않습니다.
+            binary_path (str): 바이너리 행렬을 저장할 .npy 파일 경로. None이면 CSV 옆의 같은 이름 .npy 파일이
+                이미 있을 때만 다시 씁니다 (앱은 .npy 파일이 있으면 그 파일을 읽으므로 오래된 행렬이 남지 않게 함).
+        """
+        if menu_file_path is not None:
+            with atomic_write(menu_file_path) as f:
+                self.menu_details.to_csv(f, index=False)
+        correlation_matrix_df = self.to_frame()
+        save_correlation_matrix(correlation_matrix_df, correlation_matrix_path)
+        if binary_path is None:
+            binary_path = os.path.splitext(correlation_matrix_path)[0] + ".npy"
+            if not os.path.exists(binary_path):
+                return
+        # 기존 바이너리 파일의 저장 형식(전체 또는 상삼각)을 유지
+        save_correlation_binary(correlation_matrix_df, binary_path, upper_triangular=is_upper_triangular(binary_path))
 
-# DataFrame으로 변환
-correlation_matrix_df = pd.DataFrame(
-    correlation_matrix, 
-    index=processed_menu_details['메뉴'], 
-    columns=processed_menu_details['메뉴']
-)
 
-# 결과를 CSV 파일로 저장
-correlation_matrix_df.to_csv(output_file_path, index=True)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="메뉴 간 상관관계 행렬 또는 상위 k개 유사 메뉴 그래프를 만듭니다.")
+    parser.add_argument("--topk", type=int, default=None, help="지정하면 전체 행렬 대신 메뉴별 상위 k개 그래프를 만듭니다.")
+    parser.add_argument("--block-size", type=int, default=1024, help="그래프 계산 시 한 번에 처리할 메뉴 수")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="그래프 계산에 사용할 프로세스 수")
+    parser.add_argument("--raw", action="store_true", help="원본 메뉴 정보(menu_details.csv)의 희소 속성 행렬로 계산합니다.")
+    args = parser.parse_args()
 
-print(f"메뉴 간 상관관계 데이터가 '{output_file_path}'에 저장되었습니다.")
+    if args.raw:
+        build_correlation_matrix_from_raw(raw_file_path, output_file_path, binary_file_path, features_file_path)
+        print(f"원본 메뉴 정보로 계산한 상관관계 데이터가 '{output_file_path}'와 '{binary_file_path}'에 저장되었습니다.")
+    elif args.topk is not None:
+        build_similarity_graph(input_file_path, graph_file_path, k=args.topk, block_size=args.block_size, n_jobs=args.jobs)
+        print(f"메뉴별 상위 {args.topk}개 유사 메뉴 그래프가 '{graph_file_path}'에 저장되었습니다.")
+    else:
+        build_correlation_matrix(input_file_path, output_file_path, binary_file_path)
+        print(f"메뉴 간 상관관계 데이터가 '{output_file_path}'와 '{binary_file_path}'에 저장되었습니다.")
@@ -0,0 +1,220 @@
+"""
+원본 메뉴 정보(menu_details.csv)를 희소 속성 행렬로 바꾸는 전처리 단계입니다.
+
+주재료, 맛 프로파일 등 여러 값이 "+", "/", ","로 이어진 항목을 값 단위로 나누고
+("사계절(겨울 선호)"처럼 괄호가 있으면 "사계절"과 "겨울 선호"로 나눔),
+"<항목>_<값>" 열을 가지는 (메뉴 × 속성) scipy.sparse 행렬과 열 이름 목록을 만듭니다.
+메모리와 계산량은 전체 열 수가 아니라 0이 아닌 값의 수에 비례합니다.
+
+결과는 data/menu_features.npz에 저장되며, 다시 실행하면 원본 항목이 바뀐 메뉴만 다시 나눕니다.
+    python -m src.menu_features
+
+processed_menu_details.csv에는 값을 나누는 것만으로는 만들 수 없는 수작업 속성(예: "돼지고기" → "돼지", "고기")이
+들어 있으므로, 이 단계의 결과는 그 파일과 열 구성이 다릅니다.
+"""
+import argparse
+import hashlib
+import re
+import zipfile
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from src.file_utils import atomic_write
+
+# 파일 경로 정의
+raw_file_path = "data/menu_details.csv"  # 원본 메뉴 정보 파일 경로
+features_file_path = "data/menu_features.npz"  # 희소 속성 행렬 저장 경로
+
+# 여러 값을 가지는 항목 (열 이름 앞부분으로 사용)
+FEATURE_FIELDS = ["주재료", "맛 프로파일", "식사 타입/상황", "조리 방식", "계절/날씨"]
+
+_SEPARATORS = re.compile(r"[+/,]")
+_PARENTHESIZED = re.compile(r"^(.*?)\((.*)\)$")
+
+
+def split_values(value):
+    """
+    여러 값이 이어진 항목을 값 리스트로 나눕니다. 같은 값은 한 번만 포함합니다.
+
+    Args:
+        value (str): 원본 항목 (예: "채소+고기(가끔), 밥").
+
+    Returns:
+        list: 값 리스트 (예: ["채소", "고기", "가끔", "밥"]).
+    """
+    if not isinstance(value, str):
+        return []
+    values = []
+    for part in _SEPARATORS.split(value):
+        part = part.strip()
+        match = _PARENTHESIZED.match(part)
+        pieces = [match.group(1), match.group(2)] if match else [part]
+        for piece in pieces:
+            piece = piece.strip()
+            if piece.endswith(" 등"):
+                piece = piece[:-2].strip()
+            if piece and piece not in values:
+                values.append(piece)
+    return values
+
+
+def _row_hash(row):
+    # 속성 계산에 쓰이는 원본 항목만으로 만든 지문
+    return hashlib.md5("\x1f".join(str(row[field]) for field in FEATURE_FIELDS).encode("utf-8")).hexdigest()
+
+
+def _row_columns(row):
+    return [f"{field}_{value}" for field in FEATURE_FIELDS for value in split_values(row[field])]
+
+
+class MenuFeatures:
+    """
+    메뉴별 희소 속성 행렬과 열 이름 목록입니다.
+    """
+
+    def __init__(self, menus, vocabulary, matrix, row_hashes, changed_rows=None):
+        """
+        Args:
+            menus (list): 메뉴 이름 리스트 (행 순서).
+            vocabulary (list): 속성 열 이름 리스트 (열 순서).
+            matrix (sparse.csr_matrix): (메뉴 수 × 속성 수) 0/1 희소 행렬.
+            row_hashes (list): 메뉴별 원본 항목 지문.
+            changed_rows (int): 이번 계산에서 새로 나눈 메뉴 수.
+        """
+        self.menus = list(menus)
+        self.vocabulary = list(vocabulary)
+        self.matrix = matrix
+        self.row_hashes = list(row_hashes)
+        self.changed_rows = len(self.menus) if changed_rows is None else changed_rows
+
+    @classmethod
+    def build(cls, raw_menu_details, previous=None):
+        """
+        원본 메뉴 정보로 희소 속성 행렬을 만듭니다. previous에 같은 메뉴가 같은 원본 항목으로 있으면
+        다시 나누지 않고 이전 행의 열을 재사용합니다.
+
+        Args:
+            raw_menu_details (pd.DataFrame): 원본 메뉴 정보 ("메뉴"와 FEATURE_FIELDS 열).
+            previous (MenuFeatures): 이전 결과.
+
+        Returns:
+            MenuFeatures: 희소 속성 행렬.
+        """
+        previous_rows = {}
+        if previous is not None:
+            for row_idx, (menu, row_hash) in enumerate(zip(previous.menus, previous.row_hashes)):
+                previous_rows[(menu, row_hash)] = row_idx
+
+        menus, row_hashes, row_columns = [], [], []
+        changed_rows = 0
+        for row in raw_menu_details.to_dict("records"):
+            row_hash = _row_hash(row)
+            previous_idx = previous_rows.get((row["메뉴"], row_hash))
+            if previous_idx is not None:
+                start, stop = previous.matrix.indptr[previous_idx:previous_idx + 2]
+                columns = [previous.vocabulary[column] for column in previous.matrix.indices[start:stop]]
+            else:
+                columns = _row_columns(row)
+                changed_rows += 1
+            menus.append(row["메뉴"])
+            row_hashes.append(row_hash)
+            row_columns.append(columns)
+
+        # 열 순서는 이전 결과를 유지하고 새 속성은 뒤에 붙임 (더 이상 쓰이지 않는 속성은 제거)
+        used = {column for columns in row_columns for column in columns}
+        vocabulary = [column for column in (previous.vocabulary if previous is not None else []) if column in used]
+        known = set(vocabulary)
+        for columns in row_columns:
+            for column in columns:
+                if column not in known:
+                    vocabulary.append(column)
+                    known.add(column)
+
+        positions = {column: idx for idx, column in enumerate(vocabulary)}
+        indptr = np.zeros(len(menus) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(columns) for columns in row_columns])
+        indices = np.fromiter(
+            (positions[column] for columns in row_columns for column in columns), dtype=np.int32, count=indptr[-1]
+        )
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), indices, indptr), shape=(len(menus), len(vocabulary))
+        )
+        matrix.sort_indices()
+        return cls(menus, vocabulary, matrix, row_hashes, changed_rows)
+
+    def to_frame(self):
+        """
+        속성 행렬을 processed_menu_details.csv와 같은 0/1 열 형식의 DataFrame으로 반환합니다.
+
+        Returns:
+            pd.DataFrame: "메뉴"와 속성 열을 가지는 메뉴 데이터.
+        """
+        frame = pd.DataFrame(self.matrix.toarray().astype(np.int64), columns=self.vocabulary)
+        frame.insert(0, "메뉴", self.menus)
+        return frame
+
+    def save(self, features_path):
+        """
+        속성 행렬을 파일로 원자적으로 저장합니다.
+        """
+        with atomic_write(features_path, mode="wb") as f:
+            np.savez(
+                f,
+                menus=np.array(self.menus, dtype=str),
+                vocabulary=np.array(self.vocabulary, dtype=str),
+                row_hashes=np.array(self.row_hashes, dtype=str),
+                indptr=self.matrix.indptr,
+                indices=self.matrix.indices,
+                shape=np.array(self.matrix.shape),
+            )
+
+    @classmethod
+    def load(cls, features_path):
+        """
+        저장된 속성 행렬을 불러옵니다. 파일이 없거나 읽을 수 없으면 None을 반환합니다.
+        """
+        try:
+            with np.load(features_path) as saved:
+                indices = saved["indices"]
+                matrix = sparse.csr_matrix(
+                    (np.ones(len(indices), dtype=np.float32), indices, saved["indptr"]), shape=tuple(saved["shape"])
+                )
+                return cls(
+                    saved["menus"].tolist(), saved["vocabulary"].tolist(), matrix, saved["row_hashes"].tolist(), 0
+                )
+        except (FileNotFoundError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+
+
+def build_menu_features(raw_path=raw_file_path, features_path=features_file_path):
+    """
+    원본 메뉴 정보 파일로 희소 속성 행렬을 만들어 저장합니다. 저장된 결과가 있으면 바뀐 메뉴만 다시 나눕니다.
+
+    Args:
+        raw_path (str): 원본 메뉴 정보 파일 경로.
+        features_path (str): 속성 행렬을 저장할 .npz 파일 경로. None이면 저장하지 않고 새로 계산합니다.
+
+    Returns:
+        MenuFeatures: 희소 속성 행렬.
+    """
+    raw_menu_details = pd.read_csv(raw_path)
+    previous = MenuFeatures.load(features_path) if features_path is not None else None
+    features = MenuFeatures.build(raw_menu_details, previous)
+    if features_path is not None:
+        features.save(features_path)
+    return features
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="원본 메뉴 정보를 희소 속성 행렬로 변환합니다.")
+    parser.add_argument("--raw", default=raw_file_path, help="원본 메뉴 정보 파일 경로")
+    parser.add_argument("--output", default=features_file_path, help="속성 행렬을 저장할 .npz 파일 경로")
+    args = parser.parse_args()
+
+    features = build_menu_features(args.raw, args.output)
+    print(
+        f"메뉴 {len(features.menus)}개, 속성 {len(features.vocabulary)}개 (0이 아닌 값 {features.matrix.nnz}개) - "
+        f"{features.changed_rows}개 메뉴를 다시 계산해 '{args.output}'에 저장했습니다."
+    )
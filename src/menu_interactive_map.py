@@ -1,26 +1,40 @@
-import pandas as pd
-from sklearn.decomposition import PCA
-from sklearn.cluster import KMeans
+import numpy as np
 import plotly.graph_objects as go
-import os
 
-os.environ["LOKY_MAX_CPU_COUNT"] = "4"
+from src.data_store import get_data_store
+from src.menu_layout import get_menu_layout
+from src.menu_neighbors import get_neighbor_index
+from src.profiling import profiled, stage
 
-def generate_menu_map(correlation_matrix_path, user_preferences=None):
-    # 파일 로드
-    correlation_matrix = pd.read_csv(correlation_matrix_path, index_col=0)
+@profiled("menu_map")
+def generate_menu_map(correlation_matrix_path, user_preferences=None, render_mode="classic", max_edges_per_node=None):
+    """
+    메뉴 간 상관관계 지도를 생성합니다.
 
-    # 1. 차원 축소 (PCA를 사용해 2D 좌표 생성)
-    pca = PCA(n_components=2)
-    coordinates = pca.fit_transform(correlation_matrix)
+    Args:
+        correlation_matrix_path (str): 메뉴 상관관계 행렬 파일 경로.
+        user_preferences (dict): {메뉴: 선호도 점수} 형식의 사용자 선호도. 4점 메뉴가 강조됩니다.
+        render_mode (str): "classic"은 연결선마다 trace를 만들고, "webgl"은 모든 연결선을 하나의 trace로 묶고
+            WebGL(Scattergl)로 그립니다. 메뉴가 수천 개인 경우 "webgl"을 사용하세요.
+        max_edges_per_node (int): 지정하면 메뉴마다 가장 강한 연결선 k개만 그립니다.
 
-    # 2. 군집화
-    kmeans = KMeans(n_clusters=5, random_state=0).fit(coordinates)
-    clusters = kmeans.labels_
+    Returns:
+        go.Figure: Plotly 지도.
+    """
+    if render_mode not in ("classic", "webgl"):
+        raise ValueError(f"지원하지 않는 render_mode입니다: {render_mode}")
 
-    # 좌표 데이터프레임 생성
-    df_coordinates = pd.DataFrame(coordinates, columns=["x", "y"], index=correlation_matrix.index)
-    df_coordinates["cluster"] = clusters
+    # 파일 로드 (공유 데이터 저장소에서 가져옴)
+    with stage("menu_map.load"):
+        correlation_matrix = get_data_store().get_correlation_matrix(correlation_matrix_path)
+        neighbor_index = get_neighbor_index(correlation_matrix_path)
+
+    # 1~2. 차원 축소와 군집화 (사용자와 무관하므로 상관관계 행렬 버전별로 캐시된 배치 사용)
+    with stage("menu_map.layout"):
+        layout = get_menu_layout(correlation_matrix_path)
+
+        # 좌표 데이터프레임 생성
+        df_coordinates = layout.reindexed(correlation_matrix.index)
 
     # 군집 색상 매핑
     colors = ["red", "blue", "green", "purple", "orange"]
@@ -28,21 +42,41 @@ def generate_menu_map(correlation_matrix_path, user_preferences=None):
     # 3. Plotly 산점도 생성
     fig = go.Figure()
 
-    # 메뉴 간 연결선을 그리기 위해 모든 상관관계 확인
+    # 메뉴 간 연결선 선택 (임계값보다 상관관계가 높은 메뉴 쌍)
     threshold = 0.5  # 낮은 임계값 설정
-    for i, menu_i in enumerate(correlation_matrix.index):
-        for j, menu_j in enumerate(correlation_matrix.columns):
-            if i < j and correlation_matrix.iloc[i, j] > threshold:
-                fig.add_trace(
-                    go.Scatter(
-                        x=[df_coordinates.loc[menu_i, "x"], df_coordinates.loc[menu_j, "x"]],
-                        y=[df_coordinates.loc[menu_i, "y"], df_coordinates.loc[menu_j, "y"]],
-                        mode="lines",
-                        line=dict(width=0.5, color="lightgray", dash="solid"),
-                        opacity=0.9,  # 연결선 투명도 증가
-                        hoverinfo="none",
-                    )
+    with stage("menu_map.edges"):
+        edge_starts, edge_ends = layout.edges(correlation_matrix.to_numpy(), threshold, max_edges_per_node)
+    x_values = df_coordinates["x"].to_numpy()
+    y_values = df_coordinates["y"].to_numpy()
+    edge_line = dict(width=0.5, color="lightgray", dash="solid")
+
+    if render_mode == "webgl":
+        # 모든 연결선을 NaN으로 구분해 하나의 trace로 묶음 (Plotly는 NaN 좌표에서 선을 끊음)
+        edge_x = np.column_stack([x_values[edge_starts], x_values[edge_ends], np.full(len(edge_starts), np.nan)]).ravel()
+        edge_y = np.column_stack([y_values[edge_starts], y_values[edge_ends], np.full(len(edge_starts), np.nan)]).ravel()
+        fig.add_trace(
+            go.Scattergl(
+                x=edge_x,
+                y=edge_y,
+                mode="lines",
+                line=edge_line,
+                opacity=0.9,
+                hoverinfo="none",
+                connectgaps=False,
+            )
+        )
+    else:
+        for i, j in zip(edge_starts, edge_ends):
+            fig.add_trace(
+                go.Scatter(
+                    x=[x_values[i], x_values[j]],
+                    y=[y_values[i], y_values[j]],
+                    mode="lines",
+                    line=edge_line,
+                    opacity=0.9,  # 연결선 투명도 증가
+                    hoverinfo="none",
                 )
+            )
 
     # 사용자 선호도를 반영한 점 스타일
     marker_sizes = [
@@ -63,14 +97,15 @@ def generate_menu_map(correlation_matrix_path, user_preferences=None):
     ]
 
     # 메뉴 점 추가
+    marker_trace = go.Scattergl if render_mode == "webgl" else go.Scatter
     fig.add_trace(
-        go.Scatter(
+        marker_trace(
             x=df_coordinates["x"],
             y=df_coordinates["y"],
             mode="markers+text",
             text=df_coordinates.index,
             hovertext=[
-                f"메뉴: {menu}<br>유사한 메뉴: {', '.join(correlation_matrix.loc[menu].sort_values(ascending=False)[1:4].index)}"
+                f"메뉴: {menu}<br>유사한 메뉴: {', '.join(neighbor_index.similar_menus(menu, top_k=3))}"
                 + (f"<br><b>사용자 선호 메뉴</b>" if user_preferences and menu in user_preferences and user_preferences[menu] == 4 else "")
                 for menu in df_coordinates.index
             ],
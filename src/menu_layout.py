@@ -0,0 +1,300 @@
+"""
+메뉴 지도의 좌표와 군집을 계산하고 캐시합니다.
+
+지도 배치(PCA 좌표와 KMeans 군집)는 사용자와 무관하고 상관관계 행렬에만 의존하므로,
+상관관계 행렬 버전별로 한 번만 계산해 배열은 .layout.npz 파일로, 메뉴 이름과 버전은 .layout.json 파일로
+저장해 둡니다. 메뉴가 추가되기만 한 경우에는 저장된 PCA 변환과 KMeans 군집 중심으로 새 메뉴만 배치합니다.
+"""
+import hashlib
+import json
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from src.data_store import get_data_store
+from src.file_utils import atomic_write
+
+os.environ["LOKY_MAX_CPU_COUNT"] = "4"
+
+
+def layout_path_for(correlation_matrix_path):
+    """
+    상관관계 행렬 파일에 대응하는 지도 배치 캐시 파일(배열) 경로를 반환합니다.
+    CSV와 바이너리(.npy) 행렬은 버전을 매기는 방식이 다르므로 확장자까지 포함해 파일을 구분합니다.
+    """
+    return correlation_matrix_path + ".layout.npz"
+
+
+def layout_labels_path_for(layout_path):
+    """
+    지도 배치 캐시 파일에 대응하는 메뉴 이름 파일 경로를 반환합니다.
+    """
+    return os.path.splitext(layout_path)[0] + ".json"
+
+
+def _fingerprint(values):
+    # CSV(float64)와 바이너리(float32) 행렬이 같은 지문을 갖도록 float32로 맞춰서 계산
+    return hashlib.md5(np.ascontiguousarray(values, dtype=np.float32).tobytes()).hexdigest()
+
+
+def select_edges(similarities, threshold=0.5, max_edges_per_node=None):
+    """
+    지도에 그릴 메뉴 간 연결선을 벡터 연산으로 선택합니다.
+
+    Args:
+        similarities (np.ndarray): 메뉴×메뉴 유사도 배열.
+        threshold (float): 이 값보다 유사도가 높은 메뉴 쌍만 연결합니다.
+        max_edges_per_node (int): 지정하면 메뉴마다 가장 강한 연결선 k개만 남깁니다.
+            두 메뉴 중 한쪽에서라도 상위 k개에 들면 연결선을 유지합니다.
+
+    Returns:
+        tuple: (시작 메뉴 위치 배열, 끝 메뉴 위치 배열). 항상 시작 < 끝입니다.
+    """
+    candidates = np.asarray(similarities) > threshold
+    np.fill_diagonal(candidates, False)
+
+    if max_edges_per_node is not None and max_edges_per_node < len(candidates) - 1:
+        masked = np.where(candidates, similarities, -np.inf)
+        strongest = np.argpartition(-masked, max_edges_per_node - 1, axis=1)[:, :max_edges_per_node]
+        keep = np.zeros_like(candidates)
+        np.put_along_axis(keep, strongest, True, axis=1)
+        candidates &= keep | keep.T
+
+    return np.nonzero(np.triu(candidates, k=1))
+
+
+class MenuLayout:
+    """
+    메뉴별 2D 좌표와 군집 번호, 그리고 새 메뉴 배치에 사용할 PCA 변환과 KMeans 군집 중심입니다.
+    """
+
+    def __init__(self, menus, pca_mean, pca_components, cluster_centers, coordinates, clusters, fitted_menus,
+                 fingerprint, version=None):
+        """
+        Args:
+            menus (list): 메뉴 이름 리스트.
+            pca_mean (np.ndarray): PCA 학습에 사용한 열별 평균.
+            pca_components (np.ndarray): PCA 주성분 (2 × 학습 메뉴 수).
+            cluster_centers (np.ndarray): KMeans 군집 중심 (군집 수 × 2).
+            coordinates (np.ndarray): 메뉴별 2D 좌표.
+            clusters (np.ndarray): 메뉴별 군집 번호.
+            fitted_menus (list): PCA와 KMeans를 학습할 때 사용한 메뉴 이름 리스트 (menus의 앞부분).
+            fingerprint (str): 학습에 사용한 메뉴 사이 유사도의 지문.
+            version (str): 상관관계 행렬 버전.
+        """
+        self.menus = list(menus)
+        self.pca_mean = pca_mean
+        self.pca_components = pca_components
+        self.cluster_centers = cluster_centers
+        self.coordinates = coordinates
+        self.clusters = clusters
+        self.fitted_menus = list(fitted_menus)
+        self.fingerprint = fingerprint
+        self.version = version
+        self._edges = {}
+
+    @classmethod
+    def fit(cls, correlation_matrix, version=None):
+        """
+        상관관계 행렬 전체로 PCA와 KMeans를 학습합니다.
+
+        Args:
+            correlation_matrix (pd.DataFrame): 메뉴 상관관계 행렬.
+            version (str): 상관관계 행렬 버전.
+
+        Returns:
+            MenuLayout: 학습된 배치.
+        """
+        # sklearn은 가져오는 데 시간이 걸리므로 배치를 새로 학습할 때만 import
+        from sklearn.cluster import KMeans
+        from sklearn.decomposition import PCA
+
+        values = correlation_matrix.to_numpy()
+
+        # 1. 차원 축소 (PCA를 사용해 2D 좌표 생성)
+        pca = PCA(n_components=2)
+        coordinates = pca.fit_transform(values)
+
+        # 2. 군집화
+        kmeans = KMeans(n_clusters=5, random_state=0).fit(coordinates)
+        menus = correlation_matrix.index
+        return cls(
+            menus, pca.mean_, pca.components_, kmeans.cluster_centers_, coordinates, kmeans.labels_, menus,
+            _fingerprint(values), version,
+        )
+
+    def _transform(self, values):
+        # PCA.transform과 같은 계산 (whiten을 사용하지 않으므로 평균을 빼고 주성분에 투영)
+        return (values - self.pca_mean) @ self.pca_components.T
+
+    def _predict(self, coordinates):
+        # KMeans.predict와 같은 계산 (가장 가까운 군집 중심)
+        distances = ((coordinates[:, np.newaxis, :] - self.cluster_centers[np.newaxis, :, :]) ** 2).sum(axis=2)
+        return distances.argmin(axis=1).astype(self.clusters.dtype)
+
+    def extend(self, correlation_matrix, version=None):
+        """
+        저장된 PCA 변환과 KMeans로 학습에 쓰이지 않은 메뉴만 배치합니다. 학습에 쓰인 메뉴 사이의 유사도가
+        바뀌었거나 그 메뉴가 삭제되었다면 다시 학습해야 하므로 None을 반환합니다.
+
+        Args:
+            correlation_matrix (pd.DataFrame): 새 메뉴가 추가된 상관관계 행렬.
+            version (str): 상관관계 행렬 버전.
+
+        Returns:
+            MenuLayout | None: 확장된 배치.
+        """
+        positions = correlation_matrix.index.get_indexer(self.fitted_menus)
+        if (positions < 0).any():
+            return None
+        values = correlation_matrix.to_numpy()
+        if _fingerprint(values[np.ix_(positions, positions)]) != self.fingerprint:
+            return None
+
+        # 학습된 메뉴는 저장된 좌표를 그대로 쓰고, 나머지 메뉴는 저장된 변환으로 배치
+        n_fitted = len(self.fitted_menus)
+        new_positions = np.setdiff1d(np.arange(len(correlation_matrix)), positions)
+        if len(new_positions) > 0:
+            new_coordinates = self._transform(values[np.ix_(new_positions, positions)])
+            new_clusters = self._predict(new_coordinates)
+        else:
+            new_coordinates = np.empty((0, 2))
+            new_clusters = np.empty(0, dtype=self.clusters.dtype)
+
+        menus = self.fitted_menus + correlation_matrix.index[new_positions].tolist()
+        coordinates = np.vstack([self.coordinates[:n_fitted], new_coordinates])
+        clusters = np.concatenate([self.clusters[:n_fitted], new_clusters])
+        return MenuLayout(
+            menus, self.pca_mean, self.pca_components, self.cluster_centers, coordinates, clusters,
+            self.fitted_menus, self.fingerprint, version,
+        )
+
+    def to_frame(self):
+        """
+        좌표와 군집을 DataFrame으로 반환합니다.
+
+        Returns:
+            pd.DataFrame: x, y, cluster 열을 가지는 메뉴별 데이터.
+        """
+        df_coordinates = pd.DataFrame(self.coordinates, columns=["x", "y"], index=self.menus)
+        df_coordinates["cluster"] = self.clusters
+        return df_coordinates
+
+    def reindexed(self, menus):
+        """
+        좌표와 군집을 주어진 메뉴 순서로 정렬해서 반환합니다.
+
+        Args:
+            menus (pd.Index): 메뉴 이름 순서 (보통 상관관계 행렬의 인덱스).
+
+        Returns:
+            pd.DataFrame: x, y, cluster 열을 가지는 메뉴별 데이터.
+        """
+        return self.to_frame().loc[menus]
+
+    def edges(self, similarities, threshold, max_edges_per_node):
+        """
+        select_edges 결과를 파라미터별로 캐시합니다. 배치는 상관관계 행렬 버전마다 새로 만들어지므로
+        같은 배치에서는 연결선도 바뀌지 않습니다.
+        """
+        key = (threshold, max_edges_per_node)
+        if key not in self._edges:
+            self._edges[key] = select_edges(similarities, threshold, max_edges_per_node)
+        return self._edges[key]
+
+    def save(self, layout_path):
+        """
+        배치를 배열 파일(.npz)과 메뉴 이름 파일(.json)로 원자적으로 저장합니다.
+        두 파일이 서로 다른 시점의 배치가 되지 않도록 양쪽에 버전을 기록하고, 불러올 때 비교합니다.
+        """
+        with atomic_write(layout_path, mode="wb") as f:
+            np.savez(
+                f,
+                pca_mean=self.pca_mean,
+                pca_components=self.pca_components,
+                cluster_centers=self.cluster_centers,
+                coordinates=self.coordinates,
+                clusters=self.clusters,
+                version=np.array(self.version or ""),
+            )
+        with atomic_write(layout_labels_path_for(layout_path)) as f:
+            json.dump(
+                {
+                    "menus": self.menus,
+                    "fitted_menus": self.fitted_menus,
+                    "fingerprint": self.fingerprint,
+                    "version": self.version,
+                },
+                f,
+                ensure_ascii=False,
+            )
+
+    @classmethod
+    def load(cls, layout_path):
+        """
+        저장된 배치를 불러옵니다. 파일이 없거나, 읽을 수 없거나, 두 파일이 맞지 않으면 None을 반환합니다.
+        """
+        try:
+            with open(layout_labels_path_for(layout_path), encoding="utf-8") as f:
+                labels = json.load(f)
+            with np.load(layout_path, allow_pickle=False) as arrays:
+                arrays = {key: arrays[key] for key in arrays.files}
+            layout = cls(
+                labels["menus"], arrays["pca_mean"], arrays["pca_components"], arrays["cluster_centers"],
+                arrays["coordinates"], arrays["clusters"], labels["fitted_menus"], labels["fingerprint"],
+                labels["version"],
+            )
+        except (FileNotFoundError, EOFError, ValueError, KeyError, TypeError, zipfile.BadZipFile):
+            return None
+
+        if (
+            str(arrays["version"]) != (layout.version or "")
+            or len(layout.coordinates) != len(layout.menus)
+            or len(layout.clusters) != len(layout.menus)
+            or layout.pca_components.shape != (2, len(layout.fitted_menus))
+        ):
+            return None
+        return layout
+
+
+def _load_or_build_layout(correlation_matrix_path, correlation_matrix, version):
+    """
+    저장된 배치가 현재 버전이면 그대로 사용하고, 메뉴만 추가된 경우 새 메뉴만 배치하며,
+    그 밖의 경우 다시 학습합니다.
+    """
+    layout_path = layout_path_for(correlation_matrix_path)
+    saved_layout = MenuLayout.load(layout_path)
+    if saved_layout is not None and saved_layout.version == version:
+        return saved_layout
+
+    layout = saved_layout.extend(correlation_matrix, version) if saved_layout is not None else None
+    if layout is None:
+        layout = MenuLayout.fit(correlation_matrix, version)
+    try:
+        layout.save(layout_path)
+    except OSError as e:
+        print(f"메뉴 지도 배치를 저장하지 못했습니다: {e}")
+    return layout
+
+
+def get_menu_layout(correlation_matrix_path):
+    """
+    상관관계 행렬 버전에 맞는 메뉴 지도 배치를 반환합니다.
+    같은 프로세스에서는 메모리에, 프로세스 사이에서는 .layout.npz/.layout.json 파일에 캐시됩니다.
+
+    Args:
+        correlation_matrix_path (str): 메뉴 상관관계 행렬 파일 경로.
+
+    Returns:
+        MenuLayout: 메뉴 지도 배치.
+    """
+    store = get_data_store()
+    correlation_matrix = store.get_correlation_matrix(correlation_matrix_path)
+    version = store.version(correlation_matrix_path)
+    return store.get_derived(
+        "menu_layout",
+        (correlation_matrix_path,),
+        lambda: _load_or_build_layout(correlation_matrix_path, correlation_matrix, version),
+    )
@@ -0,0 +1,72 @@
+import numpy as np
+
+from src.data_store import get_data_store
+
+
+class MenuNeighborIndex:
+    """
+    메뉴별로 다른 메뉴들을 유사도가 높은 순서로 정렬해 둔 인덱스입니다.
+    이웃 목록은 메뉴 이름 대신 정수 위치로 저장되어, 추천 이유나 유사 메뉴를 찾을 때
+    정렬 없이 앞에서부터 걸러내기만 하면 됩니다.
+    """
+
+    def __init__(self, correlation_matrix):
+        """
+        Args:
+            correlation_matrix (pd.DataFrame): 메뉴 상관관계 행렬.
+        """
+        self.menus = correlation_matrix.index.to_numpy(dtype=object)
+        self.positions = {menu: idx for idx, menu in enumerate(self.menus)}
+        self.similarities = correlation_matrix.to_numpy()
+
+        # 행마다 유사도 내림차순으로 정렬된 이웃 위치 (동점이면 원래 순서 유지)
+        self.neighbors = np.argsort(-self.similarities, axis=1, kind="stable").astype(np.int32)
+
+    def top_matches(self, menu_idx, candidate_mask, top_k):
+        """
+        특정 메뉴와 유사도가 높은 순서로 후보 메뉴 중 상위 top_k개의 위치를 반환합니다.
+
+        Args:
+            menu_idx (int): 기준 메뉴 위치.
+            candidate_mask (np.ndarray): 메뉴별 후보 여부 (bool 배열).
+            top_k (int): 반환할 개수.
+
+        Returns:
+            np.ndarray: 후보 메뉴 위치 배열.
+        """
+        ranked = self.neighbors[menu_idx]
+        return ranked[candidate_mask[ranked]][:top_k]
+
+    def similar_menus(self, menu, top_k=3):
+        """
+        특정 메뉴와 가장 유사한 메뉴 이름을 반환합니다. 자기 자신은 제외합니다.
+
+        Args:
+            menu (str): 기준 메뉴 이름.
+            top_k (int): 반환할 메뉴 개수.
+
+        Returns:
+            list: 유사한 메뉴 이름 리스트.
+        """
+        menu_idx = self.positions[menu]
+        ranked = self.neighbors[menu_idx]
+        return self.menus[ranked[ranked != menu_idx][:top_k]].tolist()
+
+
+def get_neighbor_index(correlation_matrix_path):
+    """
+    공유 데이터 저장소에서 메뉴 이웃 인덱스를 가져옵니다. 상관관계 행렬이 바뀐 경우에만 다시 만듭니다.
+
+    Args:
+        correlation_matrix_path (str): 메뉴 상관관계 행렬 파일 경로.
+
+    Returns:
+        MenuNeighborIndex: 메뉴 이웃 인덱스.
+    """
+    store = get_data_store()
+    correlation_matrix = store.get_correlation_matrix(correlation_matrix_path)
+    return store.get_derived(
+        "menu_neighbors",
+        (correlation_matrix_path,),
+        lambda: MenuNeighborIndex(correlation_matrix),
+    )
@@ -0,0 +1,117 @@
+"""
+전처리된 메뉴 데이터의 속성 구조(스키마)와 정규화된 속성 행렬입니다.
+
+속성 열은 "주재료_", "맛 프로파일_"처럼 속성 계열 이름으로 시작하며 계열별로 연속해 있습니다.
+스키마는 계열별 열 범위와 열 합계로 정규화한 메뉴×속성 행렬을 한 번만 계산해 두고,
+사용자 분석에서 열 이름을 매번 다시 훑거나 정규화를 반복하지 않도록 합니다.
+"""
+import numpy as np
+import pandas as pd
+
+from src.data_store import get_data_store
+
+# 속성이 아닌 열
+NON_ATTRIBUTE_COLUMNS = ["메뉴", "분류", "간편성"]
+
+
+class MenuSchema:
+    """
+    메뉴 속성 계열별 열 범위와 정규화된 메뉴×속성 행렬입니다.
+    """
+
+    def __init__(self, menu_data):
+        """
+        Args:
+            menu_data (pd.DataFrame): 전처리된 메뉴 데이터.
+        """
+        attributes = menu_data.drop(columns=NON_ATTRIBUTE_COLUMNS)
+        self.menus = menu_data["메뉴"].tolist()
+        self.attribute_columns = attributes.columns
+
+        # 속성 정규화 (열 합계로 나눔, 합계가 0인 열은 pandas와 같이 NaN)
+        values = attributes.to_numpy(dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.normalized = values / values.sum(axis=0)
+
+        # 속성 계열별 열 범위 ("맛 프로파일_짭짤" → "맛 프로파일")
+        self.family_slices = {}
+        for idx, column in enumerate(self.attribute_columns):
+            family = column.split("_", 1)[0]
+            start = self.family_slices[family].start if family in self.family_slices else idx
+            self.family_slices[family] = slice(start, idx + 1)
+
+    @property
+    def families(self):
+        """
+        속성 계열 이름 리스트입니다.
+        """
+        return list(self.family_slices)
+
+    def family_columns(self, family):
+        """
+        속성 계열에 속한 열 이름을 반환합니다.
+
+        Args:
+            family (str): 속성 계열 이름 (예: "맛 프로파일").
+
+        Returns:
+            pd.Index: 열 이름.
+        """
+        if family not in self.family_slices:
+            raise ValueError(f"속성 계열 '{family}'를 찾을 수 없습니다.")
+        return self.attribute_columns[self.family_slices[family]]
+
+    def menu_mask(self, menus):
+        """
+        메뉴 데이터의 행 중 주어진 메뉴에 해당하는 행을 표시합니다.
+
+        Args:
+            menus (list): 메뉴 이름 리스트.
+
+        Returns:
+            np.ndarray: 메뉴 데이터 행별 bool 배열.
+        """
+        return np.isin(np.asarray(self.menus, dtype=object), list(menus))
+
+    def profiles(self, masks):
+        """
+        메뉴 집합별 평균 정규화 속성을 한 번의 행렬 곱으로 계산합니다.
+        메뉴가 하나도 없는 집합의 결과는 NaN입니다.
+
+        Args:
+            masks (np.ndarray): (집합 수 × 메뉴 데이터 행 수) bool 배열.
+
+        Returns:
+            np.ndarray: (집합 수 × 속성 수) 평균 속성 배열.
+        """
+        masks = np.atleast_2d(masks)
+        counts = masks.sum(axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (masks.astype(float) @ self.normalized) / counts
+
+    def profile(self, menus):
+        """
+        메뉴 집합 하나의 평균 정규화 속성을 반환합니다.
+
+        Args:
+            menus (list): 메뉴 이름 리스트.
+
+        Returns:
+            pd.Series: 속성별 평균 값.
+        """
+        return pd.Series(self.profiles(self.menu_mask(menus))[0], index=self.attribute_columns)
+
+
+def get_menu_schema(menu_file_path):
+    """
+    공유 데이터 저장소에서 메뉴 스키마를 가져옵니다. 메뉴 데이터가 바뀐 경우에만 다시 만듭니다.
+
+    Args:
+        menu_file_path (str): 전처리된 메뉴 데이터 파일 경로.
+
+    Returns:
+        MenuSchema: 메뉴 스키마.
+    """
+    store = get_data_store()
+    menu_data = store.get_menu_data(menu_file_path)
+    return store.get_derived("menu_schema", (menu_file_path,), lambda: MenuSchema(menu_data))
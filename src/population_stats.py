@@ -0,0 +1,297 @@
+"""
+전체 사용자의 메뉴 점수 통계(회사 전체 분석)를 메모리에 모두 올리지 않고 계산합니다.
+
+사용자 데이터 CSV를 바이트 범위(chunk_bytes) 단위로 나누어 각 범위를 독립적으로 읽고,
+범위마다 메뉴별 부분 통계(응답 수, 점수 히스토그램, 평균, 편차 제곱합)를 만든 뒤 합칩니다.
+평균과 분산은 Chan의 병렬 알고리즘으로 합치므로 범위를 나누는 방식과 무관하게 같은 결과가 나오고,
+범위는 작업 프로세스에 나누어 처리할 수 있습니다. 메모리 사용량은 사용자 수가 아니라
+범위 크기 × 동시에 처리하는 범위 수에 비례합니다. 아직 CSV에 합쳐지지 않은 추가 로그 행도 포함합니다.
+
+    python -m src.population_stats --jobs 4 --top 10
+
+범위는 줄 단위로 나누므로 CSV 행 안에 줄바꿈이 없어야 합니다 (사용자 데이터는 이름과 점수만 가짐).
+"""
+import argparse
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.user_store import UserStore
+
+# 점수 범위 (히스토그램 구간)
+SCORES = np.arange(1, 5)
+# 분산의 최댓값 (1점과 4점이 반씩일 때). 양극화 지수를 0~1로 맞추는 데 사용
+MAX_VARIANCE = ((SCORES[-1] - SCORES[0]) / 2) ** 2
+
+
+class PartialStats:
+    """
+    메뉴별 부분 통계입니다. 서로 다른 사용자 묶음의 통계를 merge로 합칠 수 있습니다.
+    """
+
+    def __init__(self, counts, histogram, means, m2):
+        """
+        Args:
+            counts (np.ndarray): 메뉴별 응답 수.
+            histogram (np.ndarray): (메뉴 수 × 점수 수) 점수별 응답 수.
+            means (np.ndarray): 메뉴별 평균 점수 (응답이 없으면 0).
+            m2 (np.ndarray): 메뉴별 평균과의 편차 제곱합.
+        """
+        self.counts = counts
+        self.histogram = histogram
+        self.means = means
+        self.m2 = m2
+
+    @classmethod
+    def empty(cls, n_menus):
+        """
+        사용자가 없는 통계를 만듭니다.
+        """
+        return cls(np.zeros(n_menus, dtype=np.int64), np.zeros((n_menus, len(SCORES)), dtype=np.int64),
+                   np.zeros(n_menus), np.zeros(n_menus))
+
+    @classmethod
+    def from_scores(cls, values):
+        """
+        사용자 × 메뉴 점수 배열로 통계를 만듭니다.
+
+        Args:
+            values (np.ndarray): float 점수 배열 (결측은 NaN).
+
+        Returns:
+            PartialStats: 부분 통계.
+        """
+        answered = ~np.isnan(values)
+        counts = answered.sum(axis=0)
+        histogram = np.stack([(values == score).sum(axis=0) for score in SCORES], axis=1)
+        sums = np.where(answered, values, 0.0).sum(axis=0)
+        means = np.divide(sums, counts, out=np.zeros(len(counts)), where=counts > 0)
+        m2 = np.where(answered, np.square(values - means), 0.0).sum(axis=0)
+        return cls(counts.astype(np.int64), histogram.astype(np.int64), means, m2)
+
+    def merge(self, other):
+        """
+        두 통계를 합친 새 통계를 반환합니다 (Chan의 병렬 평균/분산 합산).
+        """
+        counts = self.counts + other.counts
+        delta = other.means - self.means
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = np.where(counts > 0, self.means + delta * other.counts / counts, 0.0)
+            m2 = self.m2 + other.m2 + np.where(counts > 0, delta ** 2 * self.counts * other.counts / counts, 0.0)
+        return PartialStats(counts, self.histogram + other.histogram, means, m2)
+
+    @property
+    def variances(self):
+        """
+        메뉴별 (모)분산입니다. 응답이 없으면 NaN입니다.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.counts > 0, self.m2 / self.counts, np.nan)
+
+
+def _parse_rows(data, columns):
+    # 헤더 없는 CSV 바이트를 점수 배열로 변환
+    if not data.strip():
+        return np.empty((0, len(columns) - 1))
+    frame = pd.read_csv(io.BytesIO(data), header=None, names=columns)
+    return frame.iloc[:, 1:].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+
+
+def _range_stats(user_file_path, start, stop, columns):
+    """
+    파일의 [start, stop) 바이트 범위에서 시작하는 줄들의 통계를 계산합니다.
+    범위 경계에 걸친 줄은 시작 위치가 속한 범위에서 끝까지 읽습니다.
+    """
+    with open(user_file_path, "rb") as f:
+        f.seek(start - 1)
+        # 이전 범위에서 시작한 줄은 건너뜀 (start 바로 앞이 줄바꿈이면 건너뛸 줄이 없음)
+        f.readline()
+        position = f.tell()
+        if position >= stop:
+            return PartialStats.empty(len(columns) - 1)
+        data = f.read(stop - position) + f.readline()
+    return PartialStats.from_scores(_parse_rows(data, columns))
+
+
+def _byte_ranges(file_size, header_size, chunk_bytes):
+    starts = range(header_size, file_size, chunk_bytes)
+    return [(start, min(start + chunk_bytes, file_size)) for start in starts]
+
+
+def compute_population_stats(user_file_path, chunk_bytes=8 << 20, n_jobs=1, max_attempts=3):
+    """
+    사용자 데이터 전체의 메뉴별 통계를 범위 단위로 계산해 합칩니다.
+
+    Args:
+        user_file_path (str): 사용자 데이터 파일 경로.
+        chunk_bytes (int): 한 범위의 크기(바이트). 범위 하나를 읽는 메모리를 결정합니다.
+        n_jobs (int): 작업 프로세스 수. 1이면 현재 프로세스에서 계산합니다.
+        max_attempts (int): 계산 중 사용자 데이터가 통째로 교체(로그 정리)되었을 때 다시 시도할 횟수.
+
+    Returns:
+        tuple: (메뉴 이름 리스트, PartialStats)
+    """
+    user_store = UserStore(user_file_path)
+    for _ in range(max_attempts):
+        with open(user_file_path, "rb") as f:
+            header = f.readline()
+        columns = pd.read_csv(io.BytesIO(header)).columns.tolist()
+        menus = columns[1:]
+        # 지금 시점의 파일 크기까지만 읽음 (이후에 끝에 추가된 행은 다음 계산에 포함)
+        file_stat = os.stat(user_file_path)
+        pending_rows = user_store.pending_rows()
+        ranges = _byte_ranges(file_stat.st_size, len(header), chunk_bytes)
+
+        stats = PartialStats.empty(len(menus))
+        if n_jobs == 1 or len(ranges) <= 1:
+            for start, stop in ranges:
+                stats = stats.merge(_range_stats(user_file_path, start, stop, columns))
+        else:
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(ranges))) as executor:
+                # 결과를 받는 대로 합치므로 동시에 메모리에 있는 부분 통계는 작업 수 정도
+                for partial in executor.map(
+                    _range_stats,
+                    [user_file_path] * len(ranges),
+                    [start for start, _ in ranges],
+                    [stop for _, stop in ranges],
+                    [columns] * len(ranges),
+                ):
+                    stats = stats.merge(partial)
+
+        # 로그 정리로 파일이 교체되었다면 다른 파일을 섞어 읽었을 수 있으므로 다시 계산
+        if os.stat(user_file_path).st_ino != file_stat.st_ino:
+            continue
+        if pending_rows:
+            log_values = pd.DataFrame(pending_rows).reindex(columns=menus)
+            stats = stats.merge(PartialStats.from_scores(
+                log_values.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+            ))
+        return menus, stats
+    raise RuntimeError("사용자 데이터가 계산 중에 계속 바뀌어 통계를 계산하지 못했습니다.")
+
+
+class PopulationSummary:
+    """
+    전체 사용자의 메뉴별, 분류별 점수 통계입니다.
+    """
+
+    def __init__(self, menus, stats, menu_categories=None):
+        """
+        Args:
+            menus (list): 메뉴 이름 리스트.
+            stats (PartialStats): 메뉴별 통계.
+            menu_categories (dict): {메뉴: 분류}. 없으면 분류별 통계를 만들지 않습니다.
+        """
+        counts = stats.counts
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shares = stats.histogram / counts[:, None]
+        variances = stats.variances
+        self.menu_summary = pd.DataFrame(
+            {
+                "응답 수": counts,
+                "평균": np.where(counts > 0, stats.means, np.nan),
+                "표준편차": np.sqrt(variances),
+                **{f"{score}점 비율": shares[:, idx] for idx, score in enumerate(SCORES)},
+                # 0이면 모두 같은 점수, 1이면 1점과 4점으로 반씩 갈림
+                "양극화 지수": variances / MAX_VARIANCE,
+            },
+            index=pd.Index(menus, name="메뉴"),
+        )
+
+        self.category_summary = None
+        if menu_categories is not None:
+            categories = pd.Series([menu_categories.get(menu) for menu in menus], index=menus)
+            histogram = pd.DataFrame(stats.histogram, index=menus, columns=SCORES).groupby(categories).sum()
+            category_counts = histogram.sum(axis=1)
+            self.category_summary = pd.DataFrame(
+                {
+                    "응답 수": category_counts,
+                    "평균": (histogram * SCORES).sum(axis=1) / category_counts,
+                    **{f"{score}점 비율": histogram[score] / category_counts for score in SCORES},
+                }
+            )
+            self.category_summary.index.name = "분류"
+
+    def most_loved(self, top_k=10):
+        """
+        4점 비율이 높은 메뉴를 반환합니다.
+        """
+        return self.menu_summary.sort_values(["4점 비율", "평균"], ascending=False).head(top_k)
+
+    def most_disliked(self, top_k=10):
+        """
+        1점 비율이 높은 메뉴를 반환합니다.
+        """
+        return self.menu_summary.sort_values(["1점 비율", "평균"], ascending=[False, True]).head(top_k)
+
+    def polarizing(self, top_k=10):
+        """
+        호불호가 크게 갈리는(양극화 지수가 높은) 메뉴를 반환합니다.
+        """
+        return self.menu_summary.sort_values("양극화 지수", ascending=False).head(top_k)
+
+    def to_dict(self, top_k=10):
+        """
+        JSON으로 저장할 수 있는 요약을 반환합니다.
+        """
+        def records(frame):
+            return json.loads(frame.reset_index().to_json(orient="records", force_ascii=False))
+
+        return {
+            "most_loved": records(self.most_loved(top_k)),
+            "most_disliked": records(self.most_disliked(top_k)),
+            "polarizing": records(self.polarizing(top_k)),
+            "categories": records(self.category_summary) if self.category_summary is not None else None,
+        }
+
+
+def summarize_population(user_file_path, menu_file_path=None, chunk_bytes=8 << 20, n_jobs=1):
+    """
+    전체 사용자의 점수 통계 요약을 만듭니다.
+
+    Args:
+        user_file_path (str): 사용자 데이터 파일 경로.
+        menu_file_path (str): 전처리된 메뉴 데이터 파일 경로 (분류별 통계에 사용). None이면 생략합니다.
+        chunk_bytes (int): 한 번에 읽을 범위 크기(바이트).
+        n_jobs (int): 작업 프로세스 수.
+
+    Returns:
+        PopulationSummary: 통계 요약.
+    """
+    menus, stats = compute_population_stats(user_file_path, chunk_bytes, n_jobs)
+    menu_categories = None
+    if menu_file_path is not None:
+        menu_data = pd.read_csv(menu_file_path, usecols=["메뉴", "분류"])
+        menu_categories = dict(zip(menu_data["메뉴"], menu_data["분류"]))
+    return PopulationSummary(menus, stats, menu_categories)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="전체 사용자의 메뉴 점수 통계를 계산합니다.")
+    parser.add_argument("--users-file", default="data/processed_user_data.csv", help="사용자 데이터 파일 경로")
+    parser.add_argument("--menu", default="data/processed_menu_details.csv", help="전처리된 메뉴 데이터 파일 경로")
+    parser.add_argument("--chunk-mb", type=float, default=8, help="한 번에 읽을 범위 크기(MB)")
+    parser.add_argument("--jobs", type=int, default=1, help="작업 프로세스 수")
+    parser.add_argument("--top", type=int, default=10, help="목록마다 보여줄 메뉴 수")
+    parser.add_argument("--output", default=None, help="요약을 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    summary = summarize_population(args.users_file, args.menu, int(args.chunk_mb * (1 << 20)), args.jobs)
+    for title, frame in [
+        ("가장 사랑받는 메뉴 (4점 비율)", summary.most_loved(args.top)),
+        ("가장 기피하는 메뉴 (1점 비율)", summary.most_disliked(args.top)),
+        ("호불호가 갈리는 메뉴 (양극화 지수)", summary.polarizing(args.top)),
+    ]:
+        print(f"\n[{title}]")
+        print(frame.round(3).to_string())
+    if summary.category_summary is not None:
+        print("\n[분류별 점수 분포]")
+        print(summary.category_summary.round(3).to_string())
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary.to_dict(args.top), f, ensure_ascii=False, indent=2)
+        print(f"\n요약을 {args.output}에 저장했습니다.")
@@ -0,0 +1,219 @@
+"""
+단계별 실행 시간과 메모리 사용량 계측입니다.
+
+환경 변수 MENUMATE_PROFILE=1 로 실행하거나 코드에서 enable()을 호출하면 켜집니다.
+MENUMATE_PROFILE_OUTPUT=<경로>를 함께 주면 프로그램이 끝날 때 결과를 저장합니다
+(.json이면 JSON 요약, 그 밖에는 Prometheus 텍스트 형식).
+
+    with stage("recommend.load"):
+        ...
+
+단계마다 호출 횟수, 누적/최대 실행 시간, tracemalloc 기준 최대 메모리 증가량을 기록합니다.
+꺼져 있으면 stage()는 미리 만들어 둔 빈 컨텍스트를 반환하므로 비용이 거의 없습니다.
+tracemalloc의 최대 사용량은 프로세스 전체 기준이므로, 여러 스레드가 동시에 계측하면 메모리 값은 근사치입니다.
+"""
+import atexit
+import contextlib
+import functools
+import json
+import os
+import re
+import threading
+import time
+import tracemalloc
+
+from src.file_utils import atomic_write
+
+_enabled = False
+_trace_memory = False
+_started_tracing = False  # 이 모듈이 tracemalloc을 시작했는지 (disable에서 이 경우에만 멈춤)
+_stats = {}
+_stats_lock = threading.Lock()
+_local = threading.local()
+_NOOP = contextlib.nullcontext()
+
+
+def enable(memory=True):
+    """
+    계측을 켭니다.
+
+    Args:
+        memory (bool): True이면 tracemalloc으로 단계별 최대 메모리 증가량도 기록합니다.
+    """
+    global _enabled, _trace_memory, _started_tracing
+    _trace_memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracing = True
+    _enabled = True
+
+
+def disable():
+    """
+    계측을 끕니다. 기록된 값은 유지됩니다.
+    tracemalloc은 enable()이 시작한 경우에만 멈추고, 다른 코드가 먼저 시작했으면 그대로 둡니다.
+    """
+    global _enabled, _started_tracing
+    _enabled = False
+    if _started_tracing and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _started_tracing = False
+
+
+def is_enabled():
+    """
+    계측이 켜져 있는지 반환합니다.
+    """
+    return _enabled
+
+
+def reset():
+    """
+    기록된 값을 모두 지웁니다.
+    """
+    with _stats_lock:
+        _stats.clear()
+
+
+class _Stage:
+    """
+    한 단계의 실행 시간과 메모리를 측정하는 컨텍스트입니다.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.child_peak = 0
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self.memory = _trace_memory and tracemalloc.is_tracing()
+        if self.memory:
+            self.start_memory = tracemalloc.get_traced_memory()[0]
+            # 바깥 단계의 최대값을 잃지 않도록 지금까지의 최대값을 먼저 넘겨줌
+            if len(stack) > 1:
+                stack[-2].child_peak = max(stack[-2].child_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = time.perf_counter() - self.start_time
+        peak = 0
+        if self.memory and tracemalloc.is_tracing():
+            absolute_peak = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+            peak = max(0, absolute_peak - self.start_memory)
+        stack = _local.stack
+        stack.pop()
+        if stack and self.memory:
+            stack[-1].child_peak = max(stack[-1].child_peak, self.start_memory + peak)
+
+        with _stats_lock:
+            entry = _stats.setdefault(
+                self.name, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "peak_memory_bytes": 0}
+            )
+            entry["count"] += 1
+            entry["total_seconds"] += elapsed
+            entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+            entry["peak_memory_bytes"] = max(entry["peak_memory_bytes"], peak)
+        return False
+
+
+def stage(name):
+    """
+    단계를 계측하는 컨텍스트를 반환합니다. 계측이 꺼져 있으면 아무것도 하지 않습니다.
+
+    Args:
+        name (str): 단계 이름 (예: "recommend.load").
+
+    Returns:
+        컨텍스트 매니저.
+    """
+    if not _enabled:
+        return _NOOP
+    return _Stage(name)
+
+
+def profiled(name):
+    """
+    함수 전체를 하나의 단계로 계측하는 데코레이터입니다.
+
+    Args:
+        name (str): 단계 이름.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def summary():
+    """
+    단계별 기록을 반환합니다.
+
+    Returns:
+        dict: {단계 이름: {"count", "total_seconds", "mean_seconds", "max_seconds", "peak_memory_bytes"}}
+    """
+    with _stats_lock:
+        return {
+            name: {**entry, "mean_seconds": entry["total_seconds"] / entry["count"]}
+            for name, entry in sorted(_stats.items())
+        }
+
+
+def to_prometheus():
+    """
+    단계별 기록을 Prometheus 텍스트 형식으로 반환합니다.
+
+    Returns:
+        str: Prometheus 텍스트.
+    """
+    metrics = [
+        ("menumate_stage_calls_total", "counter", "단계 호출 횟수", "count"),
+        ("menumate_stage_seconds_total", "counter", "단계 누적 실행 시간(초)", "total_seconds"),
+        ("menumate_stage_seconds_max", "gauge", "단계 최대 실행 시간(초)", "max_seconds"),
+        ("menumate_stage_peak_memory_bytes", "gauge", "단계 최대 메모리 증가량(바이트)", "peak_memory_bytes"),
+    ]
+    stats = summary()
+    lines = []
+    for metric, metric_type, description, key in metrics:
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} {metric_type}")
+        for name, entry in stats.items():
+            label = re.sub(r'(["\\\\])', r"\\\1", name)
+            lines.append(f'{metric}{{stage="{label}"}} {entry[key]}')
+    return "\n".join(lines) + "\n"
+
+
+def dump(path):
+    """
+    기록을 파일로 저장합니다. 확장자가 .json이면 JSON 요약, 그 밖에는 Prometheus 텍스트로 저장합니다.
+
+    Args:
+        path (str): 저장할 파일 경로.
+    """
+    with atomic_write(path) as f:
+        if path.endswith(".json"):
+            json.dump(summary(), f, ensure_ascii=False, indent=2)
+        else:
+            f.write(to_prometheus())
+
+
+def _dump_at_exit(path):
+    try:
+        dump(path)
+    except OSError as e:
+        print(f"계측 결과를 저장하지 못했습니다: {e}")
+
+
+if os.environ.get("MENUMATE_PROFILE", "").lower() not in ("", "0", "false", "no"):
+    enable()
+    if os.environ.get("MENUMATE_PROFILE_OUTPUT"):
+        atexit.register(_dump_at_exit, os.environ["MENUMATE_PROFILE_OUTPUT"])
@@ -0,0 +1,292 @@
+"""
+여러 사용자의 개인 취향 레포트를 화면 없이 파일(PNG/SVG/HTML)로 일괄 생성합니다.
+
+실행 방법:
+    python -m src.report_renderer --output reports --formats png,html --jobs 4
+
+차트는 pyplot을 거치지 않고 matplotlib Figure 객체에 직접 그리므로 창을 띄우지 않고(Agg),
+사용자들을 작업 프로세스에 나누어 병렬로 그립니다. 사용자 점수 행과 메뉴 데이터 버전의 해시를
+manifest.json에 기록해 두고, 해시가 같고 파일이 남아 있는 사용자는 다시 그리지 않습니다.
+"""
+import argparse
+import hashlib
+import html
+import io
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from matplotlib.figure import Figure
+
+from src.data_store import get_data_store
+from src.file_utils import atomic_write
+from src.menu_schema import get_menu_schema
+from src.user_analysis import UserAnalysis
+from src.user_matrix import get_user_matrix
+from src.visualizations import draw_taste_bars, draw_taste_radar, set_korean_font, taste_report_data
+
+# 레포트 모양이 바뀌면 값을 올려 기존 캐시를 무효화
+RENDERER_VERSION = 1
+SUPPORTED_FORMATS = ("png", "svg", "html")
+
+# 작업 프로세스에서 사용하는 데이터 파일 경로
+_worker_paths = None
+
+
+def _file_stem(user_name):
+    # 파일 이름에 쓸 수 없는 문자를 '_'로 바꿈
+    return re.sub(r'[\\/:*?"<>|\s]', "_", user_name)
+
+
+def report_hash(user_matrix, user_name, menu_version, formats, top_k):
+    """
+    사용자 점수 행, 메뉴 데이터 버전, 출력 형식, 차트의 상위 속성 개수로 레포트 캐시 키를 만듭니다.
+
+    Returns:
+        str: 16진수 해시 문자열.
+    """
+    row = user_matrix.row(user_name)
+    digest = hashlib.md5()
+    digest.update(user_matrix.scores[row].tobytes())
+    digest.update(user_matrix.missing_bits[row].tobytes())
+    digest.update(f"{menu_version}|{','.join(formats)}|{top_k}|{RENDERER_VERSION}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def build_report_figures(user_name, analysis_results, taste_profile_columns, top_k=10):
+    """
+    바 차트와 레이더 차트 Figure를 만듭니다. pyplot을 사용하지 않으므로 창이 뜨지 않습니다.
+
+    Returns:
+        tuple: (바 차트 Figure, 레이더 차트 Figure)
+    """
+    taste_profile_data, category_counts = taste_report_data(analysis_results, taste_profile_columns, top_k)
+
+    bar_figure = Figure(figsize=(16, 6))
+    draw_taste_bars(bar_figure.subplots(1, 2), user_name, taste_profile_data, category_counts)
+    bar_figure.tight_layout()
+
+    radar_figure = Figure(figsize=(7, 7))
+    draw_taste_radar(radar_figure.add_subplot(polar=True), user_name, taste_profile_data)
+    radar_figure.tight_layout()
+    return bar_figure, radar_figure
+
+
+def _figure_svg(figure):
+    # Figure는 이미 tight_layout으로 배치했으므로 bbox_inches="tight"로 다시 계산하지 않음
+    buffer = io.StringIO()
+    figure.savefig(buffer, format="svg")
+    return buffer.getvalue()
+
+
+def _report_html(user_name, analysis_results, bar_svg, radar_svg):
+    # 이메일로 보낼 수 있도록 차트를 SVG로 넣은 단일 HTML 파일
+    def menu_list(menus):
+        items = "".join(f"<li>{html.escape(menu)}</li>" for menu in menus)
+        return f"<ul>{items}</ul>" if items else "<p>없습니다.</p>"
+
+    name = html.escape(user_name)
+    return (
+        "<!DOCTYPE html>\n<html lang=\"ko\">\n<head><meta charset=\"utf-8\">"
+        f"<title>{name}님의 취향 레포트</title></head>\n<body>\n"
+        f"<h1>{name}님의 취향 레포트</h1>\n"
+        f"<h2>선호하는 메뉴</h2>\n{menu_list(analysis_results['favorite_menus'])}\n"
+        f"<h2>기피하는 메뉴</h2>\n{menu_list(analysis_results['disliked_menus'])}\n"
+        f"<h2>맛과 메뉴 분류</h2>\n{bar_svg}\n{radar_svg}\n"
+        "</body>\n</html>\n"
+    )
+
+
+def render_user_report(user_name, output_dir, formats, menu_file_path, user_file_path, top_k=10):
+    """
+    사용자 한 명의 레포트를 파일로 저장합니다.
+
+    Args:
+        user_name (str): 사용자 이름.
+        output_dir (str): 저장할 폴더.
+        formats (tuple): 출력 형식 ("png", "svg", "html" 중).
+        menu_file_path (str): 전처리된 메뉴 데이터 파일 경로.
+        user_file_path (str): 사용자 데이터 파일 경로.
+        top_k (int): 차트에 표시할 상위 속성 개수.
+
+    Returns:
+        list: 저장한 파일 이름 리스트.
+    """
+    store = get_data_store()
+    menu_schema = get_menu_schema(menu_file_path)
+    user_analysis = UserAnalysis(
+        store.get_menu_data(menu_file_path),
+        None,
+        get_user_matrix(user_file_path),
+        menu_schema,
+    )
+    analysis_results = user_analysis.analyze_user(user_name)
+    bar_figure, radar_figure = build_report_figures(
+        user_name, analysis_results, menu_schema.family_columns("맛 프로파일"), top_k
+    )
+
+    stem = _file_stem(user_name)
+    figures = {"bars": bar_figure, "radar": radar_figure}
+    svgs = {}
+    files = []
+    for file_format in formats:
+        if file_format == "png":
+            for suffix, figure in figures.items():
+                file_name = f"{stem}_{suffix}.png"
+                with atomic_write(os.path.join(output_dir, file_name), mode="wb") as f:
+                    figure.savefig(f, format="png")
+                files.append(file_name)
+            continue
+
+        # SVG는 svg 파일과 html 레포트에서 함께 쓰므로 한 번만 그림
+        if not svgs:
+            svgs = {suffix: _figure_svg(figure) for suffix, figure in figures.items()}
+        if file_format == "svg":
+            for suffix, svg in svgs.items():
+                file_name = f"{stem}_{suffix}.svg"
+                with atomic_write(os.path.join(output_dir, file_name)) as f:
+                    f.write(svg)
+                files.append(file_name)
+        else:
+            file_name = f"{stem}.html"
+            with atomic_write(os.path.join(output_dir, file_name)) as f:
+                f.write(_report_html(user_name, analysis_results, svgs["bars"], svgs["radar"]))
+            files.append(file_name)
+    return files
+
+
+def _init_worker(menu_file_path, user_file_path):
+    global _worker_paths
+    _worker_paths = (menu_file_path, user_file_path)
+    set_korean_font()
+
+
+def _render_one(user_name, output_dir, formats, menu_file_path, user_file_path, top_k):
+    # 한 사용자의 실패가 전체 작업을 멈추지 않도록 오류를 결과로 돌려줌
+    try:
+        return user_name, render_user_report(user_name, output_dir, formats, menu_file_path, user_file_path, top_k), None
+    except Exception as e:
+        return user_name, [], str(e)
+
+
+def _render_worker(user_name, output_dir, formats, top_k):
+    return _render_one(user_name, output_dir, formats, *_worker_paths, top_k)
+
+
+def _load_manifest(manifest_path):
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def render_reports(menu_file_path, user_file_path, output_dir, user_names=None, formats=("png",), n_jobs=None, top_k=10):
+    """
+    여러 사용자의 레포트를 작업 프로세스에 나누어 생성합니다.
+    이전 실행 이후 점수와 메뉴 데이터가 바뀌지 않았고 파일이 남아 있는 사용자는 건너뜁니다.
+
+    Args:
+        menu_file_path (str): 전처리된 메뉴 데이터 파일 경로.
+        user_file_path (str): 사용자 데이터 파일 경로.
+        output_dir (str): 저장할 폴더. 없으면 만듭니다.
+        user_names (list): 레포트를 만들 사용자 이름. None이면 이름이 있는 모든 사용자.
+        formats (tuple): 출력 형식 ("png", "svg", "html" 중).
+        n_jobs (int): 작업 프로세스 수. None이면 CPU 수, 1이면 현재 프로세스에서 그립니다.
+        top_k (int): 차트에 표시할 상위 속성 개수.
+
+    Returns:
+        dict: {"rendered": 새로 만든 사용자, "skipped": 건너뛴 사용자, "failed": {사용자: 오류 메시지}}
+    """
+    formats = tuple(formats)
+    unsupported = [file_format for file_format in formats if file_format not in SUPPORTED_FORMATS]
+    if unsupported:
+        raise ValueError(f"지원하지 않는 형식입니다: {', '.join(unsupported)}")
+
+    store = get_data_store()
+    store.get_menu_data(menu_file_path)
+    menu_version = store.version(menu_file_path)
+    user_matrix = get_user_matrix(user_file_path)
+    if user_names is None:
+        user_names = list(user_matrix.name_to_row)
+
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, "manifest.json")
+    manifest = _load_manifest(manifest_path)
+
+    # 해시가 같고 파일이 모두 남아 있으면 건너뜀
+    result = {"rendered": [], "skipped": [], "failed": {}}
+    hashes, pending = {}, []
+    for user_name in user_names:
+        if user_name not in user_matrix:
+            result["failed"][user_name] = f"사용자 '{user_name}'를 데이터에서 찾을 수 없습니다."
+            continue
+        hashes[user_name] = report_hash(user_matrix, user_name, menu_version, formats, top_k)
+        entry = manifest.get(user_name)
+        if (
+            entry is not None
+            and entry["hash"] == hashes[user_name]
+            and all(os.path.exists(os.path.join(output_dir, file_name)) for file_name in entry["files"])
+        ):
+            result["skipped"].append(user_name)
+        else:
+            pending.append(user_name)
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1 or len(pending) <= 1:
+        outcomes = [
+            _render_one(user_name, output_dir, formats, menu_file_path, user_file_path, top_k) for user_name in pending
+        ]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(n_jobs, len(pending)),
+            initializer=_init_worker,
+            initargs=(menu_file_path, user_file_path),
+        ) as executor:
+            chunk_size = max(1, len(pending) // (n_jobs * 4))
+            outcomes = list(executor.map(
+                _render_worker,
+                pending,
+                [output_dir] * len(pending),
+                [formats] * len(pending),
+                [top_k] * len(pending),
+                chunksize=chunk_size,
+            ))
+
+    for user_name, files, error in outcomes:
+        if error is not None:
+            result["failed"][user_name] = error
+            continue
+        manifest[user_name] = {"hash": hashes[user_name], "files": files}
+        result["rendered"].append(user_name)
+
+    with atomic_write(manifest_path) as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="개인 취향 레포트를 파일로 일괄 생성합니다.")
+    parser.add_argument("--menu", default="data/processed_menu_details.csv", help="전처리된 메뉴 데이터 파일 경로")
+    parser.add_argument("--users-file", default="data/processed_user_data.csv", help="사용자 데이터 파일 경로")
+    parser.add_argument("--output", default="reports", help="레포트를 저장할 폴더")
+    parser.add_argument("--users", default=None, help="','로 구분한 사용자 이름 (기본값: 전체 사용자)")
+    parser.add_argument("--formats", default="png", help="','로 구분한 출력 형식 (png, svg, html)")
+    parser.add_argument("--jobs", type=int, default=None, help="작업 프로세스 수 (기본값: CPU 수)")
+    args = parser.parse_args()
+
+    summary = render_reports(
+        args.menu,
+        args.users_file,
+        args.output,
+        user_names=args.users.split(",") if args.users else None,
+        formats=args.formats.split(","),
+        n_jobs=args.jobs,
+    )
+    print(
+        f"레포트 생성 완료: 새로 생성 {len(summary['rendered'])}명, "
+        f"변경 없음 {len(summary['skipped'])}명, 실패 {len(summary['failed'])}명"
+    )
+    for user_name, error in summary["failed"].items():
+        print(f"  - {user_name}: {error}")
@@ -0,0 +1,401 @@
+"""
+여러 작업 프로세스가 메뉴 상관관계 행렬과 사용자 행렬을 공유 메모리로 함께 쓰는 모드입니다.
+
+게시 프로세스(SharedDataPublisher) 하나가 파일을 읽어 배열과 메뉴/사용자 이름을
+multiprocessing.shared_memory 블록에 올리고, 작업 프로세스는 use_shared_data로 블록을 복사 없이
+(읽기 전용으로 매핑해서) 사용합니다. 작업 프로세스가 늘어도 배열은 한 벌만 메모리에 있고,
+작업 프로세스 시작 시에는 CSV를 읽지 않습니다.
+
+    python -m src.shared_data --name menumate --interval 30      # 게시 프로세스
+    python -m app.server --shared-data menumate --reuse-port     # 작업 프로세스 (여러 개 실행)
+
+제어 블록(<name>)에는 세대 번호와 현재 세대의 블록 목록(JSON)이 들어 있습니다.
+데이터가 바뀌면 새 블록을 만든 뒤 제어 블록의 세대 번호를 올리고, 작업 프로세스는 요청마다
+세대 번호만 읽어 바뀌었을 때 새 블록으로 넘어갑니다. 바뀌지 않은 파일의 블록은 다음 세대에서도 재사용합니다.
+제어 블록은 순서 번호(seqlock)로 보호되므로 게시 프로세스는 하나만 실행해야 합니다.
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+
+if os.name == "posix":
+    import _posixshmem  # SharedMemory가 내부에서 쓰는 shm_open (리소스 추적 없이 블록을 열기 위해 사용)
+
+import numpy as np
+import pandas as pd
+
+from src.correlation_binary import mapped_correlation_matrix_path
+from src.data_store import DataStore, get_data_store
+from src.user_matrix import UserMatrix
+
+# 제어 블록 크기와 머리말 (순서 번호, 세대 번호, 블록 목록 JSON 길이)
+CONTROL_SIZE = 1 << 16
+_HEADER = struct.Struct("<QQQ")
+
+
+def _map_readonly(name, size):
+    """
+    공유 메모리 블록을 읽기 전용으로 매핑합니다. 반환된 매핑은 그 위에 만든 배열이 모두 사라지면 해제됩니다.
+    SharedMemory로 연결하면 연결한 프로세스가 종료될 때 리소스 추적기가 블록을 지울 수 있으므로
+    (Python 3.12 이하) 블록을 직접 열어 매핑합니다. 블록은 게시 프로세스가 관리합니다.
+    """
+    if os.name == "nt":
+        return mmap.mmap(-1, size, tagname=name, access=mmap.ACCESS_READ)
+    fd = _posixshmem.shm_open("/" + name, os.O_RDONLY, mode=0o600)
+    try:
+        return mmap.mmap(fd, size, access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)
+
+
+def _create_block(data):
+    """
+    배열 또는 바이트를 담은 새 공유 메모리 블록을 만듭니다.
+
+    Returns:
+        tuple: (SharedMemory, 블록 정보 dict)
+    """
+    if isinstance(data, np.ndarray):
+        data = np.ascontiguousarray(data)
+        info = {"dtype": data.dtype.str, "shape": list(data.shape)}
+        payload = data.view(np.uint8).reshape(-1)
+    else:
+        info = {"dtype": "json", "shape": [len(data)]}
+        payload = np.frombuffer(data, dtype=np.uint8)
+    # 크기가 0인 블록은 만들 수 없으므로 최소 1바이트
+    block = shared_memory.SharedMemory(create=True, size=max(payload.nbytes, 1))
+    block.buf[:payload.nbytes] = payload
+    info.update({"name": block.name, "size": payload.nbytes})
+    return block, info
+
+
+def _read_block(info):
+    """
+    블록 정보로 공유 메모리 블록을 읽기 전용 배열(또는 JSON 값)로 엽니다.
+    """
+    mapping = _map_readonly(info["name"], max(info["size"], 1))
+    if info["dtype"] == "json":
+        try:
+            return json.loads(mapping[:info["size"]].decode("utf-8"))
+        finally:
+            mapping.close()
+    return np.frombuffer(mapping, dtype=np.dtype(info["dtype"]), count=int(np.prod(info["shape"]))).reshape(
+        info["shape"]
+    )
+
+
+class SharedDataPublisher:
+    """
+    상관관계 행렬과 사용자 행렬을 공유 메모리에 게시하는 프로세스 쪽 객체입니다.
+    """
+
+    def __init__(self, name, user_file_path, correlation_matrix_path):
+        """
+        Args:
+            name (str): 제어 블록 이름 (작업 프로세스가 연결할 때 사용).
+            user_file_path (str): 사용자 데이터 파일 경로.
+            correlation_matrix_path (str): 메뉴 상관관계 행렬 파일 경로.
+        """
+        self.name = name
+        self.user_file_path = user_file_path
+        self.correlation_matrix_path = correlation_matrix_path
+        # 게시할 파일은 이 프로세스의 공유 저장소와 별도로 읽음 (같은 프로세스에서 공유 데이터를 연결해도 영향 없음)
+        self._store = DataStore()
+        self._lock = threading.Lock()
+        self._sources = {}  # {"correlation"/"user": (버전, [SharedMemory], 블록 정보)}
+
+        try:
+            self._control = shared_memory.SharedMemory(name=name, create=True, size=CONTROL_SIZE)
+            self.generation = 0
+        except FileExistsError:
+            # 이전 게시 프로세스가 남긴 제어 블록은 이어서 사용 (세대 번호가 계속 증가하도록)
+            self._control = shared_memory.SharedMemory(name=name)
+            self.generation = _HEADER.unpack_from(self._control.buf)[1]
+
+    def _build_correlation(self):
+        correlation_matrix = self._store.get_correlation_matrix(self.correlation_matrix_path)
+        values, values_info = _create_block(correlation_matrix.to_numpy(dtype=np.float32))
+        labels, labels_info = _create_block(
+            json.dumps(correlation_matrix.index.tolist(), ensure_ascii=False).encode("utf-8")
+        )
+        return [values, labels], {"values": values_info, "menus": labels_info}
+
+    def _build_user(self):
+        user_matrix = self._store.get_user_file(
+            self.user_file_path, "user_matrix", UserMatrix.from_user_file, updater=UserMatrix.appended
+        )
+        scores, scores_info = _create_block(user_matrix.scores)
+        missing_bits, missing_info = _create_block(user_matrix.missing_bits)
+        labels, labels_info = _create_block(
+            json.dumps({"names": user_matrix.names, "menus": user_matrix.menus}, ensure_ascii=False).encode("utf-8")
+        )
+        return [scores, missing_bits, labels], {"scores": scores_info, "missing_bits": missing_info, "labels": labels_info}
+
+    def _write_control(self, descriptor):
+        payload = json.dumps(descriptor, ensure_ascii=False).encode("utf-8")
+        if _HEADER.size + len(payload) > CONTROL_SIZE:
+            raise ValueError("공유 데이터 블록 목록이 제어 블록보다 큽니다.")
+        sequence = _HEADER.unpack_from(self._control.buf)[0]
+        # 순서 번호가 홀수인 동안에는 작업 프로세스가 읽은 내용을 버리고 다시 읽음
+        _HEADER.pack_into(self._control.buf, 0, sequence + 1, self.generation, 0)
+        self._control.buf[_HEADER.size:_HEADER.size + len(payload)] = payload
+        _HEADER.pack_into(self._control.buf, 0, sequence + 2, descriptor["generation"], len(payload))
+
+    def publish(self):
+        """
+        파일이 바뀌었으면 새 세대를 게시합니다. 바뀐 파일의 블록만 새로 만들고, 이전 블록은 게시 후 지웁니다.
+        (이미 연결한 작업 프로세스는 지운 뒤에도 매핑이 유지되며, 다음 요청에서 새 세대로 넘어감)
+
+        Returns:
+            int: 현재 세대 번호.
+        """
+        with self._lock:
+            # 파일이 바뀌었으면 여기서 다시 로드됨
+            self._store.get_correlation_matrix(self.correlation_matrix_path)
+            self._store.get_user_file(
+                self.user_file_path, "user_matrix", UserMatrix.from_user_file, updater=UserMatrix.appended
+            )
+            versions = {
+                "correlation": self._store.version(self.correlation_matrix_path),
+                "user": self._store.version(self.user_file_path),
+            }
+            if self._sources and all(self._sources[kind][0] == version for kind, version in versions.items()):
+                return self.generation
+
+            builders = {"correlation": self._build_correlation, "user": self._build_user}
+            sources, replaced = dict(self._sources), []
+            for kind, version in versions.items():
+                if kind not in sources or sources[kind][0] != version:
+                    if kind in sources:
+                        replaced.extend(sources[kind][1])
+                    blocks, info = builders[kind]()
+                    sources[kind] = (version, blocks, info)
+
+            paths = {"correlation": self.correlation_matrix_path, "user": self.user_file_path}
+            descriptor = {
+                "generation": self.generation + 1,
+                "sources": {
+                    kind: {"path": os.path.abspath(paths[kind]), "version": version, "blocks": info}
+                    for kind, (version, _, info) in sources.items()
+                },
+            }
+            self._write_control(descriptor)
+            self.generation += 1
+            self._sources = sources
+
+            for block in replaced:
+                block.close()
+                block.unlink()
+            return self.generation
+
+    def start_background_refresh(self, interval=30):
+        """
+        일정 간격으로 파일 변경을 확인해 새 세대를 게시하는 데몬 스레드를 시작합니다.
+
+        Args:
+            interval (float): 확인 주기(초).
+
+        Returns:
+            threading.Event: set()하면 스레드가 멈춥니다.
+        """
+        stop_event = threading.Event()
+
+        def run():
+            while not stop_event.wait(interval):
+                try:
+                    self.publish()
+                except (OSError, ValueError) as e:
+                    print(f"공유 데이터를 게시하는 중 오류가 발생했습니다: {e}")
+
+        threading.Thread(target=run, name="shared-data-refresh", daemon=True).start()
+        return stop_event
+
+    def close(self):
+        """
+        게시한 블록과 제어 블록을 모두 지웁니다. 이미 연결한 작업 프로세스는 마지막 세대를 계속 사용합니다.
+        """
+        with self._lock:
+            for _, blocks, _ in self._sources.values():
+                for block in blocks:
+                    block.close()
+                    block.unlink()
+            self._sources = {}
+            self._control.close()
+            self._control.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SharedSnapshot:
+    """
+    한 세대의 공유 데이터입니다. 배열은 공유 메모리를 읽기 전용으로 가리킵니다.
+    """
+
+    def __init__(self, generation, versions, correlation_matrix, user_matrix):
+        """
+        Args:
+            generation (int): 세대 번호.
+            versions (dict): {"correlation"/"user": 게시한 프로세스가 계산한 파일 버전}
+            correlation_matrix (pd.DataFrame): 메뉴 상관관계 행렬.
+            user_matrix (UserMatrix): 사용자 행렬.
+        """
+        self.generation = generation
+        self.versions = versions
+        self.correlation_matrix = correlation_matrix
+        self.user_matrix = user_matrix
+
+
+class SharedDataReader:
+    """
+    작업 프로세스에서 공유 데이터에 연결하는 객체입니다.
+    """
+
+    def __init__(self, name, max_attempts=100):
+        """
+        Args:
+            name (str): 제어 블록 이름.
+            max_attempts (int): 게시와 겹쳐 제어 블록을 읽지 못했을 때 다시 시도할 횟수.
+        """
+        self.name = name
+        self.max_attempts = max_attempts
+        self._control = _map_readonly(name, CONTROL_SIZE)
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def generation(self):
+        """
+        현재 게시된 세대 번호를 반환합니다. 제어 블록 머리말만 읽으므로 매우 가볍습니다.
+        """
+        return _HEADER.unpack_from(self._control)[1]
+
+    def _read_descriptor(self):
+        for _ in range(self.max_attempts):
+            sequence, generation, length = _HEADER.unpack_from(self._control)
+            if sequence % 2 == 0 and generation > 0:
+                payload = self._control[_HEADER.size:_HEADER.size + length]
+                if _HEADER.unpack_from(self._control)[0] == sequence:
+                    return json.loads(payload.decode("utf-8"))
+            time.sleep(0.001)
+        raise RuntimeError(f"공유 데이터 '{self.name}'의 제어 블록을 읽지 못했습니다. 게시 프로세스를 확인해주세요.")
+
+    def _open_source(self, kind, source):
+        blocks = source["blocks"]
+        if kind == "correlation":
+            index = pd.Index(_read_block(blocks["menus"]), name="메뉴")
+            return pd.DataFrame(_read_block(blocks["values"]), index=index, columns=index, copy=False)
+        labels = _read_block(blocks["labels"])
+        return UserMatrix(
+            labels["names"], labels["menus"], _read_block(blocks["scores"]),
+            missing_bits=_read_block(blocks["missing_bits"]),
+        )
+
+    def snapshot(self):
+        """
+        현재 세대의 공유 데이터를 반환합니다. 세대가 바뀌지 않았으면 이전 결과를 그대로 반환하고,
+        바뀌었으면 버전이 바뀐 데이터의 블록만 새로 연결합니다.
+
+        Returns:
+            SharedSnapshot: 공유 데이터.
+        """
+        previous = self._snapshot
+        if previous is not None and previous.generation == self.generation():
+            return previous
+
+        with self._lock:
+            previous = self._snapshot
+            for _ in range(self.max_attempts):
+                descriptor = self._read_descriptor()
+                if previous is not None and previous.generation == descriptor["generation"]:
+                    return previous
+                sources = descriptor["sources"]
+                versions = {kind: source["version"] for kind, source in sources.items()}
+                try:
+                    data = {}
+                    for kind in ("correlation", "user"):
+                        if previous is not None and previous.versions[kind] == versions[kind]:
+                            data[kind] = previous.correlation_matrix if kind == "correlation" else previous.user_matrix
+                        else:
+                            data[kind] = self._open_source(kind, sources[kind])
+                except FileNotFoundError:
+                    # 읽는 사이에 다음 세대가 게시되어 블록이 지워짐
+                    continue
+                self._snapshot = SharedSnapshot(
+                    descriptor["generation"], versions, data["correlation"], data["user"]
+                )
+                return self._snapshot
+        raise RuntimeError(f"공유 데이터 '{self.name}'에 연결하지 못했습니다.")
+
+    def paths(self):
+        """
+        게시된 파일 경로를 반환합니다.
+
+        Returns:
+            dict: {"correlation"/"user": 절대 경로}
+        """
+        return {kind: source["path"] for kind, source in self._read_descriptor()["sources"].items()}
+
+
+def use_shared_data(name, user_file_path, correlation_matrix_path):
+    """
+    이 프로세스의 공유 데이터 저장소가 상관관계 행렬과 사용자 행렬을 파일 대신 공유 메모리에서 가져오도록 연결합니다.
+    이후 recommend_menus, generate_menu_map 등은 코드 변경 없이 공유 메모리의 배열을 사용하고,
+    새 세대가 게시되면 다음 호출에서 자동으로 넘어갑니다.
+
+    Args:
+        name (str): 제어 블록 이름.
+        user_file_path (str): 사용자 데이터 파일 경로 (게시된 경로와 같아야 함).
+        correlation_matrix_path (str): 메뉴 상관관계 행렬 파일 경로 (게시된 경로와 같아야 함).
+
+    Returns:
+        SharedDataReader: 연결된 공유 데이터.
+    """
+    reader = SharedDataReader(name)
+    published = reader.paths()
+    expected = {"correlation": os.path.abspath(correlation_matrix_path), "user": os.path.abspath(user_file_path)}
+    if published != expected:
+        raise ValueError(f"공유 데이터 '{name}'에 게시된 파일이 다릅니다: {published}")
+
+    def correlation_source():
+        snapshot = reader.snapshot()
+        return snapshot.versions["correlation"], snapshot.correlation_matrix
+
+    def user_source():
+        snapshot = reader.snapshot()
+        return snapshot.versions["user"], snapshot.user_matrix
+
+    store = get_data_store()
+    store.attach_shared(correlation_matrix_path, "correlation", correlation_source)
+    store.attach_shared(user_file_path, "user_matrix", user_source)
+    return reader
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="상관관계 행렬과 사용자 행렬을 공유 메모리에 게시합니다.")
+    parser.add_argument("--name", default="menumate", help="제어 블록 이름")
+    parser.add_argument("--users-file", default="data/processed_user_data.csv", help="사용자 데이터 파일 경로")
+    parser.add_argument("--correlation", default=None, help="메뉴 상관관계 행렬 파일 경로 (기본값: 앱과 같은 경로)")
+    parser.add_argument("--interval", type=float, default=30, help="파일 변경 확인 주기(초)")
+    args = parser.parse_args()
+
+    correlation_path = args.correlation
+    if correlation_path is None:
+        correlation_path = mapped_correlation_matrix_path("data/menu_correlation_matrix.csv")
+
+    with SharedDataPublisher(args.name, args.users_file, correlation_path) as publisher:
+        print(f"공유 데이터 '{args.name}' 세대 {publisher.publish()}를 게시했습니다. (종료: Ctrl+C)")
+        stop_event = publisher.start_background_refresh(args.interval)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            stop_event.set()
+            print("\n공유 데이터를 정리하고 종료합니다.")
@@ -0,0 +1,184 @@
+"""
+아주 큰 메뉴 목록을 위한 상위 k개 유사 메뉴 그래프입니다.
+
+전체 n×n 유사도 행렬을 만들지 않고, 메뉴를 block_size개씩 나누어 블록별 유사도만 계산한 뒤
+메뉴마다 가장 유사한 k개만 희소 행렬(CSR)로 남깁니다. 최대 메모리 사용량은
+block_size × 메뉴 수 크기의 블록 하나(작업 프로세스마다)로 제한됩니다.
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import sparse
+
+from src.file_utils import atomic_write
+
+# 작업 프로세스에서 공유하는 정규화된 속성 행렬
+_worker_features = None
+
+
+def normalize_rows(features, dtype=np.float32):
+    """
+    각 행을 단위 벡터로 정규화합니다. 크기가 0인 행은 0으로 둡니다.
+
+    Args:
+        features (np.ndarray | sparse.spmatrix): 메뉴×속성 배열 또는 희소 행렬.
+        dtype (np.dtype): 결과 자료형.
+
+    Returns:
+        np.ndarray | sparse.csr_matrix: 정규화된 배열 (희소 행렬이면 희소 행렬로 반환).
+    """
+    if sparse.issparse(features):
+        # 0이 아닌 값만 사용해 크기를 계산하고 행별 배율을 곱함
+        features = sparse.csr_matrix(features, dtype=dtype)
+        norms = np.sqrt(np.asarray(features.multiply(features).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms).astype(dtype) @ features
+    features = np.asarray(features, dtype=dtype)
+    norms = np.linalg.norm(features, axis=1)
+    norms[norms == 0] = 1.0
+    return features / norms[:, None]
+
+
+def _init_worker(unit_features):
+    global _worker_features
+    _worker_features = unit_features
+
+
+def _topk_block(unit_features, start, stop, k):
+    """
+    start~stop 행 메뉴에 대해 가장 유사한 k개 메뉴의 위치와 유사도를 계산합니다.
+    """
+    similarities = unit_features[start:stop] @ unit_features.T
+    if sparse.issparse(similarities):
+        similarities = similarities.toarray()
+    rows = np.arange(stop - start)
+    similarities[rows, start + rows] = -np.inf  # 자기 자신 제외
+
+    # 상위 k개를 고른 뒤 그 안에서만 정렬
+    top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    top_values = np.take_along_axis(similarities, top, axis=1)
+    order = np.argsort(-top_values, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_values, order, axis=1)
+
+
+def _topk_block_worker(start, stop, k):
+    return _topk_block(_worker_features, start, stop, k)
+
+
+def build_topk_graph(features, k=20, block_size=1024, n_jobs=1):
+    """
+    메뉴별 상위 k개 코사인 유사도만 남긴 희소 그래프를 블록 단위로 계산합니다.
+
+    Args:
+        features (np.ndarray | sparse.spmatrix): 메뉴×속성 배열 또는 희소 행렬 (희소 행렬이면 블록 유사도도 희소 곱으로 계산).
+        k (int): 메뉴마다 남길 이웃 수.
+        block_size (int): 한 번에 계산할 메뉴(행) 수.
+        n_jobs (int): 작업 프로세스 수. 1이면 현재 프로세스에서 계산합니다.
+
+    Returns:
+        sparse.csr_matrix: (메뉴 수 × 메뉴 수) 크기의 희소 유사도 행렬.
+    """
+    unit_features = normalize_rows(features)
+    n = unit_features.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        return sparse.csr_matrix((n, n), dtype=np.float32)
+
+    blocks = [(start, min(start + block_size, n)) for start in range(0, n, block_size)]
+    if n_jobs == 1:
+        results = [_topk_block(unit_features, start, stop, k) for start, stop in blocks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(unit_features,)) as executor:
+            results = list(executor.map(
+                _topk_block_worker,
+                [start for start, _ in blocks],
+                [stop for _, stop in blocks],
+                [k] * len(blocks),
+            ))
+
+    indices = np.concatenate([block_indices for block_indices, _ in results]).ravel()
+    values = np.concatenate([block_values for _, block_values in results]).ravel()
+    indptr = np.arange(0, n * k + 1, k)
+    return sparse.csr_matrix((values, indices, indptr), shape=(n, n))
+
+
+class SimilarityGraph:
+    """
+    메뉴별 상위 k개 유사 메뉴 그래프와 메뉴 이름을 함께 보관하고, 가까운 메뉴를 조회합니다.
+    """
+
+    def __init__(self, menus, graph):
+        """
+        Args:
+            menus (list): 메뉴 이름 리스트.
+            graph (sparse.csr_matrix): build_topk_graph 결과.
+        """
+        self.menus = list(menus)
+        self.positions = {menu: idx for idx, menu in enumerate(self.menus)}
+        self.graph = graph.tocsr()
+
+    @classmethod
+    def build(cls, menus, features, k=20, block_size=1024, n_jobs=1):
+        """
+        메뉴 속성으로부터 그래프를 만듭니다.
+
+        Args:
+            menus (list): 메뉴 이름 리스트.
+            features (np.ndarray | sparse.spmatrix): 메뉴×속성 배열 또는 희소 행렬.
+            k (int): 메뉴마다 남길 이웃 수.
+            block_size (int): 한 번에 계산할 메뉴 수.
+            n_jobs (int): 작업 프로세스 수.
+
+        Returns:
+            SimilarityGraph: 생성된 그래프.
+        """
+        return cls(menus, build_topk_graph(features, k=k, block_size=block_size, n_jobs=n_jobs))
+
+    def nearest(self, menu, top_k=10):
+        """
+        특정 메뉴와 가장 유사한 메뉴를 반환합니다.
+
+        Args:
+            menu (str): 기준 메뉴 이름.
+            top_k (int): 반환할 메뉴 개수 (그래프를 만들 때의 k를 넘을 수 없음).
+
+        Returns:
+            list: (메뉴 이름, 유사도) 튜플 리스트. 유사도 내림차순.
+        """
+        if menu not in self.positions:
+            raise ValueError(f"메뉴 '{menu}'를 찾을 수 없습니다.")
+        row = self.positions[menu]
+        start, stop = self.graph.indptr[row], self.graph.indptr[row + 1]
+        order = np.argsort(-self.graph.data[start:stop], kind="stable")[:top_k]
+        neighbors = self.graph.indices[start:stop][order]
+        similarities = self.graph.data[start:stop][order]
+        return [(self.menus[idx], float(similarity)) for idx, similarity in zip(neighbors, similarities)]
+
+    def save(self, graph_path):
+        """
+        그래프를 .npz 파일로, 메뉴 이름을 .labels.json 파일로 원자적으로 저장합니다.
+
+        Args:
+            graph_path (str): 저장할 .npz 파일 경로.
+        """
+        with atomic_write(os.path.splitext(graph_path)[0] + ".labels.json") as f:
+            json.dump({"menus": self.menus}, f, ensure_ascii=False)
+        with atomic_write(graph_path, mode="wb") as f:
+            sparse.save_npz(f, self.graph)
+
+    @classmethod
+    def load(cls, graph_path):
+        """
+        save로 저장한 그래프를 불러옵니다.
+
+        Args:
+            graph_path (str): .npz 파일 경로.
+
+        Returns:
+            SimilarityGraph: 불러온 그래프.
+        """
+        with open(os.path.splitext(graph_path)[0] + ".labels.json", encoding="utf-8") as f:
+            menus = json.load(f)["menus"]
+        return cls(menus, sparse.load_npz(graph_path))
@@ -0,0 +1,125 @@
+"""
+모든 사용자의 선호/기피 속성 프로필을 한 번에 계산합니다.
+
+사용자별 선호(4점) 메뉴와 기피(1점) 메뉴 표시 행렬에 정규화된 속성 행렬을 곱해
+(사용자 × 속성) 평균 속성을 행렬 곱 두 번으로 구합니다. 결과는 공유 데이터 저장소에 캐시되며,
+사용자 데이터가 바뀌면 점수가 바뀐 행과 새로 추가된 행만 다시 계산합니다.
+"""
+import numpy as np
+import pandas as pd
+
+from src.data_store import get_data_store
+from src.menu_schema import get_menu_schema
+from src.user_matrix import get_user_matrix
+
+
+def _align_scores(menu_schema, user_matrix):
+    # 사용자 점수를 메뉴 데이터의 행 순서에 맞춤 (사용자 데이터에 없는 메뉴는 0)
+    return user_matrix.scores_for_menus(menu_schema.menus)
+
+
+class TasteProfiles:
+    """
+    사용자별 선호/기피 속성 프로필 (사용자 × 속성 배열) 입니다.
+    """
+
+    def __init__(self, menu_schema, user_matrix, scores, favorite, disliked):
+        """
+        Args:
+            menu_schema (MenuSchema): 프로필 계산에 사용한 메뉴 스키마.
+            user_matrix (UserMatrix): 프로필 계산에 사용한 사용자 행렬.
+            scores (np.ndarray): 메뉴 데이터 행 순서에 맞춘 사용자 점수 (변경된 행을 찾는 데 사용).
+            favorite (np.ndarray): 사용자 × 속성 선호 프로필.
+            disliked (np.ndarray): 사용자 × 속성 기피 프로필.
+        """
+        self.menu_schema = menu_schema
+        self.user_matrix = user_matrix
+        self.scores = scores
+        self.favorite = favorite
+        self.disliked = disliked
+
+    @classmethod
+    def build(cls, menu_schema, user_matrix, previous=None):
+        """
+        프로필을 계산합니다. previous가 같은 메뉴 스키마로 계산된 결과이면
+        점수가 그대로인 행은 재사용하고 바뀐 행과 새 행만 계산합니다.
+
+        Args:
+            menu_schema (MenuSchema): 메뉴 스키마.
+            user_matrix (UserMatrix): 사용자 행렬.
+            previous (TasteProfiles): 이전 계산 결과.
+
+        Returns:
+            TasteProfiles: 계산된 프로필.
+        """
+        scores = _align_scores(menu_schema, user_matrix)
+        n_users, n_attributes = len(scores), len(menu_schema.attribute_columns)
+        favorite = np.empty((n_users, n_attributes))
+        disliked = np.empty((n_users, n_attributes))
+
+        stale = np.ones(n_users, dtype=bool)
+        if previous is not None and previous.menu_schema is menu_schema:
+            n_common = min(n_users, len(previous.scores))
+            stale[:n_common] = (previous.scores[:n_common] != scores[:n_common]).any(axis=1)
+            kept = np.flatnonzero(~stale)
+            favorite[kept] = previous.favorite[kept]
+            disliked[kept] = previous.disliked[kept]
+
+        rows = np.flatnonzero(stale)
+        if len(rows) > 0:
+            favorite[rows] = menu_schema.profiles(scores[rows] == 4)
+            disliked[rows] = menu_schema.profiles(scores[rows] == 1)
+        return cls(menu_schema, user_matrix, scores, favorite, disliked)
+
+    def _row(self, user_name):
+        row = self.user_matrix.row(user_name)
+        if row is None:
+            raise ValueError(f"사용자 '{user_name}'를 데이터에서 찾을 수 없습니다.")
+        return row
+
+    def favorite_attributes(self, user_name):
+        """
+        사용자의 선호 속성 프로필을 반환합니다.
+        """
+        return pd.Series(self.favorite[self._row(user_name)], index=self.menu_schema.attribute_columns)
+
+    def disliked_attributes(self, user_name):
+        """
+        사용자의 기피 속성 프로필을 반환합니다.
+        """
+        return pd.Series(self.disliked[self._row(user_name)], index=self.menu_schema.attribute_columns)
+
+    def to_frames(self):
+        """
+        전체 사용자의 프로필을 DataFrame으로 반환합니다. 이름이 없는 행은 제외합니다.
+
+        Returns:
+            tuple: (선호 속성 DataFrame, 기피 속성 DataFrame). 인덱스는 사용자 이름입니다.
+        """
+        names = list(self.user_matrix.name_to_row)
+        rows = list(self.user_matrix.name_to_row.values())
+        columns = self.menu_schema.attribute_columns
+        return (
+            pd.DataFrame(self.favorite[rows], index=names, columns=columns),
+            pd.DataFrame(self.disliked[rows], index=names, columns=columns),
+        )
+
+
+def get_taste_profiles(menu_file_path, user_file_path):
+    """
+    전체 사용자의 선호/기피 속성 프로필을 가져옵니다. 메뉴 데이터나 사용자 데이터가 바뀐 경우에만 다시 계산하며,
+    사용자 데이터만 바뀌었다면 바뀐 사용자 행만 계산합니다.
+
+    Args:
+        menu_file_path (str): 전처리된 메뉴 데이터 파일 경로.
+        user_file_path (str): 사용자 데이터 파일 경로.
+
+    Returns:
+        TasteProfiles: 사용자별 프로필.
+    """
+    store = get_data_store()
+    menu_schema = get_menu_schema(menu_file_path)
+    user_matrix = get_user_matrix(user_file_path)
+    paths = (menu_file_path, user_file_path)
+    previous = store.previous_derived("taste_profiles", paths)
+    return store.get_derived("taste_profiles", paths, lambda: TasteProfiles.build(menu_schema, user_matrix, previous))
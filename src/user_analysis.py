@@ -1,13 +1,24 @@
-import matplotlib.pyplot as plt
 import pandas as pd
-import seaborn as sns
 import numpy as np
 
+from src.menu_schema import MenuSchema
+from src.profiling import profiled, stage
+from src.user_matrix import UserMatrix
+
 class UserAnalysis:
-    def __init__(self, menu_data, user_data):
+    def __init__(self, menu_data, user_data, user_matrix=None, menu_schema=None):
+        """
+        :param menu_data: 전처리된 메뉴 데이터
+        :param user_data: 사용자 데이터 (user_matrix를 주면 사용하지 않으므로 None이어도 됨)
+        :param user_matrix: 사용자 행렬 (get_user_matrix 결과). 없으면 user_data로 새로 만듦
+        :param menu_schema: 메뉴 스키마 (get_menu_schema 결과). 없으면 menu_data로 새로 만듦
+        """
         self.menu_data = menu_data
         self.user_data = user_data
+        self.user_matrix = user_matrix if user_matrix is not None else UserMatrix.from_frame(user_data)
+        self.menu_schema = menu_schema if menu_schema is not None else MenuSchema(menu_data)
 
+    @profiled("analyze_user")
     def analyze_user(self, user_name, top_n=5):
         """
         특정 사용자의 선호 메뉴와 기피 메뉴를 분석하는 함수
@@ -15,28 +26,25 @@ class UserAnalysis:
         :param top_n: 상위 N개의 대표 메뉴를 선택
         """
         # 사용자 이름이 데이터에 있는지 확인
-        if user_name not in self.user_data['이름'].values:
-            raise ValueError(f"사용자 '{user_name}'를 데이터에서 찾을 수 없습니다.\n⚠️ 주의 : 사용자 추가 후에는 프로그램을 재시작 해야합니다!")
-
-        # 사용자의 선호도 데이터 추출
-        user_row = self.user_data[self.user_data['이름'] == user_name].iloc[:, 1:]
+        if user_name not in self.user_matrix:
+            raise ValueError(f"사용자 '{user_name}'를 데이터에서 찾을 수 없습니다.")
 
         # 4점인 메뉴(선호하는 메뉴)
-        favorite_menus = user_row.loc[:, (user_row == 4).any()].columns.tolist()
+        favorite_menus = self.user_matrix.menus_with_score(user_name, 4)
         # 1점인 메뉴(기피하는 메뉴)
-        disliked_menus = user_row.loc[:, (user_row == 1).any()].columns.tolist()
+        disliked_menus = self.user_matrix.menus_with_score(user_name, 1)
 
         # 선호 메뉴와 기피 메뉴의 상세 정보
-        favorite_menu_details = self.menu_data[self.menu_data['메뉴'].isin(favorite_menus)]
-        disliked_menu_details = self.menu_data[self.menu_data['메뉴'].isin(disliked_menus)]
-
-        # 속성 정규화
-        normalized_menu_data = self.menu_data.drop(columns=["메뉴", "분류", "간편성"])
-        normalized_menu_data = normalized_menu_data.div(normalized_menu_data.sum(axis=0), axis=1)
+        favorite_mask = self.menu_schema.menu_mask(favorite_menus)
+        disliked_mask = self.menu_schema.menu_mask(disliked_menus)
+        favorite_menu_details = self.menu_data[favorite_mask]
+        disliked_menu_details = self.menu_data[disliked_mask]
 
-        # 선호 속성과 기피 속성 요약
-        favorite_attributes = normalized_menu_data.loc[favorite_menu_details.index].mean()
-        disliked_attributes = normalized_menu_data.loc[disliked_menu_details.index].mean()
+        # 선호 속성과 기피 속성 요약 (스키마에 미리 정규화된 속성 행렬 사용)
+        with stage("analyze_user.profiles"):
+            favorite_profile, disliked_profile = self.menu_schema.profiles(np.vstack([favorite_mask, disliked_mask]))
+        favorite_attributes = pd.Series(favorite_profile, index=self.menu_schema.attribute_columns)
+        disliked_attributes = pd.Series(disliked_profile, index=self.menu_schema.attribute_columns)
 
         # 상위 N개 제한
         favorite_menus_top_n = favorite_menu_details.head(top_n)["메뉴"].tolist()
@@ -56,76 +64,26 @@ class UserAnalysis:
         :param user_name: 분석할 사용자 이름
         :param top_k: 시각화할 상위 속성 개수
         """
+        # matplotlib은 가져오는 데 시간이 걸리므로 시각화할 때만 import (분석만 하는 경우 불필요)
+        import matplotlib.pyplot as plt
+        from src.visualizations import draw_taste_bars, draw_taste_radar, taste_report_data
+
         # 사용자 분석 결과 가져오기
         analysis_results = self.analyze_user(user_name)
 
-        # 맛 프로파일 시각화
-        taste_profile_columns = [col for col in self.menu_data.columns if "맛 프로파일" in col]
-        taste_profile_data = analysis_results["favorite_attributes"].filter(items=taste_profile_columns)
-        taste_profile_data = taste_profile_data[taste_profile_data >= 0.003]
-        taste_profile_data.index = taste_profile_data.index.str.replace("맛 프로파일_", "")
-        taste_profile_data = taste_profile_data.sort_values(ascending=False).head(top_k)
-
-        # 메뉴 분류 시각화
-        favorite_menu_details = analysis_results["favorite_menu_details"]
-        category_counts = favorite_menu_details["분류"].value_counts()
-        category_counts = category_counts / category_counts.sum()  # 정규화
-
-        # 빈도에 따른 색상 설정 (빈도 높을수록 진한 색)
-        def generate_color_palette(data, base_color):
-            max_value = data.max()
-            min_value = data.min()
-            normalized_values = (data - min_value) / (max_value - min_value)
-            return sns.light_palette(base_color, reverse=True, as_cmap=False, n_colors=len(data))
-
-        taste_palette = generate_color_palette(taste_profile_data, "green")
-        category_palette = generate_color_palette(category_counts, "green")
+        # 맛 프로파일과 메뉴 분류 비율 계산
+        taste_profile_data, category_counts = taste_report_data(
+            analysis_results, self.menu_schema.family_columns("맛 프로파일"), top_k
+        )
 
         # 바 차트 생성
         fig, axes = plt.subplots(1, 2, figsize=(16, 6))
-
-        # 맛 프로파일 바 차트
-        taste_colors = generate_color_palette(taste_profile_data, "green")
-        for i, bar in enumerate(taste_profile_data.index):
-            axes[0].bar(bar, taste_profile_data.values[i], color=taste_colors[i])
-
-        axes[0].set_title(f"{user_name}님의 좋아하는 맛", fontsize=14)
-        axes[0].set_ylabel("빈도", fontsize=12)
-        axes[0].set_xlabel("속성", fontsize=12)
-        axes[0].tick_params(axis="x", rotation=45)
-
-        # 메뉴 분류 바 차트
-        category_colors = generate_color_palette(category_counts, "green")
-        for i, category in enumerate(category_counts.index):
-            axes[1].bar(category, category_counts.values[i], color=category_colors[i])
-
-        axes[1].set_title(f"{user_name}님의 메뉴 분류별 선호도", fontsize=14)
-        axes[1].set_ylabel("빈도", fontsize=12)
-        axes[1].set_xlabel("분류", fontsize=12)
-        axes[1].tick_params(axis="x", rotation=45)
-
+        draw_taste_bars(axes, user_name, taste_profile_data, category_counts)
         plt.tight_layout()
         plt.show()
 
-
         # 레이더 차트 생성 (맛 프로파일)
-        radar_taste_data = taste_profile_data.copy()
-        radar_taste_data = radar_taste_data.sort_index()  # 비슷한 속성을 붙이기 위해 정렬
-
-        radar_labels_taste = radar_taste_data.index.tolist()
-        radar_values_taste = radar_taste_data.values.tolist()
-        radar_values_taste += radar_values_taste[:1]  # 레이더 차트를 닫기 위해 첫 값 추가
-
-        radar_angles_taste = np.linspace(0, 2 * np.pi, len(radar_labels_taste), endpoint=False).tolist()
-        radar_angles_taste += radar_angles_taste[:1]
-
         fig, ax = plt.subplots(figsize=(7, 7), subplot_kw=dict(polar=True))
-        ax.fill(radar_angles_taste, radar_values_taste, color="lightgreen", alpha=0.4)
-        ax.plot(radar_angles_taste, radar_values_taste, color="green", linewidth=2)
-        ax.set_yticks([])
-        ax.set_xticks(radar_angles_taste[:-1])
-        ax.set_xticklabels(radar_labels_taste, fontsize=10)
-        ax.set_title(f"{user_name}님이 선호하는 맛", size=16, pad=20)
-
+        draw_taste_radar(ax, user_name, taste_profile_data)
         plt.tight_layout()
         plt.show()
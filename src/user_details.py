@@ -1,13 +1,13 @@
-import pandas as pd
+from src.user_matrix import get_user_matrix
 
 class UserDetails:
     def __init__(self, user_data_path):
         """
-        사용자 데이터를 로드합니다.
+        사용자 데이터를 로드합니다. 공유 데이터 저장소에 이미 로드된 사용자 행렬이 있으면 재사용합니다.
         Args:
             user_data_path (str): 사용자 데이터 파일 경로.
         """
-        self.user_data = pd.read_csv(user_data_path)
+        self.user_matrix = get_user_matrix(user_data_path)
 
     def get_user_details(self, user_name):
         """
@@ -18,8 +18,7 @@ class UserDetails:
         Returns:
             dict: 사용자 이름, 설문 데이터 딕셔너리 형태.
         """
-        user_row = self.user_data[self.user_data["이름"] == user_name]
-        if user_row.empty:
+        if user_name not in self.user_matrix:
             raise ValueError(
                 f"'{user_name}'님을 데이터에서 찾을 수 없습니다. 😥\n"
                 "아직 설문을 작성하지 않았거나 이름을 잘못 입력하셨을 수 있습니다.\n"
@@ -27,7 +26,7 @@ class UserDetails:
             )
         
         # 사용자 데이터 딕셔너리 생성 (이름 제외)
-        user_data_dict = user_row.drop(columns=["이름"]).iloc[0].dropna().to_dict()
+        user_data_dict = self.user_matrix.preferences(user_name)
         return {
             "user_name": user_name,
             "preferences": user_data_dict
@@ -0,0 +1,257 @@
+"""
+사용자 선호도를 담는 압축된 사용자×메뉴 행렬입니다.
+
+점수(1~4)는 int8 배열에, 응답하지 않은 메뉴는 비트 단위로 압축한 결측 마스크에 저장합니다.
+float64 DataFrame보다 점수 하나당 메모리를 약 7배 적게 쓰고, 이름→행 번호 사전으로
+사용자를 데이터 크기와 무관하게 상수 시간에 찾습니다.
+
+파일에서 읽은 행렬은 읽은 위치를 기억하므로, 새 사용자가 추가 로그에 더해지면 추가된 행만 읽어 붙입니다 (appended).
+"""
+import copy
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from src.data_store import get_data_store
+from src.user_store import UserStore
+
+# 점수 지문을 이 행 수 단위 블록의 연쇄 해시로 계산 (fingerprint 참고)
+FINGERPRINT_BLOCK_ROWS = 4096
+
+
+def _hash_rows(digest, scores):
+    # 이전 지문 뒤에 점수 행들을 이어 붙인 지문
+    return hashlib.md5(digest.encode("ascii") + np.ascontiguousarray(scores, dtype=np.int8).tobytes()).hexdigest()
+
+
+class UserMatrix:
+    """
+    사용자 이름 색인이 있는 int8 사용자×메뉴 점수 행렬입니다.
+    """
+
+    def __init__(self, names, menus, scores, missing=None, missing_bits=None):
+        """
+        Args:
+            names (list): 행별 사용자 이름 (이름이 없는 행은 None).
+            menus (list): 열별 메뉴 이름.
+            scores (np.ndarray): int8 사용자×메뉴 점수 배열. 결측 점수는 0입니다.
+            missing (np.ndarray): 사용자×메뉴 결측 여부 bool 배열.
+            missing_bits (np.ndarray): missing 대신 이미 압축한 결측 마스크 (packbits 결과).
+                공유 메모리의 배열처럼 복사하지 않고 그대로 사용할 배열을 넘길 때 사용합니다.
+        """
+        self.names = list(names)
+        self.menus = list(menus)
+        self.scores = np.ascontiguousarray(scores, dtype=np.int8)
+        self.missing_bits = missing_bits if missing_bits is not None else np.packbits(missing, axis=1)
+        self.menu_positions = {menu: idx for idx, menu in enumerate(self.menus)}
+        # 파일에서 읽은 경우 읽은 위치 (UserStore.position), 완전한 블록들의 연쇄 해시
+        self.position = None
+        self._block_digests = []
+
+        # 같은 이름이 여러 번 있으면 첫 번째 행을 사용
+        self.name_to_row = {}
+        for row, name in enumerate(self.names):
+            if isinstance(name, str):
+                self.name_to_row.setdefault(name, row)
+
+    @classmethod
+    def from_frame(cls, user_data):
+        """
+        사용자 데이터 DataFrame으로부터 행렬을 만듭니다.
+
+        Args:
+            user_data (pd.DataFrame): "이름" 열과 메뉴별 점수 열을 가지는 사용자 데이터.
+
+        Returns:
+            UserMatrix: 사용자 행렬.
+        """
+        menu_columns = user_data.columns.drop("이름")
+        values = user_data[menu_columns].to_numpy(dtype=float)
+        missing = np.isnan(values)
+        names = [name if isinstance(name, str) else None for name in user_data["이름"]]
+        return cls(names, menu_columns, np.where(missing, 0, values), missing)
+
+    @classmethod
+    def from_user_file(cls, user_file_path, chunk_size=100000):
+        """
+        사용자 데이터 파일(과 추가 로그)을 청크 단위로 읽어 행렬을 만듭니다.
+        전체 사용자 데이터를 float DataFrame으로 메모리에 올리지 않으므로 최대 메모리는 청크 하나 크기입니다.
+
+        Args:
+            user_file_path (str): 사용자 데이터 파일 경로.
+            chunk_size (int): 한 번에 읽을 행 수.
+
+        Returns:
+            UserMatrix: 사용자 행렬.
+        """
+        user_store = UserStore(user_file_path)
+        names, scores, missing_bits = [], [], []
+        for chunk in user_store.snapshot_chunks(chunk_size):
+            part = cls.from_frame(chunk)
+            names += part.names
+            scores.append(part.scores)
+            missing_bits.append(part.missing_bits)
+        user_matrix = cls(names, part.menus, np.concatenate(scores), missing_bits=np.concatenate(missing_bits))
+        user_matrix.position = user_store.position
+        return user_matrix
+
+    def appended(self, user_file_path):
+        """
+        이 행렬을 읽은 뒤 추가 로그에 더해진 사용자만 읽어 끝에 붙인 새 행렬을 반환합니다. 이 행렬은 바꾸지 않습니다.
+        파일을 다시 읽거나 체크섬을 계산하지 않으므로 비용은 추가된 사용자 수(와 배열 복사)에 비례합니다.
+
+        Args:
+            user_file_path (str): 이 행렬을 읽은 사용자 데이터 파일 경로.
+
+        Returns:
+            UserMatrix | None: 추가된 사용자가 없으면 자기 자신, 정리 등으로 본 CSV가 바뀌어 이어 읽을 수 없으면 None.
+        """
+        if self.position is None:
+            return None
+        user_store = UserStore(user_file_path)
+        rows = user_store.read_appended(self.position)
+        if rows is None:
+            return None
+        if not rows:
+            return self
+
+        part = UserMatrix.from_frame(pd.DataFrame(rows).reindex(columns=["이름"] + self.menus))
+        user_matrix = copy.copy(self)
+        user_matrix.names = self.names + part.names
+        user_matrix.scores = np.concatenate([self.scores, part.scores])
+        user_matrix.missing_bits = np.concatenate([self.missing_bits, part.missing_bits])
+        user_matrix.name_to_row = dict(self.name_to_row)
+        for row, name in enumerate(part.names, start=len(self.names)):
+            if isinstance(name, str):
+                user_matrix.name_to_row.setdefault(name, row)
+        user_matrix.position = user_store.position
+        return user_matrix
+
+    def fingerprint(self, n_rows=None):
+        """
+        앞 n_rows개 행 점수의 지문을 반환합니다. FINGERPRINT_BLOCK_ROWS행 블록들의 연쇄 해시 뒤에 나머지 행을
+        이어 해시하므로, 완전한 블록의 해시는 한 번만 계산되고 이후에는 마지막 불완전 블록만 해시합니다.
+        추가된 사용자를 붙인 행렬도 앞부분 블록의 해시를 그대로 이어 받습니다.
+
+        Args:
+            n_rows (int): 앞부분 행 수. None이면 전체입니다.
+
+        Returns:
+            str: 16진수 지문 문자열.
+        """
+        n_rows = len(self) if n_rows is None else n_rows
+        n_blocks = n_rows // FINGERPRINT_BLOCK_ROWS
+        digests = self._block_digests
+        if len(digests) < n_blocks:
+            # 다른 행렬과 공유하는 리스트일 수 있으므로 새 리스트에 이어 계산
+            digests = list(digests)
+            while len(digests) < n_blocks:
+                start = len(digests) * FINGERPRINT_BLOCK_ROWS
+                block = self.scores[start:start + FINGERPRINT_BLOCK_ROWS]
+                digests.append(_hash_rows(digests[-1] if digests else "", block))
+            self._block_digests = digests
+        base = digests[n_blocks - 1] if n_blocks else ""
+        return _hash_rows(base, self.scores[n_blocks * FINGERPRINT_BLOCK_ROWS:n_rows])
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, user_name):
+        return user_name in self.name_to_row
+
+    def row(self, user_name):
+        """
+        사용자의 행 번호를 반환합니다. 없는 사용자이면 None을 반환합니다.
+        """
+        return self.name_to_row.get(user_name)
+
+    @property
+    def missing(self):
+        """
+        사용자×메뉴 결측 여부 bool 배열입니다. (호출할 때마다 압축을 풉니다)
+        """
+        return np.unpackbits(self.missing_bits, axis=1, count=len(self.menus)).astype(bool)
+
+    def _require_row(self, user_name):
+        row = self.name_to_row.get(user_name)
+        if row is None:
+            raise ValueError(f"사용자 '{user_name}'를 데이터에서 찾을 수 없습니다.")
+        return row
+
+    def missing_row(self, user_name):
+        """
+        사용자의 메뉴별 결측 여부를 반환합니다.
+        """
+        row = self._require_row(user_name)
+        return np.unpackbits(self.missing_bits[row], count=len(self.menus)).astype(bool)
+
+    def scores_of(self, user_name):
+        """
+        사용자의 메뉴별 점수(int8, 결측은 0)를 반환합니다.
+        """
+        return self.scores[self._require_row(user_name)]
+
+    def preferences(self, user_name):
+        """
+        사용자가 응답한 메뉴의 점수를 반환합니다.
+
+        Args:
+            user_name (str): 사용자 이름.
+
+        Returns:
+            dict: {메뉴: 선호도 점수} 형식의 사전. 점수는 float입니다.
+        """
+        scores = self.scores_of(user_name)
+        answered = np.flatnonzero(~self.missing_row(user_name))
+        return {self.menus[idx]: float(scores[idx]) for idx in answered}
+
+    def menus_with_score(self, user_name, score):
+        """
+        사용자가 특정 점수를 준 메뉴를 열 순서대로 반환합니다.
+
+        Args:
+            user_name (str): 사용자 이름.
+            score (int): 찾을 점수 (1~4).
+
+        Returns:
+            list: 메뉴 이름 리스트.
+        """
+        return [self.menus[idx] for idx in np.flatnonzero(self.scores_of(user_name) == score)]
+
+    def scores_for_menus(self, menus):
+        """
+        주어진 메뉴 순서에 맞춘 사용자×메뉴 점수 배열을 반환합니다. 없는 메뉴의 점수는 0입니다.
+        순서가 같으면 복사하지 않습니다.
+
+        Args:
+            menus (list): 메뉴 이름 순서.
+
+        Returns:
+            np.ndarray: int8 사용자×메뉴 점수 배열.
+        """
+        menus = list(menus)
+        if menus == self.menus:
+            return self.scores
+        positions = np.array([self.menu_positions.get(menu, -1) for menu in menus], dtype=np.intp)
+        aligned = self.scores[:, np.maximum(positions, 0)]
+        aligned[:, positions < 0] = 0
+        return aligned
+
+
+def get_user_matrix(user_file_path):
+    """
+    공유 데이터 저장소에서 사용자 행렬을 가져옵니다. 사용자 데이터가 바뀐 경우에만 다시 만듭니다.
+
+    Args:
+        user_file_path (str): 사용자 데이터 파일 경로.
+
+    Returns:
+        UserMatrix: 사용자 행렬.
+    """
+    # 사용자 데이터 DataFrame을 거치지 않고 파일에서 바로 만듦 (DataFrame은 필요한 호출자만 따로 로드)
+    # 새 사용자가 추가 로그에 더해지기만 했으면 추가된 행만 읽어 붙임
+    # 다른 프로세스가 공유 메모리에 게시한 행렬이 등록되어 있으면 그 행렬을 반환 (src.shared_data.use_shared_data)
+    return get_data_store().get_user_file(
+        user_file_path, "user_matrix", UserMatrix.from_user_file, updater=UserMatrix.appended
+    )
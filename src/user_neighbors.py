@@ -0,0 +1,351 @@
+"""
+입맛이 비슷한 동료(점심 친구)를 찾는 사용자 유사도 색인입니다.
+
+사용자마다 메뉴 점수 벡터를 미리 단위 벡터로 정규화해 (사용자 × 메뉴) float32 행렬로 보관하므로,
+한 사용자의 유사 사용자 조회는 행렬-벡터 곱 한 번과 상위 k개 선택(argpartition)입니다.
+여러 사용자를 한 번에 조회할 때는 사용자 행을 block_size개씩 나누어 계산해 메모리를 제한합니다.
+
+유사도 종류 (metric):
+    - "centered": 사용자별 평균 점수를 뺀 뒤의 코사인 유사도 (점수를 후하게/박하게 주는 습관을 보정, 기본값)
+    - "cosine": 원래 점수의 코사인 유사도
+응답하지 않은 메뉴는 0으로 두어 유사도에 기여하지 않습니다.
+
+사용자가 아주 많으면 approximate=True로 무작위 초평면 해싱(LSH, SimHash) 후보만 정확히 다시 계산할 수 있습니다.
+새 사용자는 행렬 끝에 추가되며(add_new_user가 호출), 해시 색인은 추가된 사용자가 충분히 쌓이면 다시 만듭니다.
+"""
+import argparse
+import copy
+import math
+
+import numpy as np
+
+from src.data_store import get_data_store
+from src.similarity_graph import normalize_rows
+from src.user_matrix import get_user_matrix
+
+METRICS = ("centered", "cosine")
+
+# 사용자가 이 수보다 적으면 approximate=True여도 정확히 계산 (후보를 고르는 비용이 더 큼)
+MIN_APPROXIMATE_USERS = 5000
+
+
+def user_vectors(scores, metric="centered"):
+    """
+    사용자 점수를 정규화된 유사도 계산용 벡터로 바꿉니다.
+
+    Args:
+        scores (np.ndarray): int8 사용자×메뉴 점수 배열 (결측은 0).
+        metric (str): "centered" 또는 "cosine".
+
+    Returns:
+        np.ndarray: 행마다 크기가 1(응답이 없으면 0)인 float32 배열.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"지원하지 않는 metric입니다: {metric}")
+    values = np.asarray(scores, dtype=np.float32)
+    if metric == "centered":
+        answered = values > 0
+        counts = np.maximum(answered.sum(axis=1, keepdims=True), 1)
+        values = np.where(answered, values - values.sum(axis=1, keepdims=True) / counts, 0.0).astype(np.float32)
+    return normalize_rows(values)
+
+
+def _check_top_k(top_k):
+    if top_k < 1:
+        raise ValueError("top_k는 1 이상이어야 합니다.")
+
+
+class HyperplaneHash:
+    """
+    코사인 유사도용 무작위 초평면 해시(LSH) 색인입니다. 해시 테이블마다 n_bits개의 초평면 부호로
+    사용자를 버킷에 나누고, 조회할 때는 같은 버킷과 비트 하나만 다른 버킷의 사용자를 후보로 반환합니다.
+    """
+
+    def __init__(self, vectors, n_tables=8, n_bits=None, seed=0):
+        """
+        Args:
+            vectors (np.ndarray): 정규화된 사용자 벡터.
+            n_tables (int): 해시 테이블 수. 많을수록 정확하지만 후보가 늘어납니다.
+            n_bits (int): 테이블마다 사용할 초평면 수. None이면 버킷당 평균 약 32명이 되도록 정합니다.
+            seed (int): 초평면 난수 시드.
+        """
+        n_rows = len(vectors)
+        if n_bits is None:
+            n_bits = int(np.clip(math.log2(max(n_rows, 1) / 32), 4, 20))
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((vectors.shape[1], n_tables * n_bits)).astype(np.float32)
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.n_rows = n_rows
+        # 테이블별로 해시값 순서로 정렬한 행 번호와 해시값 (버킷은 searchsorted로 찾음)
+        codes = self.codes(vectors)
+        self.order = np.argsort(codes, axis=0, kind="stable")
+        self.sorted_codes = np.take_along_axis(codes, self.order, axis=0)
+
+    def codes(self, vectors):
+        """
+        벡터의 테이블별 해시값을 반환합니다.
+
+        Returns:
+            np.ndarray: (벡터 수 × 테이블 수) int64 배열.
+        """
+        bits = (vectors @ self.planes > 0).reshape(len(vectors), self.n_tables, self.n_bits)
+        return bits.astype(np.int64) @ (1 << np.arange(self.n_bits, dtype=np.int64))
+
+    def candidates(self, vector):
+        """
+        vector와 같은 버킷 또는 해시값이 비트 하나만 다른 버킷에 있는 행 번호를 반환합니다.
+        """
+        codes = self.codes(vector[None, :])[0]
+        # 테이블마다 (1 + n_bits)개의 버킷을 조회
+        probes = codes[None, :] ^ np.concatenate([[0], 1 << np.arange(self.n_bits, dtype=np.int64)])[:, None]
+        rows = []
+        for table in range(self.n_tables):
+            starts = np.searchsorted(self.sorted_codes[:, table], probes[:, table], side="left")
+            stops = np.searchsorted(self.sorted_codes[:, table], probes[:, table], side="right")
+            rows.extend(self.order[start:stop, table] for start, stop in zip(starts, stops) if stop > start)
+        if not rows:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.concatenate(rows))
+
+
+class UserNeighborIndex:
+    """
+    정규화된 사용자 벡터 행렬과 이름 색인입니다. 만든 뒤에는 바뀌지 않으며, 새 사용자는 extended로 추가한 새 색인을 만듭니다.
+    """
+
+    def __init__(self, user_matrix, metric="centered"):
+        """
+        Args:
+            user_matrix (UserMatrix): 사용자 행렬.
+            metric (str): "centered" 또는 "cosine".
+        """
+        self.metric = metric
+        self.menus = list(user_matrix.menus)
+        self.names = list(user_matrix.names)
+        self.name_to_row = dict(user_matrix.name_to_row)
+        # 색인을 만든 사용자 점수의 지문 (extended에서 기존 사용자 점수가 그대로인지 확인)
+        self.fingerprint = user_matrix.fingerprint()
+        vectors = user_vectors(user_matrix.scores, metric)
+        # 추가할 공간을 미리 확보한 버퍼 (앞 len(names)개 행만 유효)
+        self._buffer = np.zeros((max(len(vectors) * 2, 16), len(self.menus)), dtype=np.float32)
+        self._buffer[:len(vectors)] = vectors
+        # 버퍼를 공유하는 색인들 중 가장 긴 색인이 쓰는 행 수 (extended 참고)
+        self._buffer_rows = [len(vectors)]
+        self._named = np.array([isinstance(name, str) for name in self.names], dtype=bool)
+        self._hash = None
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def vectors(self):
+        """
+        유효한 사용자 벡터 (사용자 수 × 메뉴 수) 입니다.
+        """
+        return self._buffer[:len(self.names)]
+
+    def extended(self, user_matrix):
+        """
+        user_matrix에서 색인에 없는 뒤쪽 행(새 사용자)만 벡터로 만들어 추가한 새 색인을 반환합니다.
+        이 색인은 바꾸지 않으므로 다른 스레드가 조회 중이어도 안전합니다. 벡터 버퍼는 공유하되
+        이 색인이 읽지 않는 뒤쪽 행에만 쓰고, 이미 다른 색인이 그 행을 쓰고 있으면 버퍼를 복사합니다.
+        기존 사용자의 점수가 바뀌었는지는 점수 지문으로 확인하므로 (UserMatrix.fingerprint),
+        비용은 전체 사용자 수가 아니라 추가된 사용자 수에 비례합니다. 바뀌었으면 추가할 수 없으므로 None을 반환합니다.
+
+        Args:
+            user_matrix (UserMatrix): 기존 사용자 행이 앞부분에 그대로 있는 사용자 행렬.
+
+        Returns:
+            UserNeighborIndex | None: 새 사용자를 추가한 색인.
+        """
+        n_rows = len(self.names)
+        if (
+            user_matrix.menus != self.menus
+            or len(user_matrix) < n_rows
+            or user_matrix.fingerprint(n_rows) != self.fingerprint
+        ):
+            return None
+        new_vectors = user_vectors(user_matrix.scores[n_rows:], self.metric)
+        n_total = n_rows + len(new_vectors)
+        buffer, buffer_rows = self._buffer, self._buffer_rows
+        if n_total > len(buffer) or buffer_rows[0] != n_rows:
+            # 두 배씩 늘려 추가 비용을 사용자 한 명당 상수로 유지
+            buffer = np.zeros((max(n_total, len(buffer) * 2), len(self.menus)), dtype=np.float32)
+            buffer[:n_rows] = self._buffer[:n_rows]
+            buffer_rows = [n_rows]
+        buffer[n_rows:n_total] = new_vectors
+        buffer_rows[0] = n_total
+
+        new_names = list(user_matrix.names[n_rows:])
+        index = copy.copy(self)
+        index._buffer, index._buffer_rows = buffer, buffer_rows
+        index.name_to_row = dict(self.name_to_row)
+        for row, name in enumerate(new_names, start=n_rows):
+            if isinstance(name, str):
+                index.name_to_row.setdefault(name, row)
+        index._named = np.concatenate([self._named, [isinstance(name, str) for name in new_names]]).astype(bool)
+        index.fingerprint = user_matrix.fingerprint()
+        index.names = self.names + new_names
+        return index
+
+    def _row(self, user_name):
+        row = self.name_to_row.get(user_name)
+        if row is None:
+            raise ValueError(f"사용자 '{user_name}'를 데이터에서 찾을 수 없습니다.")
+        return row
+
+    def _candidate_rows(self, row):
+        """
+        해시 색인으로 고른 후보 행과 해시 색인을 만든 뒤 추가된 행을 반환합니다.
+        """
+        n_rows = len(self.names)
+        # 해시 색인 이후 추가된 사용자가 10%를 넘으면 다시 만듦
+        if self._hash is None or (n_rows - self._hash.n_rows) * 10 > self._hash.n_rows:
+            self._hash = HyperplaneHash(self.vectors)
+        added = np.arange(self._hash.n_rows, n_rows)
+        return np.concatenate([self._hash.candidates(self._buffer[row]), added])
+
+    def _top(self, similarities, rows, exclude, top_k):
+        # 자기 자신과 이름이 없는 행을 제외하고 상위 k개를 고름
+        valid = (rows != exclude) & self._named[rows]
+        similarities = np.where(valid, similarities, -np.inf)
+        top_k = min(top_k, int(valid.sum()))
+        if top_k <= 0:
+            return []
+        top = np.argpartition(-similarities, top_k - 1)[:top_k]
+        top = top[np.argsort(-similarities[top], kind="stable")]
+        return [(self.names[rows[idx]], float(similarities[idx])) for idx in top]
+
+    def nearest(self, user_name, top_k=10, approximate=False):
+        """
+        입맛이 가장 비슷한 사용자를 반환합니다.
+
+        Args:
+            user_name (str): 기준 사용자 이름.
+            top_k (int): 반환할 사용자 수.
+            approximate (bool): True이고 사용자가 MIN_APPROXIMATE_USERS명 이상이면 해시 색인의 후보만 계산합니다.
+                후보가 top_k명보다 적으면 정확히 계산합니다.
+
+        Returns:
+            list: (사용자 이름, 유사도) 튜플 리스트. 유사도 내림차순.
+        """
+        _check_top_k(top_k)
+        row = self._row(user_name)
+        if approximate and len(self.names) >= MIN_APPROXIMATE_USERS:
+            rows = self._candidate_rows(row)
+            if len(rows) > top_k:
+                return self._top(self._buffer[rows] @ self._buffer[row], rows, row, top_k)
+        return self.nearest_many([user_name], top_k)[0]
+
+    def nearest_many(self, user_names, top_k=10, block_size=8192):
+        """
+        여러 사용자의 유사 사용자를 정확히 계산합니다. 사용자 행을 block_size개씩 나누어
+        (조회 사용자 수 × block_size) 크기의 유사도 블록만 메모리에 올리고 블록별 상위 k개를 합칩니다.
+
+        Args:
+            user_names (list): 기준 사용자 이름 리스트.
+            top_k (int): 사용자마다 반환할 사용자 수.
+            block_size (int): 한 번에 계산할 사용자 행 수.
+
+        Returns:
+            list: 사용자마다 (사용자 이름, 유사도) 튜플 리스트.
+        """
+        _check_top_k(top_k)
+        query_rows = np.array([self._row(name) for name in user_names], dtype=np.intp)
+        queries = self._buffer[query_rows]
+        n_rows = len(self.names)
+        named = self._named
+        best_rows = np.empty((len(query_rows), 0), dtype=np.intp)
+        best_values = np.empty((len(query_rows), 0), dtype=np.float32)
+        for start in range(0, n_rows, block_size):
+            stop = min(start + block_size, n_rows)
+            similarities = queries @ self._buffer[start:stop].T
+            similarities[:, ~named[start:stop]] = -np.inf
+            inside = (query_rows >= start) & (query_rows < stop)
+            similarities[np.flatnonzero(inside), query_rows[inside] - start] = -np.inf  # 자기 자신 제외
+
+            # 지금까지의 상위 k개와 이번 블록을 합쳐 다시 상위 k개만 남김
+            values = np.concatenate([best_values, similarities], axis=1)
+            rows = np.concatenate([best_rows, np.broadcast_to(np.arange(start, stop), similarities.shape)], axis=1)
+            keep = min(top_k, values.shape[1])
+            top = np.argpartition(-values, keep - 1, axis=1)[:, :keep]
+            best_values = np.take_along_axis(values, top, axis=1)
+            best_rows = np.take_along_axis(rows, top, axis=1)
+
+        results = []
+        order = np.argsort(-best_values, axis=1, kind="stable")
+        for query_idx in range(len(query_rows)):
+            results.append([
+                (self.names[best_rows[query_idx, idx]], float(best_values[query_idx, idx]))
+                for idx in order[query_idx]
+                if np.isfinite(best_values[query_idx, idx])
+            ])
+        return results
+
+
+def get_user_neighbor_index(user_file_path, metric="centered"):
+    """
+    사용자 데이터 버전에 맞는 유사 사용자 색인을 가져옵니다. 사용자가 추가되기만 했다면
+    이전 색인에 새 사용자 행만 추가하고, 그 밖에 점수가 바뀐 경우에는 다시 만듭니다.
+
+    Args:
+        user_file_path (str): 사용자 데이터 파일 경로.
+        metric (str): "centered" 또는 "cosine".
+
+    Returns:
+        UserNeighborIndex: 유사 사용자 색인.
+    """
+    store = get_data_store()
+    user_matrix = get_user_matrix(user_file_path)
+    name = f"user_neighbors.{metric}"
+    previous = store.previous_derived(name, (user_file_path,))
+
+    def build():
+        index = previous.extended(user_matrix) if previous is not None else None
+        return index if index is not None else UserNeighborIndex(user_matrix, metric)
+
+    return store.get_derived(name, (user_file_path,), build)
+
+
+def find_lunch_buddies(user_name, user_file_path, top_k=5, metric="centered", approximate=False):
+    """
+    입맛이 비슷한 동료와 함께 좋아하는(둘 다 4점) 메뉴를 찾습니다.
+
+    Args:
+        user_name (str): 기준 사용자 이름.
+        user_file_path (str): 사용자 데이터 파일 경로.
+        top_k (int): 찾을 동료 수.
+        metric (str): "centered" 또는 "cosine".
+        approximate (bool): 사용자가 많을 때 해시 색인으로 근사 검색합니다.
+
+    Returns:
+        list: [{"name": 이름, "similarity": 유사도, "common_favorites": [메뉴, ...]}, ...]
+    """
+    index = get_user_neighbor_index(user_file_path, metric)
+    user_matrix = get_user_matrix(user_file_path)
+    favorites = user_matrix.scores_of(user_name) == 4
+    buddies = []
+    for name, similarity in index.nearest(user_name, top_k, approximate):
+        common = np.flatnonzero(favorites & (user_matrix.scores_of(name) == 4))
+        buddies.append({
+            "name": name,
+            "similarity": similarity,
+            "common_favorites": [user_matrix.menus[idx] for idx in common],
+        })
+    return buddies
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="입맛이 비슷한 동료를 찾습니다.")
+    parser.add_argument("user", help="기준 사용자 이름")
+    parser.add_argument("--users-file", default="data/processed_user_data.csv", help="사용자 데이터 파일 경로")
+    parser.add_argument("--top", type=int, default=5, help="찾을 동료 수")
+    parser.add_argument("--metric", choices=METRICS, default="centered", help="유사도 종류")
+    parser.add_argument("--approximate", action="store_true", help="해시 색인으로 근사 검색합니다.")
+    args = parser.parse_args()
+
+    for rank, buddy in enumerate(find_lunch_buddies(args.user, args.users_file, args.top, args.metric, args.approximate), start=1):
+        print(f"{rank}. {buddy['name']} (유사도: {buddy['similarity']:.2f})")
+        if buddy["common_favorites"]:
+            print(f"   함께 좋아하는 메뉴: {', '.join(buddy['common_favorites'][:5])}")
@@ -0,0 +1,355 @@
+"""
+사용자 데이터의 추가 전용(append-only) 저장소입니다.
+
+새 사용자는 전체 CSV를 다시 쓰지 않고 옆의 로그 파일(<csv 이름>.log.jsonl)에 한 줄씩 추가됩니다.
+쓰기, 읽기, 정리(compaction)는 모두 잠금 파일(<csv 이름>.lock)로 직렬화되므로,
+여러 사람이 동시에 설문을 마쳐도 데이터가 사라지지 않고 읽는 쪽은 항상 일관된 스냅샷을 봅니다.
+정리 작업은 로그를 본 CSV에 합친 뒤 원자적으로 교체하고 로그를 비웁니다.
+교체 직전에 새 CSV 파일과 합친 로그 길이를 정리 기록(<csv 이름>.compact.json)에 남기므로, CSV 교체와
+로그 비우기 사이에 중단되어도 이미 합쳐진 로그 행을 다시 읽지 않고 다음 쓰기에서 정리를 마저 끝냅니다.
+"""
+import csv
+import json
+import os
+import shutil
+import threading
+
+import pandas as pd
+
+from src.file_utils import atomic_write, file_lock
+
+
+# "007"처럼 숫자로 보이는 이름도 문자열로 읽음 (청크마다 열 종류를 추측하면 숫자가 되어 사용자가 사라짐)
+NAME_DTYPE = {"이름": str}
+
+
+def log_path_for(user_file_path):
+    """
+    사용자 데이터 파일에 대응하는 추가 로그 파일 경로를 반환합니다.
+    """
+    return os.path.splitext(user_file_path)[0] + ".log.jsonl"
+
+
+def lock_path_for(user_file_path):
+    """
+    사용자 데이터 파일에 대응하는 잠금 파일 경로를 반환합니다.
+    """
+    return os.path.splitext(user_file_path)[0] + ".lock"
+
+
+def compaction_path_for(user_file_path):
+    """
+    사용자 데이터 파일에 대응하는 정리 기록 파일 경로를 반환합니다.
+    """
+    return os.path.splitext(user_file_path)[0] + ".compact.json"
+
+
+def _repair_tail(file_path):
+    # 이전 쓰기가 중간에 끊겨 줄바꿈 없이 끝난 마지막 줄을 잘라냄 (잠금을 잡은 상태에서 호출)
+    try:
+        with open(file_path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b"\n":
+                return
+            f.seek(0)
+            content = f.read()
+            f.truncate(content.rfind(b"\n") + 1)
+    except FileNotFoundError:
+        return
+
+
+def _count_csv_fields(line):
+    return len(next(csv.reader([line.decode("utf-8", errors="replace").rstrip("\r\n")])))
+
+
+def _repair_csv_tail(file_path):
+    # 본 CSV가 줄바꿈 없이 끝났을 때, 마지막 행의 열 수가 헤더와 같으면 (직접 편집한 CSV) 줄바꿈만 붙이고
+    # 모자라면 (이전 쓰기가 중간에 끊긴 행) 마지막 줄바꿈까지 잘라냄 (잠금을 잡은 상태에서 호출)
+    with open(file_path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) == b"\n":
+            return
+
+        # 파일 전체를 읽지 않도록 끝에서부터 블록 단위로 마지막 줄바꿈을 찾음
+        line_start, position = 0, size
+        while position > 0:
+            start = max(0, position - (1 << 16))
+            f.seek(start)
+            newline = f.read(position - start).rfind(b"\n")
+            if newline >= 0:
+                line_start = start + newline + 1
+                break
+            position = start
+        if line_start == 0:
+            f.write(b"\n")
+            return
+
+        f.seek(0)
+        header = f.readline()
+        f.seek(line_start)
+        if _count_csv_fields(f.read()) == _count_csv_fields(header):
+            f.write(b"\n")
+        else:
+            f.truncate(line_start)
+
+
+class UserStore:
+    """
+    사용자 데이터 CSV와 추가 로그를 함께 관리합니다.
+    """
+
+    def __init__(self, user_file_path):
+        """
+        Args:
+            user_file_path (str): 사용자 데이터 파일 경로.
+        """
+        self.user_file_path = user_file_path
+        self.log_path = log_path_for(user_file_path)
+        self.lock_path = lock_path_for(user_file_path)
+        self.compaction_path = compaction_path_for(user_file_path)
+        # 마지막으로 snapshot_chunks나 read_appended로 읽은 위치 (read_appended 참고)
+        self.position = None
+
+    def append(self, user_rows):
+        """
+        사용자 행을 로그 끝에 추가합니다. 비용은 기존 사용자 수와 무관합니다.
+        모든 행이 기록되고 디스크에 반영(fsync)된 뒤에 반환됩니다.
+
+        Args:
+            user_rows (list): {"이름": ..., 메뉴: 점수, ...} 형식의 딕셔너리 리스트.
+        """
+        lines = "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in user_rows)
+        with file_lock(self.lock_path):
+            self._finish_compaction()
+            _repair_tail(self.log_path)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def append_csv_rows(self, rows_path, names=None):
+        """
+        미리 만들어 둔 CSV 행 파일(헤더 없음, 본 CSV와 같은 열 순서)을 한 번의 쓰기로 본 CSV 끝에 붙입니다.
+        대량 가져오기용이며, 로그를 거치지 않으므로 이후 스냅샷도 CSV 읽기 비용만 듭니다.
+        로그에 남은 행이 있으면 먼저 본 CSV에 합쳐 추가된 순서를 유지합니다.
+        쓰는 도중 오류가 나면 본 CSV를 원래 길이로 되돌립니다.
+
+        Args:
+            rows_path (str): 붙일 CSV 행 파일 경로.
+            names (list): 붙일 행들의 이름. 지정하면 잠금을 잡은 뒤 이미 있는 이름과 겹치는지 다시 확인하고,
+                겹치면 아무것도 붙이지 않고 ValueError를 발생시킵니다.
+        """
+        with file_lock(self.lock_path):
+            self._finish_compaction()
+            if self._read_log():
+                self._compact_locked()
+            _repair_csv_tail(self.user_file_path)
+
+            # 검증 이후 잠금을 잡기 전에 다른 곳에서 같은 이름이 추가되었을 수 있으므로 다시 확인
+            if names is not None:
+                taken_names = set(pd.read_csv(self.user_file_path, usecols=["이름"], dtype=str)["이름"])
+                duplicates = sorted(taken_names.intersection(names))
+                if duplicates:
+                    raise ValueError(f"이미 있는 이름이 포함되어 있습니다: {', '.join(duplicates[:10])}")
+
+            with open(self.user_file_path, "rb+") as f, open(rows_path, "rb") as rows:
+                original_size = f.seek(0, os.SEEK_END)
+                try:
+                    shutil.copyfileobj(rows, f, 1 << 20)
+                    f.flush()
+                    os.fsync(f.fileno())
+                except BaseException:
+                    f.truncate(original_size)
+                    raise
+
+    def _committed_log_bytes(self):
+        # 정리가 CSV 교체 후 로그를 비우기 전에 중단되었다면, 본 CSV에 이미 합쳐진 로그 앞부분의 바이트 수
+        try:
+            with open(self.compaction_path, encoding="utf-8") as f:
+                record = json.load(f)
+            stat = os.stat(self.user_file_path)
+        except FileNotFoundError:
+            return 0
+        return record["log_bytes"] if record["user_file_id"] == [stat.st_dev, stat.st_ino] else 0
+
+    def _finish_compaction(self):
+        # 중단된 정리를 마무리함 (잠금을 잡은 상태에서 호출)
+        if not os.path.exists(self.compaction_path):
+            return
+        committed = self._committed_log_bytes()
+        if committed:
+            with open(self.log_path, "rb") as f:
+                f.seek(committed)
+                remainder = f.read()
+            with atomic_write(self.log_path, mode="wb") as f:
+                f.write(remainder)
+        os.remove(self.compaction_path)
+
+    def _read_log(self):
+        # 이미 본 CSV에 합쳐진 앞부분을 건너뛰고 로그의 행을 읽음
+        return self._read_log_from(self._committed_log_bytes())[0]
+
+    def _read_log_from(self, offset):
+        # offset부터 줄바꿈으로 끝난(완전히 기록된) 줄만 읽고, (행 리스트, 읽은 끝 위치)를 반환
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], offset
+        complete = data[:data.rfind(b"\n") + 1]
+        rows = [json.loads(line) for line in complete.decode("utf-8").splitlines() if line.strip()]
+        return rows, offset + len(complete)
+
+    def _position(self, log_offset):
+        # 읽은 위치: 본 CSV의 정체(장치, inode, 크기, 수정 시각), 로그에서 읽은 끝 위치와 그 직전 바이트
+        # (정리로 CSV가 교체되거나 로그가 비워진 뒤 다시 쓰였으면 같은 위치라도 값이 달라짐)
+        stat = os.stat(self.user_file_path)
+        start = max(0, log_offset - 64)
+        tail = b""
+        if log_offset > 0:
+            try:
+                with open(self.log_path, "rb") as f:
+                    f.seek(start)
+                    tail = f.read(log_offset - start)
+            except FileNotFoundError:
+                tail = None
+        return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, log_offset, tail)
+
+    def _read_snapshot(self):
+        user_data = pd.read_csv(self.user_file_path, dtype=NAME_DTYPE)
+        log_rows = self._read_log()
+        if not log_rows:
+            return user_data
+        new_rows = pd.DataFrame(log_rows).reindex(columns=user_data.columns)
+        return pd.concat([user_data, new_rows], ignore_index=True)
+
+    def snapshot(self):
+        """
+        본 CSV와 로그를 합친 일관된 사용자 데이터를 반환합니다.
+
+        Returns:
+            pd.DataFrame: 사용자 데이터.
+        """
+        with file_lock(self.lock_path):
+            return self._read_snapshot()
+
+    def snapshot_chunks(self, chunk_size=100000):
+        """
+        snapshot과 같은 데이터를 chunk_size행씩 나누어 반환하는 제너레이터입니다. 마지막 청크는 로그의 행입니다.
+        끝까지 읽거나 닫을 때까지 잠금을 잡고 있으므로 받은 청크는 바로 처리해야 합니다.
+        로그를 읽은 뒤 읽은 위치를 self.position에 기록합니다.
+
+        Args:
+            chunk_size (int): 청크당 행 수.
+
+        Yields:
+            pd.DataFrame: 본 CSV와 같은 열을 가지는 사용자 데이터 청크. 적어도 한 개(빈 청크일 수 있음)를 반환합니다.
+        """
+        with file_lock(self.lock_path):
+            columns = pd.read_csv(self.user_file_path, nrows=0, dtype=NAME_DTYPE).columns
+            empty = True
+            for chunk in pd.read_csv(self.user_file_path, chunksize=chunk_size, dtype=NAME_DTYPE):
+                empty = False
+                yield chunk
+            log_rows, log_end = self._read_log_from(self._committed_log_bytes())
+            self.position = self._position(log_end)
+            if log_rows:
+                yield pd.DataFrame(log_rows).reindex(columns=columns)
+            elif empty:
+                yield pd.DataFrame(columns=columns)
+
+    def read_appended(self, position):
+        """
+        position까지 읽은 뒤 로그에 추가된 행만 읽습니다. 비용은 추가된 행 수에만 비례합니다.
+        그 사이 정리 등으로 본 CSV가 바뀌었거나 로그가 다시 쓰였으면 이어 읽을 수 없으므로 None을 반환하며,
+        이때 호출자는 전체를 다시 읽어야 합니다. 읽은 뒤 새 위치를 self.position에 기록합니다.
+
+        Args:
+            position (tuple): snapshot_chunks 또는 read_appended가 기록한 self.position.
+
+        Returns:
+            list | None: 추가된 {"이름": ..., 메뉴: 점수, ...} 행 리스트.
+        """
+        with file_lock(self.lock_path):
+            if os.path.exists(self.compaction_path) or self._position(position[4]) != position:
+                return None
+            rows, log_end = self._read_log_from(position[4])
+            self.position = self._position(log_end)
+            return rows
+
+    def pending_rows(self):
+        """
+        아직 본 CSV에 합쳐지지 않은 로그 행을 반환합니다.
+
+        Returns:
+            list: {"이름": ..., 메뉴: 점수, ...} 형식의 딕셔너리 리스트.
+        """
+        return self._read_log()
+
+    def pending_count(self):
+        """
+        아직 본 CSV에 합쳐지지 않은 로그 행 수를 반환합니다.
+        """
+        return len(self._read_log())
+
+    def compact(self):
+        """
+        로그를 본 CSV에 합치고 로그를 비웁니다.
+
+        Returns:
+            int: 합쳐진 행 수.
+        """
+        with file_lock(self.lock_path):
+            self._finish_compaction()
+            return self._compact_locked()
+
+    def _compact_locked(self):
+        # 잠금을 잡은 상태에서 호출
+        log_rows = self._read_log()
+        if not log_rows:
+            return 0
+        user_data = self._read_snapshot()
+        log_bytes = os.path.getsize(self.log_path)
+        with atomic_write(self.user_file_path) as f:
+            user_data.to_csv(f, index=False)
+            # 교체될 새 CSV 파일(임시 파일과 같은 inode)이 로그의 앞 log_bytes바이트를 포함한다고 기록
+            stat = os.fstat(f.fileno())
+            with atomic_write(self.compaction_path) as record:
+                json.dump({"user_file_id": [stat.st_dev, stat.st_ino], "log_bytes": log_bytes}, record)
+        with open(self.log_path, "w", encoding="utf-8") as f:
+            f.flush()
+            os.fsync(f.fileno())
+        os.remove(self.compaction_path)
+        return len(log_rows)
+
+    def start_background_compaction(self, interval=300, min_pending=1):
+        """
+        일정 간격으로 로그를 정리하는 데몬 스레드를 시작합니다.
+
+        Args:
+            interval (float): 정리 주기(초).
+            min_pending (int): 로그가 이 개수 이상일 때만 정리합니다.
+
+        Returns:
+            threading.Event: set()하면 스레드가 멈춥니다.
+        """
+        stop_event = threading.Event()
+
+        def run():
+            while not stop_event.wait(interval):
+                try:
+                    if self.pending_count() >= min_pending:
+                        self.compact()
+                except OSError as e:
+                    print(f"사용자 데이터 정리 중 오류가 발생했습니다: {e}")
+
+        threading.Thread(target=run, name="user-store-compaction", daemon=True).start()
+        return stop_event
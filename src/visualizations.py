@@ -1,9 +1,111 @@
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib import font_manager
+
+# 한글 폰트 후보 (Windows, macOS, Linux 순)
+KOREAN_FONT_CANDIDATES = [
+    "Malgun Gothic",
+    "AppleGothic",
+    "Apple SD Gothic Neo",
+    "NanumGothic",
+    "NanumBarunGothic",
+    "Noto Sans CJK KR",
+    "Noto Sans KR",
+    "UnDotum",
+]
+
+def set_korean_font():
+    """
+    설치된 한글 폰트 중 첫 번째 후보를 matplotlib 기본 폰트로 설정합니다.
+    :return: 설정한 폰트 이름 (한글 폰트가 없으면 None)
+    """
+    matplotlib.rcParams['axes.unicode_minus'] = False  # 마이너스 기호 깨짐 방지
+    installed_fonts = {font.name for font in font_manager.fontManager.ttflist}
+    for font_name in KOREAN_FONT_CANDIDATES:
+        if font_name in installed_fonts:
+            matplotlib.rcParams['font.family'] = font_name
+            return font_name
+    return None
 
 # 한글 폰트 설정
-plt.rcParams['font.family'] = 'Malgun Gothic'  # Windows
-plt.rcParams['axes.unicode_minus'] = False    # 마이너스 기호 깨짐 방지
+set_korean_font()
+
+def taste_report_data(analysis_results, taste_profile_columns, top_k=10):
+    """
+    개인 취향 차트에 사용할 맛 프로파일과 메뉴 분류 비율을 계산
+    :param analysis_results: UserAnalysis.analyze_user 결과
+    :param taste_profile_columns: "맛 프로파일" 계열 속성 열 이름
+    :param top_k: 시각화할 상위 속성 개수
+    :return: (맛 프로파일 Series, 메뉴 분류 비율 Series)
+    """
+    # 맛 프로파일
+    taste_profile_data = analysis_results["favorite_attributes"].filter(items=taste_profile_columns)
+    taste_profile_data = taste_profile_data[taste_profile_data >= 0.003]
+    taste_profile_data.index = taste_profile_data.index.str.replace("맛 프로파일_", "")
+    taste_profile_data = taste_profile_data.sort_values(ascending=False).head(top_k)
+
+    # 메뉴 분류
+    favorite_menu_details = analysis_results["favorite_menu_details"]
+    category_counts = favorite_menu_details["분류"].value_counts()
+    category_counts = category_counts / category_counts.sum()  # 정규화
+    return taste_profile_data, category_counts
+
+def _color_palette(data, base_color):
+    # 빈도에 따른 색상 설정 (빈도 높을수록 진한 색). seaborn은 가져오는 데 시간이 걸리므로 필요할 때 import
+    import seaborn as sns
+    return sns.light_palette(base_color, reverse=True, as_cmap=False, n_colors=len(data))
+
+def draw_taste_bars(axes, user_name, taste_profile_data, category_counts):
+    """
+    맛 프로파일과 메뉴 분류 바 차트를 주어진 두 축에 그림
+    :param axes: 바 차트를 그릴 축 2개
+    :param user_name: 사용자 이름
+    :param taste_profile_data: 맛 프로파일 Series
+    :param category_counts: 메뉴 분류 비율 Series
+    """
+    # 맛 프로파일 바 차트
+    taste_colors = _color_palette(taste_profile_data, "green")
+    for i, bar in enumerate(taste_profile_data.index):
+        axes[0].bar(bar, taste_profile_data.values[i], color=taste_colors[i])
+
+    axes[0].set_title(f"{user_name}님의 좋아하는 맛", fontsize=14)
+    axes[0].set_ylabel("빈도", fontsize=12)
+    axes[0].set_xlabel("속성", fontsize=12)
+    axes[0].tick_params(axis="x", rotation=45)
+
+    # 메뉴 분류 바 차트
+    category_colors = _color_palette(category_counts, "green")
+    for i, category in enumerate(category_counts.index):
+        axes[1].bar(category, category_counts.values[i], color=category_colors[i])
+
+    axes[1].set_title(f"{user_name}님의 메뉴 분류별 선호도", fontsize=14)
+    axes[1].set_ylabel("빈도", fontsize=12)
+    axes[1].set_xlabel("분류", fontsize=12)
+    axes[1].tick_params(axis="x", rotation=45)
+
+def draw_taste_radar(ax, user_name, taste_profile_data):
+    """
+    맛 프로파일 레이더 차트를 주어진 극좌표 축에 그림
+    :param ax: 극좌표(polar) 축
+    :param user_name: 사용자 이름
+    :param taste_profile_data: 맛 프로파일 Series
+    """
+    radar_taste_data = taste_profile_data.sort_index()  # 비슷한 속성을 붙이기 위해 정렬
+
+    radar_labels_taste = radar_taste_data.index.tolist()
+    radar_values_taste = radar_taste_data.values.tolist()
+    radar_values_taste += radar_values_taste[:1]  # 레이더 차트를 닫기 위해 첫 값 추가
+
+    radar_angles_taste = np.linspace(0, 2 * np.pi, len(radar_labels_taste), endpoint=False).tolist()
+    radar_angles_taste += radar_angles_taste[:1]
+
+    ax.fill(radar_angles_taste, radar_values_taste, color="lightgreen", alpha=0.4)
+    ax.plot(radar_angles_taste, radar_values_taste, color="green", linewidth=2)
+    ax.set_yticks([])
+    ax.set_xticks(radar_angles_taste[:-1])
+    ax.set_xticklabels(radar_labels_taste, fontsize=10)
+    ax.set_title(f"{user_name}님이 선호하는 맛", size=16, pad=20)
 
 def plot_attributes(attributes, title, color, save_path=None):
     """
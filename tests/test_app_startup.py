@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+import unittest
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from app.app import HEAVY_MODULES
+
+class TestAppStartup(unittest.TestCase):
+    def test_startup_skips_heavy_modules(self):
+        # 앱 모듈을 가져오기만 해서는 무거운 라이브러리가 로드되지 않아야 함
+        code = (
+            "import sys, app.app; "
+            f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=project_root, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.bulk_import import import_responses
+from src.user_store import UserStore
+import pandas as pd
+
+class TestBulkImport(unittest.TestCase):
+    def setUp(self):
+        # 사용자 데이터 사본과 메뉴 목록 준비
+        self.directory = tempfile.mkdtemp()
+        self.user_file_path = os.path.join(self.directory, "users.csv")
+        shutil.copy("data/processed_user_data.csv", self.user_file_path)
+        self.user_data = pd.read_csv(self.user_file_path)
+        self.menus = self.user_data.columns[1:].tolist()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _response(self, name, score=3):
+        return {"이름": name, **{menu: score for menu in self.menus}}
+
+    def test_csv_import_with_rejections(self):
+        # 잘못된 응답은 보고서로, 나머지는 사용자 데이터 끝에 순서대로 추가되어야 함
+        responses = pd.DataFrame([
+            self._response("새사용자1"),
+            self._response("연누"),  # 기존 사용자
+            self._response("새사용자1"),  # 앞 응답과 중복
+            self._response("새사용자2", score=5),  # 잘못된 점수
+            {**self._response("새사용자3"), self.menus[0]: None},  # 응답 누락
+            self._response("새사용자4", score=1),
+        ])
+        source_path = os.path.join(self.directory, "responses.csv")
+        responses.to_csv(source_path, index=False)
+
+        summary = import_responses(source_path, self.user_file_path, chunk_size=2)
+        self.assertEqual((summary["accepted"], summary["rejected"]), (2, 4))
+
+        report = pd.read_csv(summary["report_path"])
+        self.assertEqual(report["행"].tolist(), [2, 3, 4, 5])
+        self.assertEqual(report["사유"].tolist()[:2], ["중복된 이름", "중복된 이름"])
+
+        user_data = UserStore(self.user_file_path).snapshot()
+        self.assertEqual(user_data["이름"].tolist()[-2:], ["새사용자1", "새사용자4"])
+        self.assertEqual(user_data.iloc[-1, 1:].tolist(), [1] * len(self.menus))
+        pd.testing.assert_frame_equal(user_data.iloc[:len(self.user_data)], self.user_data, check_dtype=False)
+
+    def test_jsonl_import(self):
+        # JSONL 형식 오류, 알 수 없는 메뉴, 줄바꿈이 있는 이름은 거절되어야 함
+        source_path = os.path.join(self.directory, "responses.jsonl")
+        with open(source_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self._response("새사용자"), ensure_ascii=False) + "\n")
+            f.write("{잘못된 줄\n")
+            f.write(json.dumps({**self._response("다른사용자"), "없는메뉴": 2}, ensure_ascii=False) + "\n")
+            f.write(json.dumps(self._response("줄\n바꿈"), ensure_ascii=False) + "\n")
+            f.write(json.dumps(self._response("캐리지\r리턴"), ensure_ascii=False) + "\n")
+
+        summary = import_responses(source_path, self.user_file_path)
+        self.assertEqual((summary["accepted"], summary["rejected"]), (1, 4))
+        reasons = pd.read_csv(summary["report_path"])["사유"].tolist()
+        self.assertIn("알 수 없는 메뉴: 없는메뉴", reasons)
+        self.assertEqual(reasons[-2:], ["이름에 줄바꿈", "이름에 줄바꿈"])
+        self.assertEqual(UserStore(self.user_file_path).snapshot()["이름"].iloc[-1], "새사용자")
+
+if __name__ == "__main__":
+    unittest.main()
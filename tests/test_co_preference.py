@@ -0,0 +1,69 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.co_preference import MIN_CO_RATERS, CoPreferenceStats, get_co_preference, stats_path_for
+from src.user_matrix import UserMatrix
+import src.user_matrix as user_matrix_module
+from src.user_store import UserStore
+import numpy as np
+import pandas as pd
+
+class TestCoPreference(unittest.TestCase):
+    def setUp(self):
+        # 테스트용 데이터 준비
+        self.user_data = pd.read_csv("data/processed_user_data.csv")
+        self.user_matrix = UserMatrix.from_frame(self.user_data)
+
+    def test_matches_pairwise_pearson(self):
+        # 두 메뉴를 모두 평가한 사용자 기준 피어슨 상관계수와 같아야 함
+        similarity = CoPreferenceStats.build(self.user_matrix).similarity()
+        expected = self.user_data.iloc[:, 1:].corr(min_periods=MIN_CO_RATERS).fillna(0.0).to_numpy(copy=True)
+        np.fill_diagonal(expected, 1.0)
+        np.testing.assert_allclose(similarity, expected, atol=1e-12)
+
+    def test_incremental_matches_full(self):
+        # 앞부분 사용자로 만든 통계량에 새 사용자만 더한 결과가 전체 계산과 같아야 함
+        head = UserMatrix.from_frame(self.user_data.iloc[:40])
+        previous = CoPreferenceStats.build(head)
+        updated = CoPreferenceStats.build(self.user_matrix, previous)
+        self.assertEqual(updated.n_rows, len(self.user_data))
+        np.testing.assert_allclose(updated.similarity(), CoPreferenceStats.build(self.user_matrix).similarity())
+
+    def test_new_user_updates_saved_stats(self):
+        # 사용자 추가 후에는 파일 전체를 다시 읽거나 기존 행을 다시 해시하지 않고, 저장된 통계량에 새 행만 더해야 함
+        with tempfile.TemporaryDirectory() as directory, mock.patch("src.user_matrix.FINGERPRINT_BLOCK_ROWS", 16):
+            user_file_path = os.path.join(directory, "users.csv")
+            shutil.copy("data/processed_user_data.csv", user_file_path)
+            self.assertEqual(get_co_preference(user_file_path).n_rows, len(self.user_data))
+            self.assertTrue(os.path.exists(stats_path_for(user_file_path)))
+
+            new_user = {"이름": "새사용자", **{menu: 4 for menu in self.user_data.columns[1:]}}
+            UserStore(user_file_path).append([new_user])
+            with mock.patch.object(CoPreferenceStats, "empty", side_effect=AssertionError("전체 재계산")), \
+                    mock.patch.object(UserMatrix, "from_user_file", side_effect=AssertionError("전체 다시 읽기")), \
+                    mock.patch("src.data_store._file_checksum", side_effect=AssertionError("전체 체크섬")), \
+                    mock.patch("src.user_matrix._hash_rows", wraps=user_matrix_module._hash_rows) as hash_rows, \
+                    mock.patch.object(CoPreferenceStats, "add_scores", autospec=True,
+                                      side_effect=CoPreferenceStats.add_scores) as add_scores:
+                stats = get_co_preference(user_file_path)
+            add_scores.assert_called_once()
+            self.assertEqual(len(add_scores.call_args.args[1]), 1)
+            # 지문은 마지막 불완전 블록만 해시
+            self.assertTrue(all(len(call.args[1]) < 16 for call in hash_rows.call_args_list))
+
+            self.assertEqual(stats.n_rows, len(self.user_data) + 1)
+            full = CoPreferenceStats.build(UserMatrix.from_user_file(user_file_path))
+            self.assertEqual(stats.fingerprint, full.fingerprint)
+            np.testing.assert_allclose(stats.similarity(), full.similarity(), atol=1e-12)
+            self.assertEqual(CoPreferenceStats.load(stats_path_for(user_file_path)).fingerprint, stats.fingerprint)
+
+if __name__ == "__main__":
+    unittest.main()
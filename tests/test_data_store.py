@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.data_store import DataStore
+import pandas as pd
+
+class TestDataStore(unittest.TestCase):
+    def setUp(self):
+        # 테스트용 임시 사용자 데이터 파일 준비
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.user_file_path = os.path.join(self.temp_dir.name, "users.csv")
+        pd.DataFrame({"이름": ["연누"], "김치찌개": [4]}).to_csv(self.user_file_path, index=False)
+        self.store = DataStore()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_reuses_loaded_data(self):
+        # 파일이 바뀌지 않았으면 같은 객체를 반환해야 함
+        first = self.store.get_user_data(self.user_file_path)
+        second = self.store.get_user_data(self.user_file_path)
+        self.assertIs(first, second)
+
+    def test_reloads_changed_file(self):
+        # 파일 내용이 바뀌면 다시 로드해야 함
+        first = self.store.get_user_data(self.user_file_path)
+        version = self.store.version(self.user_file_path)
+        pd.DataFrame({"이름": ["연누", "야옹"], "김치찌개": [4, 1]}).to_csv(self.user_file_path, index=False)
+        os.utime(self.user_file_path, ns=(0, os.stat(self.user_file_path).st_mtime_ns + 10**9))
+
+        second = self.store.get_user_data(self.user_file_path)
+        self.assertIsNot(first, second)
+        self.assertEqual(len(second), 2)
+        self.assertNotEqual(version, self.store.version(self.user_file_path))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+import unittest
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.group_analysis import _load_group_inputs
+from src.group_partition import _local_search, group_satisfaction, partition_users
+from src.user_matrix import get_user_matrix
+import numpy as np
+
+class TestGroupPartition(unittest.TestCase):
+    def setUp(self):
+        # 테스트용 데이터 준비
+        self.user_file_path = "data/processed_user_data.csv"
+        self.correlation_matrix_path = "data/menu_correlation_matrix.csv"
+        self.user_names = list(get_user_matrix(self.user_file_path).name_to_row)[:30]
+
+    def test_partition_is_valid_and_improves(self):
+        # 모든 사용자가 정확히 한 그룹에 속하고, 인원 범위를 지키며, 무작위 분할보다 만족도가 높아야 함
+        result = partition_users(
+            self.user_names, self.user_file_path, self.correlation_matrix_path,
+            min_size=4, max_size=6, time_budget=30, n_restarts=2, seed=0,
+        )
+        members = [name for group in result["groups"] for name in group["users"]]
+        self.assertEqual(sorted(members), sorted(self.user_names))
+        for group in result["groups"]:
+            self.assertTrue(4 <= len(group["users"]) <= 6)
+        satisfaction = [group["satisfaction"] for group in result["groups"]]
+        self.assertEqual(satisfaction, sorted(satisfaction, reverse=True))
+        self.assertAlmostEqual(sum(satisfaction), result["total_satisfaction"])
+        self.assertTrue(all(group["recommendations"] for group in result["groups"]))
+
+        # 시간 예산이 0이면 무작위 초기 분할 그대로
+        initial, _, rounds = _local_search(
+            self.user_file_path, self.correlation_matrix_path, self.user_names, 4, 6, None, 0, time.time(),
+            64, 20, 2.0, 0.8, 0.0,
+        )
+        self.assertEqual(rounds, 0)
+        self.assertGreater(result["total_satisfaction"], initial)
+
+        # 만족도는 실제 1순위 추천 메뉴의 점수(랜덤 요소 0~0.1 제외) × 인원
+        inputs = _load_group_inputs(self.user_file_path, self.correlation_matrix_path)
+        groups = [group["users"] for group in result["groups"]]
+        np.testing.assert_allclose(group_satisfaction(inputs, groups), satisfaction)
+        for group in result["groups"]:
+            best = group["satisfaction"] / len(group["users"])
+            self.assertTrue(best <= group["recommendations"][0]["score"] <= best + 0.1)
+
+    def test_parallel_matches_sequential(self):
+        # 같은 시드면 작업 프로세스 수와 관계없이 같은 분할이어야 함
+        arguments = dict(min_size=4, max_size=8, time_budget=30, n_restarts=2, seed=1)
+        sequential = partition_users(self.user_names, self.user_file_path, self.correlation_matrix_path, **arguments)
+        parallel = partition_users(
+            self.user_names, self.user_file_path, self.correlation_matrix_path, n_jobs=2, **arguments
+        )
+        self.assertEqual(
+            [group["users"] for group in parallel["groups"]], [group["users"] for group in sequential["groups"]]
+        )
+
+    def test_invalid_input(self):
+        for user_names in ([], [" ", ""]):
+            with self.assertRaisesRegex(ValueError, "사용자 이름을 입력"):
+                partition_users(user_names, self.user_file_path, self.correlation_matrix_path)
+        with self.assertRaises(ValueError):
+            partition_users(self.user_names[:5], self.user_file_path, self.correlation_matrix_path, min_size=4, max_size=4)
+        with self.assertRaises(ValueError):
+            partition_users(self.user_names[:7] + ["없는사람"], self.user_file_path, self.correlation_matrix_path)
+        with self.assertRaises(ValueError):
+            partition_users(self.user_names[:8], self.user_file_path, self.correlation_matrix_path, n_groups=3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import sys
+import unittest
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+import datetime
+
+from src.group_analysis import group_seed, recommend_menus, recommend_menus_batch, recommendation_cache
+import numpy as np
+
+class TestGroupRecommend(unittest.TestCase):
+    def setUp(self):
+        # 테스트용 데이터 경로
+        self.user_data_path = "data/processed_user_data.csv"
+        self.correlation_matrix_path = "data/menu_correlation_matrix.csv"
+        self.groups = [["연누", "야옹"], ["김정민", "안태우"], ["권민혁", "류지학", "한규상", "이상호"]]
+
+    def test_recommend_menus(self):
+        # 선호 메뉴는 추천 목록에 포함되지 않아야 함
+        recommended_menus, random_recommendations = recommend_menus(
+            self.groups[0], self.user_data_path, self.correlation_matrix_path
+        )
+        self.assertEqual(len(recommended_menus), 3)
+        self.assertEqual(len(random_recommendations), 3)
+        recommended_names = {recommendation["menu"] for recommendation in recommended_menus}
+        self.assertFalse(recommended_names & set(random_recommendations))
+
+    def test_batch_matches_single(self):
+        # 배치 결과는 recommend_menus를 차례로 호출한 결과와 같아야 함
+        np.random.seed(0)
+        expected = [
+            recommend_menus(group, self.user_data_path, self.correlation_matrix_path)
+            for group in self.groups
+        ]
+        np.random.seed(0)
+        results = recommend_menus_batch(self.groups, self.user_data_path, self.correlation_matrix_path)
+        self.assertEqual(results, expected)
+
+    def test_seeded_results_are_cached(self):
+        # 같은 시드는 전역 난수 상태와 무관하게 같은 결과를 내고, 두 번째 요청은 캐시에서 반환
+        recommendation_cache.clear()
+        seed = group_seed(self.groups[2], datetime.date(2024, 5, 1))
+        self.assertEqual(seed, group_seed(list(reversed(self.groups[2])), datetime.date(2024, 5, 1)))
+        np.random.seed(1)
+        first = recommend_menus(self.groups[2], self.user_data_path, self.correlation_matrix_path, seed=seed)
+        np.random.seed(2)
+        second = recommend_menus(list(reversed(self.groups[2])), self.user_data_path, self.correlation_matrix_path, seed=seed)
+        self.assertEqual(first[0], second[0])
+        self.assertEqual(list(first[1]), list(second[1]))
+        self.assertEqual((recommendation_cache.hits, recommendation_cache.misses), (1, 1))
+
+        batch = recommend_menus_batch(self.groups[2:], self.user_data_path, self.correlation_matrix_path, seeds=[seed])
+        self.assertEqual(list(batch[0][1]), list(first[1]))
+
+    def test_collaborative_weight(self):
+        # 협업 유사도를 섞으면 점수가 달라지지만 추천 형식은 같아야 함
+        content = recommend_menus(self.groups[0], self.user_data_path, self.correlation_matrix_path, seed=0)
+        blended = recommend_menus(
+            self.groups[0], self.user_data_path, self.correlation_matrix_path, seed=0, collaborative_weight=0.5
+        )
+        self.assertEqual(len(blended[0]), 3)
+        self.assertNotEqual([r["score"] for r in content[0]], [r["score"] for r in blended[0]])
+        with self.assertRaises(ValueError):
+            recommend_menus(self.groups[0], self.user_data_path, self.correlation_matrix_path, collaborative_weight=2)
+
+if __name__ == "__main__":
+    unittest.main()
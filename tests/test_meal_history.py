@@ -0,0 +1,96 @@
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.group_analysis import recommend_menus
+from src.meal_history import MealHistory
+
+class TestMealHistory(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.directory, "meals.jsonl")
+        self.today = datetime.date(2024, 5, 10)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_penalties_decay(self):
+        # 그룹 기록은 반감기마다 절반, 구성원 기록은 member_weight / 구성원 수만큼 감점
+        history = MealHistory(self.log_path, half_life_days=3.0, member_weight=0.5)
+        history.record(["연누", "야옹"], "김치찌개", self.today)
+        history.record(["야옹", "연누"], "라면", self.today - datetime.timedelta(days=3))
+        history.record(["연누", "다른사람"], "초밥", self.today)
+
+        positions = {"김치찌개": 0, "라면": 1, "초밥": 2, "피자": 3}
+        penalties = MealHistory(self.log_path, half_life_days=3.0, member_weight=0.5).penalties(
+            [["연누", "야옹"], ["피자만먹는사람"]], positions, self.today
+        )
+        # 김치찌개: 그룹 1 + 두 구성원 0.25씩, 라면: 절반, 초밥: 연누 개인 기록만
+        np.testing.assert_allclose(penalties[0], [1.5, 0.75, 0.25, 0.0])
+        np.testing.assert_allclose(penalties[1], 0.0)
+
+    def test_ring_buffer_and_compact(self):
+        # 링 버퍼는 최근 capacity개만 유지하고, 정리 후에도 같은 기록을 보여야 함
+        history = MealHistory(self.log_path, capacity=3)
+        for day in range(5):
+            history.record(["연누", "야옹"], f"메뉴{day}", self.today + datetime.timedelta(days=day))
+        self.assertEqual([menu for _, menu in history.recent(["야옹", "연누"])], ["메뉴2", "메뉴3", "메뉴4"])
+
+        before = history.revision(["연누", "야옹"])
+        history.compact()
+        with open(self.log_path, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 3)
+        other = MealHistory(self.log_path, capacity=3)
+        self.assertEqual(other.recent(["연누", "야옹"]), history.recent(["연누", "야옹"]))
+
+        history.record(["연누", "야옹"], "메뉴5", self.today)
+        self.assertNotEqual(history.revision(["연누", "야옹"]), before)
+        self.assertEqual(other.recent(["연누", "야옹"])[-1][1], "메뉴5")
+
+    def test_record_compacts_log(self):
+        # 밀려난 기록이 쌓이면 기록할 때 로그를 정리해 로그가 끝없이 커지지 않아야 함
+        history = MealHistory(self.log_path, capacity=3, compact_min_lines=5)
+        for day in range(40):
+            history.record(["연누", "야옹"], f"메뉴{day}", self.today + datetime.timedelta(days=day))
+            with open(self.log_path, encoding="utf-8") as f:
+                self.assertLessEqual(len(f.readlines()), 3 + 6)
+        self.assertEqual([menu for _, menu in history.recent(["연누", "야옹"])], ["메뉴37", "메뉴38", "메뉴39"])
+        self.assertEqual(MealHistory(self.log_path, capacity=3).recent(["연누", "야옹"]), history.recent(["연누", "야옹"]))
+
+    def test_torn_and_corrupt_lines(self):
+        # 중간에 끊긴 줄은 다음 기록 전에 잘려나가고, 손상된 줄은 건너뛰어야 함
+        history = MealHistory(self.log_path)
+        history.record(["연누"], "김치찌개", self.today)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write('{"date": "2024-05-10", "us')
+        history.record(["연누"], "라면", self.today)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write("손상된 줄\n")
+        history.record(["연누"], "초밥", self.today)
+
+        other = MealHistory(self.log_path)
+        self.assertEqual([menu for _, menu in other.recent(["연누"])], ["김치찌개", "라면", "초밥"])
+        penalties = other.penalties([["연누"]], {"김치찌개": 0, "라면": 1, "초밥": 2}, self.today)
+        self.assertTrue((penalties > 0).all())
+
+    def test_recommendation_penalty(self):
+        # 어제 먹은 1순위 메뉴는 감점되어 다음 추천의 1순위가 아니어야 함
+        history = MealHistory(self.log_path)
+        group = ["연누", "야옹"]
+        args = (group, "data/processed_user_data.csv", "data/menu_correlation_matrix.csv")
+        first = recommend_menus(*args, top_n=1, seed=3, meal_history=history, history_weight=5.0, date=self.today)
+        history.record(group, first[0][0]["menu"], self.today - datetime.timedelta(days=1))
+        second = recommend_menus(*args, top_n=1, seed=3, meal_history=history, history_weight=5.0, date=self.today)
+        self.assertNotEqual(second[0][0]["menu"], first[0][0]["menu"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.correlation_binary import (
+    CorrelationBinary, labels_path_for, load_correlation_matrix, mapped_correlation_matrix_path, save_correlation_binary,
+)
+from src.menu_correlation import IncrementalCorrelationMatrix, compute_correlation_matrix, select_numeric_features
+from src.similarity_graph import SimilarityGraph
+import numpy as np
+import pandas as pd
+
+class TestIncrementalCorrelationMatrix(unittest.TestCase):
+    def setUp(self):
+        # 테스트용 데이터 준비
+        self.menu_data = pd.read_csv("data/processed_menu_details.csv")
+        self.correlation_matrix = pd.read_csv("data/menu_correlation_matrix.csv", index_col=0)
+        self.matrix = IncrementalCorrelationMatrix(self.menu_data, self.correlation_matrix)
+
+    def test_updates_match_full_computation(self):
+        # 메뉴 수정, 추가, 삭제 후 결과가 전체 재계산과 같아야 함
+        self.matrix.upsert_menu("삼계탕", {"맛 프로파일_담백/고소": 0, "맛 프로파일_짭짤": 1})
+        self.matrix.upsert_menu("새 메뉴", {"주재료_면": 1, "맛 프로파일_짭짤": 1, "분류": "한식", "간편성": "보통"})
+        self.matrix.remove_menu("김치찌개")
+
+        expected = compute_correlation_matrix(self.matrix.menu_details)
+        self.assertEqual(self.matrix.menus, expected.index.tolist())
+        np.testing.assert_allclose(self.matrix.matrix, expected.to_numpy(), atol=1e-12)
+
+    def test_updates_reuse_buffer(self):
+        # 여유 칸이 남아 있는 동안에는 추가와 삭제가 버퍼를 새로 만들지 않고, 칸이 차면 다시 모아야 함
+        buffer = self.matrix._matrix
+        self.matrix.upsert_menu("새 메뉴", {"주재료_면": 1})
+        self.matrix.remove_menu("김치찌개")
+        self.assertIs(self.matrix._matrix, buffer)
+
+        for idx in range(len(buffer)):
+            self.matrix.upsert_menu(f"새 메뉴 {idx}", {"주재료_밥": 1, "맛 프로파일_짭짤": idx % 2})
+            if idx % 3 == 0:
+                self.matrix.remove_menu(f"새 메뉴 {idx}")
+        self.assertIsNot(self.matrix._matrix, buffer)
+
+        expected = compute_correlation_matrix(self.matrix.menu_details)
+        self.assertEqual(self.matrix.menus, expected.index.tolist())
+        np.testing.assert_allclose(self.matrix.matrix, expected.to_numpy(), atol=1e-12)
+        np.testing.assert_allclose(self.matrix.to_frame().to_numpy(), expected.to_numpy(), atol=1e-12)
+
+    def test_save_rewrites_existing_binary(self):
+        # CSV 옆에 바이너리 행렬이 있으면 저장할 때 함께 갱신되어야 함 (형식 유지)
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, "matrix.csv")
+            binary_path = os.path.join(directory, "matrix.npy")
+            self.matrix.save(csv_path)
+            self.assertFalse(os.path.exists(binary_path))
+
+            save_correlation_binary(self.matrix.to_frame(), binary_path, upper_triangular=True)
+            self.matrix.upsert_menu("새 메뉴", {"주재료_면": 1})
+            self.matrix.save(csv_path)
+            binary = CorrelationBinary(binary_path)
+            self.assertTrue(binary.upper_triangular)
+            self.assertEqual(binary.menus, self.matrix.menus)
+            np.testing.assert_allclose(binary.row("새 메뉴"), self.matrix.to_frame().loc["새 메뉴"], atol=1e-6)
+
+    def test_rejects_unknown_attribute(self):
+        with self.assertRaises(ValueError):
+            self.matrix.upsert_menu("삼계탕", {"없는 속성": 1})
+
+class TestCorrelationBinary(unittest.TestCase):
+    def setUp(self):
+        self.correlation_matrix = pd.read_csv("data/menu_correlation_matrix.csv", index_col=0)
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        # 전체 형식과 상삼각 형식 모두 원래 행렬을 float32 정밀도로 복원해야 함
+        for upper_triangular in (False, True):
+            binary_path = os.path.join(self.temp_dir.name, f"matrix_{upper_triangular}.npy")
+            save_correlation_binary(self.correlation_matrix, binary_path, upper_triangular=upper_triangular)
+            binary = CorrelationBinary(binary_path)
+
+            self.assertEqual(binary.menus, self.correlation_matrix.index.tolist())
+            np.testing.assert_allclose(binary.to_frame().to_numpy(), self.correlation_matrix.to_numpy(), atol=1e-6)
+            np.testing.assert_allclose(binary.row("비빔밥"), self.correlation_matrix.loc["비빔밥"].to_numpy(), atol=1e-6)
+
+    def test_upper_layout_is_not_mapped(self):
+        # 공유 데이터 저장소는 전체 형식만 메모리 매핑하고, 상삼각 형식이면 CSV를 사용해야 함
+        csv_path = os.path.join(self.temp_dir.name, "matrix.csv")
+        binary_path = os.path.join(self.temp_dir.name, "matrix.npy")
+        self.assertEqual(mapped_correlation_matrix_path(csv_path), csv_path)
+
+        save_correlation_binary(self.correlation_matrix, binary_path)
+        self.assertEqual(mapped_correlation_matrix_path(csv_path), binary_path)
+        self.assertEqual(load_correlation_matrix(binary_path).shape, self.correlation_matrix.shape)
+
+        save_correlation_binary(self.correlation_matrix, binary_path, upper_triangular=True)
+        self.assertEqual(mapped_correlation_matrix_path(csv_path), csv_path)
+        with self.assertRaises(ValueError):
+            load_correlation_matrix(binary_path)
+
+    def test_waits_for_matching_labels(self):
+        # 새 .npy 파일과 이전 메뉴 이름 파일을 함께 읽지 않고, 메뉴 이름 파일이 교체될 때까지 다시 읽어야 함
+        binary_path = os.path.join(self.temp_dir.name, "matrix.npy")
+        save_correlation_binary(self.correlation_matrix, binary_path)
+        renamed = self.correlation_matrix.rename(index=lambda menu: menu + "2", columns=lambda menu: menu + "2")
+        new_path = os.path.join(self.temp_dir.name, "new.npy")
+        save_correlation_binary(renamed, new_path)
+        # 저장 도중 상태를 재현: .npy 파일만 교체되고 메뉴 이름 파일은 이전 것
+        os.replace(new_path, binary_path)
+
+        def finish_save(seconds):
+            os.replace(labels_path_for(new_path), labels_path_for(binary_path))
+
+        with mock.patch("src.correlation_binary.time.sleep", side_effect=finish_save) as sleep:
+            binary = CorrelationBinary(binary_path)
+        self.assertEqual(sleep.call_count, 1)
+        self.assertEqual(binary.menus, renamed.index.tolist())
+
+        # 메뉴 이름 파일이 끝내 맞지 않으면 오류
+        save_correlation_binary(renamed, new_path)
+        os.replace(new_path, binary_path)
+        with mock.patch("src.correlation_binary.time.sleep"), self.assertRaises(ValueError):
+            CorrelationBinary(binary_path)
+
+class TestSimilarityGraph(unittest.TestCase):
+    def test_nearest_matches_dense_matrix(self):
+        # 블록 단위로 만든 상위 k개 그래프가 전체 행렬의 상위 k개 유사도와 같아야 함
+        menu_data = pd.read_csv("data/processed_menu_details.csv")
+        correlation_matrix = compute_correlation_matrix(menu_data)
+        graph = SimilarityGraph.build(
+            menu_data["메뉴"].tolist(), select_numeric_features(menu_data).to_numpy(), k=5, block_size=16
+        )
+
+        for menu in ["김치찌개", "라면", "초밥"]:
+            expected = correlation_matrix.loc[menu].drop(menu).sort_values(ascending=False).head(5)
+            similarities = [similarity for _, similarity in graph.nearest(menu, top_k=5)]
+            np.testing.assert_allclose(similarities, expected.to_numpy(), atol=1e-6)
+
+if __name__ == "__main__":
+    unittest.main()
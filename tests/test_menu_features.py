@@ -0,0 +1,54 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.menu_correlation import compute_feature_correlation_matrix, sparse_cosine_similarity
+from src.menu_features import MenuFeatures, build_menu_features, split_values
+import numpy as np
+import pandas as pd
+
+class TestMenuFeatures(unittest.TestCase):
+    def setUp(self):
+        # 테스트용 데이터 준비
+        self.raw_menu_details = pd.read_csv("data/menu_details.csv")
+
+    def test_split_values(self):
+        self.assertEqual(split_values("채소+고기(가끔), 밥"), ["채소", "고기", "가끔", "밥"])
+        self.assertEqual(split_values("매움/짭짤"), ["매움", "짭짤"])
+        self.assertEqual(split_values("밥+채소+햄 등"), ["밥", "채소", "햄"])
+        self.assertEqual(split_values(float("nan")), [])
+
+    def test_matches_dense_cosine(self):
+        # 희소 행렬 유사도가 0/1 밀집 행렬의 코사인 유사도와 같아야 함
+        features = MenuFeatures.build(self.raw_menu_details)
+        dense = features.to_frame().drop(columns=["메뉴"]).to_numpy(dtype=float)
+        unit = dense / np.linalg.norm(dense, axis=1, keepdims=True)
+        np.testing.assert_allclose(sparse_cosine_similarity(features.matrix).toarray(), unit @ unit.T, atol=1e-12)
+        self.assertEqual(compute_feature_correlation_matrix(features).index.tolist(), self.raw_menu_details["메뉴"].tolist())
+
+    def test_recomputes_only_changed_rows(self):
+        # 저장된 결과가 있으면 원본 항목이 바뀐 메뉴만 다시 나누고, 결과는 전체 계산과 같아야 함
+        with tempfile.TemporaryDirectory() as directory:
+            raw_path = os.path.join(directory, "menu_details.csv")
+            features_path = os.path.join(directory, "menu_features.npz")
+            self.raw_menu_details.to_csv(raw_path, index=False)
+            self.assertEqual(build_menu_features(raw_path, features_path).changed_rows, len(self.raw_menu_details))
+
+            edited = self.raw_menu_details.copy()
+            edited.loc[0, "맛 프로파일"] = "매움/새로운맛"
+            edited.to_csv(raw_path, index=False)
+            features = build_menu_features(raw_path, features_path)
+
+        self.assertEqual(features.changed_rows, 1)
+        self.assertIn("맛 프로파일_새로운맛", features.vocabulary)
+        pd.testing.assert_frame_equal(
+            features.to_frame().sort_index(axis=1), MenuFeatures.build(edited).to_frame().sort_index(axis=1)
+        )
+
+if __name__ == "__main__":
+    unittest.main()
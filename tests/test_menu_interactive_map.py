@@ -0,0 +1,71 @@
+import os
+import sys
+import unittest
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.menu_interactive_map import generate_menu_map
+from src.menu_layout import select_edges
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+class TestSelectEdges(unittest.TestCase):
+    def setUp(self):
+        # 테스트용 데이터 준비
+        self.similarities = pd.read_csv("data/menu_correlation_matrix.csv", index_col=0).to_numpy()
+
+    def test_matches_threshold(self):
+        # 임계값보다 유사도가 높은 메뉴 쌍(자기 자신 제외)이 정확히 한 번씩 선택되어야 함
+        threshold = 0.5
+        starts, ends = select_edges(self.similarities, threshold)
+        expected = {
+            (i, j)
+            for i in range(len(self.similarities))
+            for j in range(i + 1, len(self.similarities))
+            if self.similarities[i, j] > threshold
+        }
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(len(starts), len(expected))
+        self.assertEqual(set(zip(starts.tolist(), ends.tolist())), expected)
+        self.assertTrue((self.similarities[starts, ends] > threshold).all())
+
+    def test_max_edges_per_node(self):
+        # 남은 연결선은 임계값을 넘고, 두 메뉴 중 한쪽에서라도 가장 강한 k개 안에 들어야 함
+        threshold, k = 0.3, 2
+        all_starts, _ = select_edges(self.similarities, threshold)
+        starts, ends = select_edges(self.similarities, threshold, max_edges_per_node=k)
+        self.assertLess(len(starts), len(all_starts))
+        self.assertTrue((self.similarities[starts, ends] > threshold).all())
+
+        masked = np.where(self.similarities > threshold, self.similarities, -np.inf)
+        np.fill_diagonal(masked, -np.inf)
+        kth_strongest = -np.sort(-masked, axis=1)[:, k - 1]
+        for i, j in zip(starts, ends):
+            self.assertTrue(masked[i, j] >= kth_strongest[i] or masked[i, j] >= kth_strongest[j])
+
+class TestGenerateMenuMap(unittest.TestCase):
+    def setUp(self):
+        self.correlation_matrix_path = "data/menu_correlation_matrix.csv"
+
+    def test_webgl_uses_scattergl(self):
+        # webgl 모드는 연결선 trace 하나와 메뉴 점 trace 하나를 모두 Scattergl로 그려야 함
+        fig = generate_menu_map(self.correlation_matrix_path, {"김치찌개": 4}, render_mode="webgl")
+        self.assertEqual(len(fig.data), 2)
+        self.assertTrue(all(isinstance(trace, go.Scattergl) for trace in fig.data))
+
+        # classic 모드는 연결선마다 Scatter trace를 만들어야 함
+        similarities = pd.read_csv(self.correlation_matrix_path, index_col=0).to_numpy()
+        n_edges = len(select_edges(similarities, 0.5)[0])
+        fig = generate_menu_map(self.correlation_matrix_path, {"김치찌개": 4}, render_mode="classic")
+        self.assertEqual(len(fig.data), n_edges + 1)
+        self.assertFalse(any(isinstance(trace, go.Scattergl) for trace in fig.data))
+
+    def test_invalid_render_mode(self):
+        with self.assertRaises(ValueError):
+            generate_menu_map(self.correlation_matrix_path, render_mode="svg")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.correlation_binary import save_correlation_binary
+from src.data_store import get_data_store
+from src.menu_layout import MenuLayout, get_menu_layout, layout_labels_path_for, layout_path_for
+import numpy as np
+import pandas as pd
+
+class TestMenuLayout(unittest.TestCase):
+    def setUp(self):
+        # 테스트용 임시 상관관계 행렬 파일 준비
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.correlation_matrix = pd.read_csv("data/menu_correlation_matrix.csv", index_col=0)
+        self.correlation_matrix_path = os.path.join(self.temp_dir.name, "matrix.csv")
+        self.correlation_matrix.to_csv(self.correlation_matrix_path)
+
+    def tearDown(self):
+        get_data_store().invalidate()
+        self.temp_dir.cleanup()
+
+    def _get_layout(self, correlation_matrix_path=None):
+        # 다른 프로세스처럼 메모리 캐시 없이 파일에서 배치를 가져옴
+        get_data_store().invalidate()
+        return get_menu_layout(correlation_matrix_path or self.correlation_matrix_path)
+
+    def test_reuses_saved_layout(self):
+        # 상관관계 행렬이 그대로면 저장된 배치를 다시 학습하지 않아야 함
+        first = self._get_layout()
+        self.assertTrue(os.path.exists(layout_path_for(self.correlation_matrix_path)))
+        with mock.patch.object(MenuLayout, "fit", side_effect=AssertionError("다시 학습함")):
+            second = self._get_layout()
+        self.assertEqual(second.menus, first.menus)
+        np.testing.assert_array_equal(second.coordinates, first.coordinates)
+        np.testing.assert_array_equal(second.clusters, first.clusters)
+
+    def test_extend_places_new_menu(self):
+        # 메뉴만 추가되면 저장된 PCA 변환과 군집 중심으로 새 메뉴만 배치해야 함
+        from sklearn.cluster import KMeans
+        from sklearn.decomposition import PCA
+
+        new_menu = self.correlation_matrix.index[-1]
+        fitted = self.correlation_matrix.drop(index=new_menu, columns=new_menu)
+        fitted.to_csv(self.correlation_matrix_path)
+        first = self._get_layout()
+
+        self.correlation_matrix.to_csv(self.correlation_matrix_path)
+        with mock.patch.object(MenuLayout, "fit", side_effect=AssertionError("다시 학습함")):
+            extended = self._get_layout()
+        self.assertEqual(extended.menus, first.menus + [new_menu])
+        np.testing.assert_array_equal(extended.coordinates[:-1], first.coordinates)
+
+        pca = PCA(n_components=2).fit(fitted.to_numpy())
+        kmeans = KMeans(n_clusters=5, random_state=0).fit(pca.transform(fitted.to_numpy()))
+        expected = pca.transform(self.correlation_matrix.loc[[new_menu], fitted.columns].to_numpy())
+        np.testing.assert_allclose(extended.coordinates[-1:], expected, atol=1e-9)
+        self.assertEqual(extended.clusters[-1], kmeans.predict(expected)[0])
+
+    def test_changed_similarity_refits(self):
+        # 학습에 쓰인 메뉴 사이의 유사도가 바뀌면 다시 학습해야 함
+        self._get_layout()
+        menu = self.correlation_matrix.index[0]
+        other = self.correlation_matrix.index[1]
+        self.correlation_matrix.loc[menu, other] = self.correlation_matrix.loc[other, menu] = 0.99
+        self.correlation_matrix.to_csv(self.correlation_matrix_path)
+
+        with mock.patch.object(MenuLayout, "fit", wraps=MenuLayout.fit) as fit:
+            layout = self._get_layout()
+        fit.assert_called_once()
+        self.assertEqual(layout.version, get_data_store().version(self.correlation_matrix_path))
+
+    def test_layout_file_per_source_and_corrupt_file(self):
+        # CSV와 바이너리 행렬은 서로 다른 배치 파일을 쓰고, 손상된 파일은 무시해야 함
+        binary_path = os.path.join(self.temp_dir.name, "matrix.npy")
+        save_correlation_binary(self.correlation_matrix, binary_path)
+        self.assertNotEqual(layout_path_for(self.correlation_matrix_path), layout_path_for(binary_path))
+        self._get_layout()
+        self._get_layout(binary_path)
+        self.assertTrue(os.path.exists(layout_labels_path_for(layout_path_for(binary_path))))
+
+        layout_path = layout_path_for(self.correlation_matrix_path)
+        with open(layout_path, "wb") as f:
+            f.write(b"not a zip file")
+        self.assertIsNone(MenuLayout.load(layout_path))
+        with mock.patch.object(MenuLayout, "fit", wraps=MenuLayout.fit) as fit:
+            self._get_layout()
+        fit.assert_called_once()
+
+if __name__ == "__main__":
+    unittest.main()
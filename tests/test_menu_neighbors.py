@@ -0,0 +1,64 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.data_store import get_data_store
+from src.menu_neighbors import MenuNeighborIndex, get_neighbor_index
+import numpy as np
+import pandas as pd
+
+class TestMenuNeighborIndex(unittest.TestCase):
+    def setUp(self):
+        # 테스트용 데이터 준비
+        self.correlation_matrix = pd.read_csv("data/menu_correlation_matrix.csv", index_col=0)
+        self.index = MenuNeighborIndex(self.correlation_matrix)
+        self.rng = np.random.default_rng(0)
+
+    def test_top_matches_equals_brute_force(self):
+        # 선호 메뉴로 제한한 유사도 행을 직접 정렬한 결과와 같아야 함
+        similarities = self.correlation_matrix.to_numpy()
+        n_menus = len(similarities)
+        for _ in range(20):
+            menu_idx = int(self.rng.integers(n_menus))
+            candidate_mask = self.rng.random(n_menus) < 0.3
+            candidates = np.flatnonzero(candidate_mask)
+            expected = candidates[np.argsort(-similarities[menu_idx, candidates], kind="stable")][:5]
+            np.testing.assert_array_equal(self.index.top_matches(menu_idx, candidate_mask, 5), expected)
+
+        # 후보가 top_k보다 적으면 후보 전체, 없으면 빈 배열
+        candidate_mask = np.zeros(n_menus, dtype=bool)
+        self.assertEqual(len(self.index.top_matches(0, candidate_mask, 5)), 0)
+        candidate_mask[[1, 2]] = True
+        self.assertEqual(sorted(self.index.top_matches(0, candidate_mask, 5).tolist()), [1, 2])
+
+    def test_similar_menus_excludes_self(self):
+        menu = "김치찌개"
+        expected = self.correlation_matrix.loc[menu].drop(menu).sort_values(ascending=False, kind="stable")
+        self.assertEqual(self.index.similar_menus(menu, top_k=3), expected.index[:3].tolist())
+
+    def test_rebuilds_when_correlation_file_changes(self):
+        # 상관관계 행렬 파일이 바뀌면 인덱스를 다시 만들고, 그대로면 재사용해야 함
+        with tempfile.TemporaryDirectory() as directory:
+            correlation_matrix_path = os.path.join(directory, "matrix.csv")
+            self.correlation_matrix.to_csv(correlation_matrix_path)
+            first = get_neighbor_index(correlation_matrix_path)
+            self.assertIs(get_neighbor_index(correlation_matrix_path), first)
+
+            menu, other = self.correlation_matrix.index[:2]
+            changed = self.correlation_matrix.copy()
+            changed.loc[menu, other] = changed.loc[other, menu] = 2.0
+            changed.to_csv(correlation_matrix_path)
+            os.utime(correlation_matrix_path, ns=(0, os.stat(correlation_matrix_path).st_mtime_ns + 10**9))
+
+            second = get_neighbor_index(correlation_matrix_path)
+            self.assertIsNot(second, first)
+            self.assertEqual(second.similar_menus(menu, top_k=1), [other])
+            get_data_store().invalidate(correlation_matrix_path)
+
+if __name__ == "__main__":
+    unittest.main()
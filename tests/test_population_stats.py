@@ -0,0 +1,64 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.population_stats import PartialStats, compute_population_stats, summarize_population
+from src.user_store import UserStore
+import pandas as pd
+
+class TestPopulationStats(unittest.TestCase):
+    def setUp(self):
+        # 사용자 데이터 사본 준비 (로그에 아직 합쳐지지 않은 사용자 한 명 추가)
+        self.directory = tempfile.mkdtemp()
+        self.user_file_path = os.path.join(self.directory, "users.csv")
+        shutil.copy("data/processed_user_data.csv", self.user_file_path)
+        menus = pd.read_csv(self.user_file_path).columns[1:].tolist()
+        UserStore(self.user_file_path).append([{"이름": "새사용자", **{menu: 1 for menu in menus[:10]}}])
+        self.user_data = UserStore(self.user_file_path).snapshot()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_matches_full_computation(self):
+        # 작은 범위로 나누어 합친 결과가 전체 데이터로 계산한 결과와 같아야 함
+        values = self.user_data.iloc[:, 1:]
+        menus, stats = compute_population_stats(self.user_file_path, chunk_bytes=257)
+        self.assertEqual(menus, values.columns.tolist())
+        np.testing.assert_array_equal(stats.counts, values.count().to_numpy())
+        np.testing.assert_allclose(stats.means, values.mean().to_numpy())
+        np.testing.assert_allclose(stats.variances, values.var(ddof=0).to_numpy(), atol=1e-12)
+        np.testing.assert_array_equal(stats.histogram[:, 3], (values == 4).sum().to_numpy())
+
+    def test_parallel_matches_serial(self):
+        # 프로세스 풀로 나누어 계산해도 결과가 같아야 함
+        _, serial = compute_population_stats(self.user_file_path, chunk_bytes=1000)
+        _, parallel = compute_population_stats(self.user_file_path, chunk_bytes=1000, n_jobs=2)
+        np.testing.assert_array_equal(serial.histogram, parallel.histogram)
+        np.testing.assert_allclose(serial.m2, parallel.m2)
+
+    def test_merge_with_empty_menus(self):
+        # 한쪽에만 응답이 있는 메뉴도 올바르게 합쳐져야 함
+        left = PartialStats.from_scores(np.array([[1.0, np.nan], [3.0, np.nan]]))
+        right = PartialStats.from_scores(np.array([[4.0, 2.0]]))
+        merged = left.merge(right)
+        np.testing.assert_allclose(merged.means, [8 / 3, 2.0])
+        np.testing.assert_allclose(merged.variances, [np.var([1, 3, 4]), 0.0])
+
+    def test_summary(self):
+        summary = summarize_population(self.user_file_path, "data/processed_menu_details.csv")
+        shares = summary.menu_summary.filter(like="점 비율").sum(axis=1)
+        np.testing.assert_allclose(shares, 1.0)
+        self.assertEqual(len(summary.polarizing(5)), 5)
+        self.assertTrue((summary.polarizing(5)["양극화 지수"].diff().dropna() <= 0).all())
+        self.assertEqual(summary.category_summary["응답 수"].sum(), summary.menu_summary["응답 수"].sum())
+
+if __name__ == "__main__":
+    unittest.main()
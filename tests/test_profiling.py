@@ -0,0 +1,56 @@
+import os
+import sys
+import tracemalloc
+import unittest
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src import profiling
+from src.group_analysis import recommend_menus
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        profiling.reset()
+
+    def tearDown(self):
+        profiling.disable()
+        profiling.reset()
+
+    def test_records_recommendation_stages(self):
+        profiling.enable()
+        recommend_menus(["연누", "야옹"], "data/processed_user_data.csv", "data/menu_correlation_matrix.csv")
+        summary = profiling.summary()
+
+        for name in ["recommend_menus", "recommend.load", "recommend.aggregate", "recommend.diversity_penalty"]:
+            self.assertIn(name, summary)
+            self.assertEqual(summary[name]["count"], 1)
+        # 바깥 단계의 시간과 메모리는 안쪽 단계보다 작을 수 없음
+        self.assertGreaterEqual(summary["recommend_menus"]["total_seconds"], summary["recommend.load"]["total_seconds"])
+        self.assertGreaterEqual(
+            summary["recommend_menus"]["peak_memory_bytes"], summary["recommend.aggregate"]["peak_memory_bytes"]
+        )
+        self.assertIn('menumate_stage_calls_total{stage="recommend_menus"} 1', profiling.to_prometheus())
+
+    def test_keeps_external_tracemalloc(self):
+        # 다른 코드가 시작한 tracemalloc은 끄지 않고, 직접 시작한 경우에만 멈춰야 함
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        profiling.enable()
+        profiling.disable()
+        self.assertTrue(tracemalloc.is_tracing())
+
+        tracemalloc.stop()
+        profiling.enable()
+        self.assertTrue(tracemalloc.is_tracing())
+        profiling.disable()
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_disabled_records_nothing(self):
+        with profiling.stage("unused"):
+            pass
+        self.assertEqual(profiling.summary(), {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+import unittest
+import warnings
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.report_renderer import render_reports
+
+class TestReportRenderer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        # 한글 폰트가 없는 환경에서 나오는 글리프 경고 무시 (테스트가 끝나면 경고 필터를 원래대로 되돌림)
+        self.enterContext(warnings.catch_warnings())
+        warnings.filterwarnings("ignore", message="Glyph")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _render(self, user_names, top_k=10):
+        return render_reports(
+            "data/processed_menu_details.csv",
+            "data/processed_user_data.csv",
+            self.temp_dir.name,
+            user_names=user_names,
+            formats=("png", "html"),
+            n_jobs=1,
+            top_k=top_k,
+        )
+
+    def test_skips_unchanged_users(self):
+        # 처음에는 모두 그리고, 두 번째에는 파일이 남아 있는 사용자만 건너뛰어야 함
+        first = self._render(["연누", "야옹", "없는사람"])
+        self.assertEqual(first["rendered"], ["연누", "야옹"])
+        self.assertIn("없는사람", first["failed"])
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, "연누_radar.png")))
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, "야옹.html")))
+
+        os.remove(os.path.join(self.temp_dir.name, "야옹.html"))
+        second = self._render(["연누", "야옹"])
+        self.assertEqual(second["skipped"], ["연누"])
+        self.assertEqual(second["rendered"], ["야옹"])
+
+        # 차트에 표시할 속성 개수가 바뀌면 다시 그려야 함
+        third = self._render(["연누"], top_k=5)
+        self.assertEqual(third["rendered"], ["연누"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+import urllib.error
+import urllib.parse
+import urllib.request
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from app import server
+from app.server import MenuMateServer
+from src.meal_history import MealHistory
+import pandas as pd
+
+class TestMenuMateServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # 빈 포트로 서버 시작
+        self.server = MenuMateServer(port=0, max_workers=4)
+        await self.server.start()
+        self.base_url = f"http://127.0.0.1:{self.server.port}"
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    def _request(self, path, payload=None, headers=None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(
+            self.base_url + urllib.parse.quote(path, safe="/?=&,"), data=data, headers=headers or {}
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read().decode("utf-8"))
+
+    async def _get(self, path, payload=None, headers=None):
+        return await asyncio.to_thread(self._request, path, payload, headers)
+
+    async def test_endpoints(self):
+        status, body = await self._get("/recommend", {"users": ["연누", "야옹"], "top_n": 2})
+        self.assertEqual(status, 200)
+        self.assertEqual(len(body["recommendations"]), 2)
+
+        status, body = await self._get("/users/연누")
+        self.assertEqual(status, 200)
+        self.assertEqual(body["user_name"], "연누")
+
+        status, body = await self._get("/users/연누/analysis?top_n=3")
+        self.assertEqual(status, 200)
+        self.assertLessEqual(len(body["favorite_menus"]), 3)
+
+        status, body = await self._get(
+            "/partition", {"users": ["연누", "야옹", "권민혁", "안태우", "류지학", "한규상", "이상호", "김건우"], "time_budget": 2}
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(sum(len(group["users"]) for group in body["groups"]), 8)
+
+        status, body = await self._get("/users/연누/buddies?top_k=3")
+        self.assertEqual(status, 200)
+        self.assertEqual(len(body["buddies"]), 3)
+
+        status, body = await self._get("/map?user=연누&render_mode=webgl")
+        self.assertEqual(status, 200)
+        self.assertIn("data", body)
+
+    async def test_errors(self):
+        status, body = await self._get("/users/없는사람")
+        self.assertEqual(status, 400)
+        self.assertIn("error", body)
+
+        status, _ = await self._get("/users/연누/buddies?top_k=0")
+        self.assertEqual(status, 400)
+
+        status, _ = await self._get("/unknown")
+        self.assertEqual(status, 404)
+
+        # 헤더가 너무 많으면 431
+        status, _ = await self._get("/users/연누", headers={f"X-Extra-{idx}": "1" for idx in range(server.MAX_HEADERS)})
+        self.assertEqual(status, 431)
+
+    async def test_nan_scores_are_valid_json(self):
+        # 선호 메뉴가 하나뿐인 그룹은 점수가 NaN이 되므로 응답은 NaN 대신 null을 담은 올바른 JSON이어야 함
+        with tempfile.TemporaryDirectory() as directory:
+            user_data = pd.read_csv(server.user_file_path)
+            single_favorite = {"이름": "한입", **{menu: 2 for menu in user_data.columns[1:]}}
+            single_favorite[user_data.columns[1]] = 4
+            user_file_path = os.path.join(directory, "users.csv")
+            pd.concat([user_data, pd.DataFrame([single_favorite])]).to_csv(user_file_path, index=False)
+
+            original = server.user_file_path
+            server.user_file_path = user_file_path
+            try:
+                request = urllib.request.Request(
+                    self.base_url + "/recommend", data=json.dumps({"users": ["한입"], "seed": 1}).encode("utf-8")
+                )
+                with await asyncio.to_thread(urllib.request.urlopen, request) as response:
+                    # json.loads는 NaN을 허용하므로 parse_constant로 비표준 상수를 거부
+                    body = json.loads(response.read().decode("utf-8"), parse_constant=self.fail)
+            finally:
+                server.user_file_path = original
+        self.assertIsNone(body["recommendations"][0]["score"])
+
+    async def test_meal_history(self):
+        # 기록한 식사는 조회되고, 같은 날 추천에서 감점되어 1순위에서 빠져야 함
+        with tempfile.TemporaryDirectory() as directory:
+            original = server.meal_history
+            server.meal_history = MealHistory(os.path.join(directory, "meals.jsonl"))
+            try:
+                request = {"users": ["연누", "야옹"], "top_n": 1, "date": "2024-05-01"}
+                status, body = await self._get("/recommend", request)
+                first_menu = body["recommendations"][0]["menu"]
+
+                status, body = await self._get("/meals", {"users": ["야옹", "연누"], "menu": first_menu, "date": "2024-05-01"})
+                self.assertEqual(status, 200)
+                self.assertEqual(body["meals"], [{"date": "2024-05-01", "menu": first_menu}])
+
+                status, body = await self._get("/recommend", {**request, "history_weight": 10})
+                self.assertNotEqual(body["recommendations"][0]["menu"], first_menu)
+
+                status, _ = await self._get("/meals", {"users": ["연누"], "menu": "없는메뉴"})
+                self.assertEqual(status, 400)
+            finally:
+                server.meal_history = original
+
+    async def test_concurrent_requests(self):
+        # 동시에 들어온 요청이 모두 처리되어야 함
+        results = await asyncio.gather(*[self._get("/recommend?users=연누,야옹") for _ in range(20)])
+        self.assertTrue(all(status == 200 for status, _ in results))
+
+if __name__ == "__main__":
+    unittest.main()
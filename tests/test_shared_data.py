@@ -0,0 +1,87 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.data_store import get_data_store
+from src.group_analysis import recommend_menus
+from src.shared_data import SharedDataPublisher, SharedDataReader, use_shared_data
+from src.user_matrix import get_user_matrix
+from src.user_store import UserStore
+
+class TestSharedData(unittest.TestCase):
+    def setUp(self):
+        # 사용자 데이터 사본으로 게시
+        self.directory = tempfile.mkdtemp()
+        self.user_file_path = os.path.join(self.directory, "users.csv")
+        self.correlation_matrix_path = "data/menu_correlation_matrix.csv"
+        shutil.copy("data/processed_user_data.csv", self.user_file_path)
+        self.name = f"menumate_test_{os.getpid()}"
+        self.publisher = SharedDataPublisher(self.name, self.user_file_path, self.correlation_matrix_path)
+        self.publisher.publish()
+
+    def tearDown(self):
+        store = get_data_store()
+        store.detach_shared()
+        store.invalidate()
+        self.publisher.close()
+        shutil.rmtree(self.directory)
+
+    def test_attach_matches_files(self):
+        # 공유 메모리의 배열은 파일에서 읽은 것과 같고 읽기 전용이어야 함
+        expected = get_user_matrix(self.user_file_path)
+        expected_result = recommend_menus(["연누", "야옹"], self.user_file_path, self.correlation_matrix_path, seed=7)
+        get_data_store().invalidate()
+
+        use_shared_data(self.name, self.user_file_path, self.correlation_matrix_path)
+        shared = get_user_matrix(self.user_file_path)
+        self.assertIsNot(shared, expected)
+        self.assertFalse(shared.scores.flags.writeable)
+        np.testing.assert_array_equal(shared.scores, expected.scores)
+        np.testing.assert_array_equal(shared.missing, expected.missing)
+        self.assertEqual(shared.names, expected.names)
+        self.assertEqual(
+            recommend_menus(["연누", "야옹"], self.user_file_path, self.correlation_matrix_path, seed=7),
+            expected_result,
+        )
+
+    def test_new_generation(self):
+        # 사용자가 추가되면 새 세대가 게시되고, 바뀌지 않은 상관관계 행렬은 그대로 재사용되어야 함
+        reader = SharedDataReader(self.name)
+        first = reader.snapshot()
+        self.assertIs(reader.snapshot(), first)
+
+        menus = first.user_matrix.menus
+        UserStore(self.user_file_path).append([{"이름": "새사용자", **{menu: 4 for menu in menus}}])
+        self.assertEqual(self.publisher.publish(), first.generation + 1)
+
+        second = reader.snapshot()
+        self.assertEqual(second.generation, first.generation + 1)
+        self.assertIn("새사용자", second.user_matrix)
+        self.assertIs(second.correlation_matrix, first.correlation_matrix)
+        # 이전 세대 배열은 블록이 지워진 뒤에도 계속 읽을 수 있어야 함
+        self.assertEqual(len(first.user_matrix.scores), len(second.user_matrix.scores) - 1)
+
+    def test_worker_process(self):
+        # 다른 프로세스가 연결했다가 종료해도 블록이 지워지지 않아야 함
+        code = (
+            "from src.shared_data import SharedDataReader;"
+            f"snapshot = SharedDataReader({self.name!r}).snapshot();"
+            "print(len(snapshot.user_matrix), int(snapshot.user_matrix.scores.sum()))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=project_root, capture_output=True, text=True, check=True
+        ).stdout.split()
+        user_matrix = SharedDataReader(self.name).snapshot().user_matrix
+        self.assertEqual([int(value) for value in output], [len(user_matrix), int(user_matrix.scores.sum())])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from benchmarks.synthetic_data import write_dataset
+from src.menu_schema import MenuSchema
+import pandas as pd
+
+class TestSyntheticData(unittest.TestCase):
+    def test_matches_real_schema(self):
+        # 합성 데이터가 실제 데이터와 같은 열 구조를 가져야 함
+        real_menu_data = pd.read_csv("data/processed_menu_details.csv")
+        with tempfile.TemporaryDirectory() as directory:
+            paths = write_dataset(directory, n_users=30, n_menus=20, n_features=60)
+            menu_data = pd.read_csv(paths["menu"])
+            user_data = pd.read_csv(paths["user"])
+            correlation_matrix = pd.read_csv(paths["correlation"], index_col=0)
+
+        self.assertEqual(menu_data.columns[:3].tolist(), real_menu_data.columns[:3].tolist())
+        self.assertEqual(MenuSchema(menu_data).families, MenuSchema(real_menu_data).families)
+        self.assertEqual(len(menu_data.columns) - 3, 60)
+        self.assertEqual(user_data.columns.tolist(), ["이름"] + menu_data["메뉴"].tolist())
+        self.assertEqual(correlation_matrix.shape, (20, 20))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import sys
+import unittest
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.menu_schema import MenuSchema
+from src.taste_profiles import TasteProfiles
+from src.user_matrix import UserMatrix
+import numpy as np
+import pandas as pd
+
+class TestTasteProfiles(unittest.TestCase):
+    def setUp(self):
+        # 테스트용 데이터 준비
+        self.menu_data = pd.read_csv("data/processed_menu_details.csv")
+        self.user_data = pd.read_csv("data/processed_user_data.csv")
+        self.menu_schema = MenuSchema(self.menu_data)
+
+    def _expected_profile(self, user_name, score):
+        # 기존 방식: 열 합계로 정규화한 뒤 해당 점수 메뉴의 평균
+        user_row = self.user_data[self.user_data["이름"] == user_name].iloc[0, 1:]
+        menus = user_row[user_row == score].index
+        normalized = self.menu_data.drop(columns=["메뉴", "분류", "간편성"])
+        normalized = normalized.div(normalized.sum(axis=0), axis=1)
+        return normalized[self.menu_data["메뉴"].isin(menus)].mean()
+
+    def test_family_slices(self):
+        self.assertEqual(
+            self.menu_schema.families, ["주재료", "맛 프로파일", "식사 타입/상황", "조리 방식", "계절/날씨"]
+        )
+        self.assertTrue(all(column.startswith("맛 프로파일_") for column in self.menu_schema.family_columns("맛 프로파일")))
+
+    def test_matches_per_user_computation(self):
+        # 전체 사용자 프로필이 사용자별 pandas 계산과 같아야 함
+        profiles = TasteProfiles.build(self.menu_schema, UserMatrix.from_frame(self.user_data))
+        for user_name in self.user_data["이름"].dropna():
+            np.testing.assert_allclose(profiles.favorite_attributes(user_name), self._expected_profile(user_name, 4))
+            np.testing.assert_allclose(profiles.disliked_attributes(user_name), self._expected_profile(user_name, 1))
+
+    def test_recomputes_only_changed_rows(self):
+        # 이전 결과를 재사용하면 바뀐 행과 새 행만 다시 계산해야 함
+        previous = TasteProfiles.build(self.menu_schema, UserMatrix.from_frame(self.user_data))
+        previous.favorite[1] = -1  # 재사용 여부를 확인하기 위한 표시
+
+        changed = self.user_data.copy()
+        changed.loc[0, "김치찌개"] = 1 if changed.loc[0, "김치찌개"] != 1 else 4
+        changed = pd.concat([changed, changed.iloc[[2]].assign(이름="새 사용자")], ignore_index=True)
+        profiles = TasteProfiles.build(self.menu_schema, UserMatrix.from_frame(changed), previous)
+
+        self.assertTrue((profiles.favorite[1] == -1).all())
+        expected = TasteProfiles.build(self.menu_schema, UserMatrix.from_frame(changed))
+        np.testing.assert_allclose(profiles.favorite[[0, len(changed) - 1]], expected.favorite[[0, len(changed) - 1]])
+        np.testing.assert_allclose(profiles.disliked[0], expected.disliked[0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.data_store import DataStore
+from src.user_matrix import UserMatrix, get_user_matrix
+from src.user_store import UserStore
+import numpy as np
+import pandas as pd
+
+class TestUserMatrix(unittest.TestCase):
+    def setUp(self):
+        # 테스트용 데이터 준비
+        self.user_data = pd.read_csv("data/processed_user_data.csv")
+        self.user_matrix = UserMatrix.from_frame(self.user_data)
+
+    def test_matches_dataframe_lookup(self):
+        # 모든 사용자에 대해 DataFrame 검색 결과와 같아야 함
+        for user_name in self.user_data["이름"].dropna():
+            user_row = self.user_data[self.user_data["이름"] == user_name].drop(columns=["이름"]).iloc[0]
+            self.assertEqual(self.user_matrix.preferences(user_name), user_row.dropna().to_dict())
+            self.assertEqual(self.user_matrix.menus_with_score(user_name, 4), user_row[user_row == 4].index.tolist())
+
+    def test_compact_storage(self):
+        # 점수는 int8, 결측 마스크는 비트 단위로 저장
+        self.assertEqual(self.user_matrix.scores.dtype, np.int8)
+        np.testing.assert_array_equal(self.user_matrix.missing, self.user_data.drop(columns=["이름"]).isna().to_numpy())
+
+    def test_reads_file_without_caching_dataframe(self):
+        # 파일에서 청크 단위로 만든 행렬은 DataFrame으로 만든 행렬과 같고, 저장소에 DataFrame을 남기지 않아야 함
+        with tempfile.TemporaryDirectory() as directory:
+            user_file_path = os.path.join(directory, "users.csv")
+            shutil.copy("data/processed_user_data.csv", user_file_path)
+            new_user = {"이름": "새사용자", **{menu: 3 for menu in self.user_data.columns[1:]}}
+            UserStore(user_file_path).append([new_user])
+
+            store = DataStore()
+            with mock.patch("src.user_matrix.get_data_store", return_value=store):
+                user_matrix = get_user_matrix(user_file_path)
+            self.assertIsNotNone(store.version(user_file_path))
+            self.assertNotIn((os.path.abspath(user_file_path), "user"), store._entries)
+
+            expected = UserMatrix.from_frame(UserStore(user_file_path).snapshot())
+            chunked = UserMatrix.from_user_file(user_file_path, chunk_size=7)
+            for matrix in (user_matrix, chunked):
+                self.assertEqual(matrix.names, expected.names)
+                np.testing.assert_array_equal(matrix.scores, expected.scores)
+                np.testing.assert_array_equal(matrix.missing_bits, expected.missing_bits)
+
+    def test_appended_users_only(self):
+        # 추가 로그에 더해진 사용자만 붙인 행렬은 파일 전체를 다시 읽은 행렬과 같아야 하고, 정리 후에는 다시 읽어야 함
+        with tempfile.TemporaryDirectory() as directory:
+            user_file_path = os.path.join(directory, "users.csv")
+            shutil.copy("data/processed_user_data.csv", user_file_path)
+            user_store = UserStore(user_file_path)
+            store = DataStore()
+            with mock.patch("src.user_matrix.get_data_store", return_value=store):
+                first = get_user_matrix(user_file_path)
+                new_user = {"이름": "새사용자", **{menu: 2 for menu in self.user_data.columns[1:4]}}
+                user_store.append([new_user])
+                with mock.patch.object(UserMatrix, "from_user_file", side_effect=AssertionError("전체 다시 읽기")):
+                    second = get_user_matrix(user_file_path)
+                self.assertIsNot(second, first)
+                self.assertIs(second.appended(user_file_path), second)
+
+                expected = UserMatrix.from_user_file(user_file_path)
+                self.assertEqual(len(first), len(self.user_data))
+                self.assertEqual(second.names, expected.names)
+                np.testing.assert_array_equal(second.scores, expected.scores)
+                np.testing.assert_array_equal(second.missing_bits, expected.missing_bits)
+                self.assertEqual(second.fingerprint(), expected.fingerprint())
+                self.assertEqual(second.fingerprint(len(first)), first.fingerprint())
+
+                user_store.compact()
+                self.assertIsNone(second.appended(user_file_path))
+                third = get_user_matrix(user_file_path)
+                self.assertIsNot(third, second)
+                self.assertEqual(third.names, expected.names)
+
+    def test_numeric_looking_names(self):
+        # "007"처럼 숫자로 보이는 이름도 문자열 그대로 읽고, 로그를 정리한 뒤에도 바뀌지 않아야 함
+        with tempfile.TemporaryDirectory() as directory:
+            user_file_path = os.path.join(directory, "users.csv")
+            with open(user_file_path, "w", encoding="utf-8") as f:
+                f.write("이름,김치찌개,라면\n007,4,2\n101,1,3\n")
+            user_store = UserStore(user_file_path)
+            user_store.append([{"이름": "0042", "김치찌개": 2, "라면": 2}])
+
+            for chunk_size in (1, 100):
+                user_matrix = UserMatrix.from_user_file(user_file_path, chunk_size=chunk_size)
+                self.assertEqual(user_matrix.names, ["007", "101", "0042"])
+                self.assertEqual(user_matrix.preferences("007"), {"김치찌개": 4.0, "라면": 2.0})
+
+            user_store.compact()
+            self.assertEqual(UserMatrix.from_user_file(user_file_path).names, ["007", "101", "0042"])
+
+    def test_unknown_user(self):
+        self.assertNotIn("없는사람", self.user_matrix)
+        with self.assertRaises(ValueError):
+            self.user_matrix.preferences("없는사람")
+
+if __name__ == "__main__":
+    unittest.main()
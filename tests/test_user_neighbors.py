@@ -0,0 +1,134 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src import user_matrix as user_matrix_module
+from src.user_matrix import UserMatrix, get_user_matrix
+from src.user_neighbors import UserNeighborIndex, find_lunch_buddies, get_user_neighbor_index
+from src.user_store import UserStore
+import numpy as np
+import pandas as pd
+
+class TestUserNeighbors(unittest.TestCase):
+    def setUp(self):
+        # 테스트용 데이터 준비
+        self.user_data = pd.read_csv("data/processed_user_data.csv")
+        self.user_matrix = UserMatrix.from_frame(self.user_data)
+
+    def test_matches_brute_force(self):
+        # 평균을 뺀 응답 점수의 코사인 유사도를 직접 계산한 결과와 같아야 함
+        scores = self.user_data.iloc[:, 1:]
+        centered = scores.sub(scores.mean(axis=1), axis=0).fillna(0.0).to_numpy()
+        norms = np.linalg.norm(centered, axis=1)
+        vectors = centered / np.where(norms > 0, norms, 1.0)[:, None]
+
+        index = UserNeighborIndex(self.user_matrix)
+        for user_name in ["연누", "야옹"]:
+            row = self.user_matrix.name_to_row[user_name]
+            similarities = vectors @ vectors[row]
+            expected = sorted(
+                (
+                    (similarities[other], name) for other, name in enumerate(self.user_data["이름"])
+                    if other != row and isinstance(name, str)
+                ),
+                reverse=True,
+            )[:5]
+            result = index.nearest(user_name, top_k=5)
+            self.assertEqual([name for name, _ in result], [name for _, name in expected])
+            np.testing.assert_allclose([value for _, value in result], [value for value, _ in expected], atol=1e-5)
+            # 블록을 작게 나누어 계산해도 같아야 함
+            blocked = index.nearest_many([user_name], top_k=5, block_size=7)[0]
+            self.assertEqual([name for name, _ in blocked], [name for name, _ in result])
+        for top_k in (0, -3):
+            with self.assertRaises(ValueError):
+                index.nearest("연누", top_k=top_k)
+
+    def test_incremental_add_and_buddies(self):
+        # 새 사용자를 추가한 색인은 처음부터 만든 색인과 같은 결과를 내야 함
+        with tempfile.TemporaryDirectory() as directory:
+            user_file_path = os.path.join(directory, "users.csv")
+            shutil.copy("data/processed_user_data.csv", user_file_path)
+            before = get_user_neighbor_index(user_file_path)
+
+            twin = {"이름": "쌍둥이", **self.user_data.set_index("이름").loc["연누"].dropna().to_dict()}
+            UserStore(user_file_path).append([twin])
+            after = get_user_neighbor_index(user_file_path)
+            self.assertIs(after._buffer, before._buffer)  # 새 행만 공유 버퍼 뒤쪽에 추가
+            # 이전 색인은 바뀌지 않으므로 조회 중인 다른 스레드에 영향이 없어야 함
+            self.assertEqual(len(before), len(self.user_data))
+            self.assertNotIn("쌍둥이", [name for name, _ in before.nearest_many(["연누"], top_k=3)[0]])
+            self.assertEqual(len(after), len(self.user_data) + 1)
+
+            fresh = UserNeighborIndex(get_user_matrix(user_file_path))
+            self.assertEqual(
+                [name for name, _ in after.nearest("연누", top_k=5)], [name for name, _ in fresh.nearest("연누", top_k=5)]
+            )
+
+            # 같은 이전 색인을 다시 확장하면 공유 버퍼의 행을 덮어쓰지 않도록 복사해야 함
+            other = before.extended(get_user_matrix(user_file_path))
+            self.assertIsNot(other._buffer, after._buffer)
+
+            buddies = find_lunch_buddies("연누", user_file_path, top_k=3)
+            self.assertEqual(buddies[0]["name"], "쌍둥이")
+            self.assertAlmostEqual(buddies[0]["similarity"], 1.0, places=5)
+            favorites = [menu for menu, score in twin.items() if score == 4]
+            self.assertEqual(buddies[0]["common_favorites"], favorites)
+
+    def test_add_user_does_not_rebuild(self):
+        # 새 사용자 추가는 파일 전체를 다시 읽거나 색인을 다시 만들거나 기존 행 전체를 비교하지 않아야 함
+        hashed_rows = []
+        original_hash_rows = user_matrix_module._hash_rows
+
+        def hash_rows(digest, scores):
+            hashed_rows.append(len(scores))
+            return original_hash_rows(digest, scores)
+
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(user_matrix_module, "FINGERPRINT_BLOCK_ROWS", 4):
+            user_file_path = os.path.join(directory, "users.csv")
+            shutil.copy("data/processed_user_data.csv", user_file_path)
+            before = get_user_neighbor_index(user_file_path)
+
+            UserStore(user_file_path).append([{"이름": "새사용자", "김치찌개": 4}])
+            with mock.patch.object(UserMatrix, "from_user_file", side_effect=AssertionError("전체 다시 읽기")), \
+                    mock.patch.object(UserNeighborIndex, "__init__", side_effect=AssertionError("색인 다시 만들기")), \
+                    mock.patch("src.user_neighbors.np.array_equal", side_effect=AssertionError("기존 행 비교")), \
+                    mock.patch.object(user_matrix_module, "_hash_rows", side_effect=hash_rows):
+                after = get_user_neighbor_index(user_file_path)
+            self.assertEqual(len(after), len(before) + 1)
+            # 지문은 마지막 불완전 블록과 새로 채워진 블록만 해시
+            self.assertLessEqual(sum(hashed_rows), 4 * 3)
+
+            # 기존 사용자의 점수가 바뀐 행렬로는 확장하지 않아야 함
+            changed = get_user_matrix(user_file_path)
+            scores = changed.scores.copy()
+            scores[0, 0] = 5 - max(scores[0, 0], 1)
+            self.assertIsNone(before.extended(UserMatrix(changed.names, changed.menus, scores, missing_bits=changed.missing_bits)))
+
+    def test_approximate_recall(self):
+        # 취향 집단이 있는 많은 사용자에서 근사 검색이 정확한 이웃을 대부분 찾아야 함
+        rng = np.random.default_rng(0)
+        n_users, n_menus = 6000, 60
+        centers = rng.integers(1, 5, (30, n_menus))
+        labels = rng.integers(0, 30, n_users)
+        scores = np.clip(centers[labels] + rng.integers(-1, 2, (n_users, n_menus)), 1, 4).astype(np.int8)
+        names = [f"사용자{idx}" for idx in range(n_users)]
+        index = UserNeighborIndex(UserMatrix(names, [f"메뉴{idx}" for idx in range(n_menus)], scores, scores == 0))
+
+        recall = []
+        for user_name in names[:30]:
+            exact = {name for name, _ in index.nearest(user_name, top_k=10)}
+            approximate = index.nearest(user_name, top_k=10, approximate=True)
+            self.assertEqual(len(approximate), 10)
+            recall.append(len(exact & {name for name, _ in approximate}) / 10)
+        self.assertGreater(np.mean(recall), 0.8)
+
+if __name__ == "__main__":
+    unittest.main()
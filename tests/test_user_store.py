@@ -0,0 +1,132 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.data_store import DataStore
+from src.user_store import UserStore
+import pandas as pd
+
+class TestUserStore(unittest.TestCase):
+    def setUp(self):
+        # 테스트용 임시 사용자 데이터 파일 준비
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.user_file_path = os.path.join(self.temp_dir.name, "users.csv")
+        pd.DataFrame({"이름": ["연누"], "김치찌개": [4], "라면": [2]}).to_csv(self.user_file_path, index=False)
+        self.user_store = UserStore(self.user_file_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_concurrent_appends_are_not_lost(self):
+        # 여러 스레드가 동시에 추가해도 모든 사용자가 남아 있어야 함
+        threads = [
+            threading.Thread(target=self.user_store.append, args=([{"이름": f"사용자{i}", "김치찌개": 3, "라면": 1}],))
+            for i in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        snapshot = self.user_store.snapshot()
+        self.assertEqual(len(snapshot), 21)
+        self.assertEqual(snapshot.columns.tolist(), ["이름", "김치찌개", "라면"])
+
+    def test_compact_merges_log(self):
+        # 정리 후에는 로그가 비고 CSV만으로 같은 데이터를 읽어야 함
+        self.user_store.append([{"이름": "야옹", "라면": 4, "김치찌개": 1}])
+        before = self.user_store.snapshot()
+
+        self.assertEqual(self.user_store.compact(), 1)
+        self.assertEqual(self.user_store.pending_count(), 0)
+        pd.testing.assert_frame_equal(pd.read_csv(self.user_file_path), before)
+
+    def test_interrupted_compaction_does_not_duplicate(self):
+        # CSV 교체 후 로그를 비우기 전에 중단된 상태에서도 합쳐진 로그 행을 다시 읽지 않아야 함
+        self.user_store.append([{"이름": "야옹", "김치찌개": 1, "라면": 4}])
+        with open(self.user_store.log_path, "rb") as f:
+            log_content = f.read()
+        self.user_store.compact()
+
+        # 중단된 상태를 재현: 로그는 그대로 남고 정리 기록은 새 CSV를 가리킴
+        with open(self.user_store.log_path, "wb") as f:
+            f.write(log_content)
+        stat = os.stat(self.user_file_path)
+        with open(self.user_store.compaction_path, "w", encoding="utf-8") as f:
+            json.dump({"user_file_id": [stat.st_dev, stat.st_ino], "log_bytes": len(log_content)}, f)
+        self.assertEqual(self.user_store.snapshot()["이름"].tolist(), ["연누", "야옹"])
+        self.assertEqual(self.user_store.pending_count(), 0)
+
+        # 다음 쓰기에서 정리를 마저 끝냄
+        self.user_store.append([{"이름": "포", "김치찌개": 2, "라면": 2}])
+        self.assertFalse(os.path.exists(self.user_store.compaction_path))
+        self.assertEqual(self.user_store.pending_count(), 1)
+        self.assertEqual(self.user_store.snapshot()["이름"].tolist(), ["연누", "야옹", "포"])
+
+    def test_ignores_partial_line(self):
+        # 중간에 끊긴 마지막 줄은 읽지 않고, 다음 추가 때 잘라내야 함
+        with open(self.user_store.log_path, "w", encoding="utf-8") as f:
+            f.write('{"이름": "끊김", "김치')
+        self.assertEqual(len(self.user_store.snapshot()), 1)
+
+        self.user_store.append([{"이름": "야옹", "김치찌개": 1, "라면": 4}])
+        self.assertEqual(self.user_store.snapshot()["이름"].tolist(), ["연누", "야옹"])
+
+    def test_append_csv_rows_repairs_tail(self):
+        # 중간에 끊긴 마지막 행은 잘라내고, 직접 편집해 줄바꿈만 빠진 행은 유지해야 함
+        rows_path = os.path.join(self.temp_dir.name, "rows.csv")
+        with open(rows_path, "w", encoding="utf-8") as f:
+            f.write("야옹,1,4\n")
+        with open(self.user_file_path, "a", encoding="utf-8") as f:
+            f.write("끊김,3")
+        self.user_store.append_csv_rows(rows_path)
+        self.assertEqual(self.user_store.snapshot()["이름"].tolist(), ["연누", "야옹"])
+
+        with open(self.user_file_path, "a", encoding="utf-8") as f:
+            f.write("편집,2,2")
+        with open(rows_path, "w", encoding="utf-8") as f:
+            f.write("멍멍,4,4\n")
+        self.user_store.append_csv_rows(rows_path)
+        self.assertEqual(self.user_store.snapshot()["이름"].tolist(), ["연누", "야옹", "편집", "멍멍"])
+
+    def test_append_csv_rows_rejects_taken_names(self):
+        # 잠금을 잡은 뒤 확인한 이름이 이미 있으면 아무것도 붙이지 않아야 함
+        self.user_store.append([{"이름": "야옹", "김치찌개": 1, "라면": 4}])
+        rows_path = os.path.join(self.temp_dir.name, "rows.csv")
+        with open(rows_path, "w", encoding="utf-8") as f:
+            f.write("멍멍,4,4\n야옹,2,2\n")
+        with self.assertRaises(ValueError):
+            self.user_store.append_csv_rows(rows_path, names=["멍멍", "야옹"])
+        self.assertEqual(self.user_store.snapshot()["이름"].tolist(), ["연누", "야옹"])
+
+    def test_read_appended(self):
+        # 읽은 위치 이후 로그에 추가된 행만 읽고, 정리로 본 CSV가 바뀌면 None을 반환해야 함
+        list(self.user_store.snapshot_chunks())
+        position = self.user_store.position
+        self.assertEqual(self.user_store.read_appended(position), [])
+
+        self.user_store.append([{"이름": "야옹", "김치찌개": 1, "라면": 4}])
+        self.assertEqual([row["이름"] for row in self.user_store.read_appended(position)], ["야옹"])
+        position = self.user_store.position
+        self.user_store.append([{"이름": "멍멍", "김치찌개": 2, "라면": 2}])
+        self.assertEqual([row["이름"] for row in self.user_store.read_appended(position)], ["멍멍"])
+
+        self.user_store.compact()
+        self.assertIsNone(self.user_store.read_appended(self.user_store.position))
+
+    def test_data_store_sees_appended_users(self):
+        # 공유 저장소는 로그가 바뀌면 다시 로드해야 함
+        store = DataStore()
+        self.assertEqual(len(store.get_user_data(self.user_file_path)), 1)
+        self.user_store.append([{"이름": "야옹", "김치찌개": 1, "라면": 4}])
+        self.assertEqual(len(store.get_user_data(self.user_file_path)), 2)
+
+if __name__ == "__main__":
+    unittest.main()